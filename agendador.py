@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+# agendador.py - Modo daemon: mantém o processo quente e agenda cada fonte
+#
+# Em vez de um processo frio por execução (startup do Python, imports de
+# bs4/lxml, conexões TLS novas), um único processo importa os scripts uma vez,
+# reaproveita o pool de conexões de transporte.py e roda cada fonte no seu
+# próprio intervalo, com jitter para não sincronizar os acessos. O intervalo
+# de cada fonte é aprendido com o histórico de publicação (cadencia.py):
+# menor nas horas em que a fonte publica, maior nas horas paradas.
+# Os feeds são regravados nos mesmos arquivos de sempre; hub WebSub e webhook
+# são avisados quando o conjunto de itens muda (notificacao.py).
+#
+# Uso:
+#   python agendador.py                  # inicia o daemon
+#   python agendador.py rodar fortaleza  # executa uma fonte agora, em primeiro plano
+#   python agendador.py disparar alece   # pede ao daemon em execução para rodar já
+#   kill -USR1 <pid>                     # pede ao daemon para rodar todas as fontes já
+
+import importlib
+import os
+import random
+import signal
+import sys
+import threading
+import time
+import traceback
+from datetime import datetime
+
+import cadencia
+import fontes
+import notificacao
+import reserva
+import transporte
+
+# ================= CONFIGURAÇÕES =================
+PASTA_BASE = os.path.dirname(os.path.abspath(__file__))
+PASTA_GATILHOS = os.path.join(PASTA_BASE, "gatilhos")
+
+# Scripts próprios - fonte: (módulo, função, intervalo em minutos).
+# As fontes declarativas de fontes/ entram automaticamente (ver _registrar_declarativas).
+FONTES = {
+    'cmfor': ('update_feed', 'criar_feed_com_imagens_garantidas', 60),
+    'ceara': ('upnewsceara', 'generate_rss', 60),
+    'agenciabrasil': ('upnewsagenciabr', 'extrair_agencia_brasil', 20),
+    'fortaleza': ('upnewsfortaleza', 'criar_feed_fortaleza', 30),
+}
+
+# Variação aleatória de ±15% em cada intervalo
+JITTER = 0.15
+
+# Intervalo máximo entre verificações de gatilhos manuais (segundos)
+VERIFICACAO_GATILHOS = 2
+
+_parar = threading.Event()
+_acordar = threading.Event()
+_rodar_todas = threading.Event()
+
+
+# ================= FUNÇÕES =================
+def _hora():
+    return datetime.now().strftime('%H:%M:%S')
+
+
+def _registrar_declarativas():
+    """Inclui em FONTES as definições de fontes/, executadas por motor.executar."""
+    for nome in fontes.listar():
+        FONTES.setdefault(nome, ('motor', 'executar', None))
+
+
+def intervalo_padrao(fonte):
+    """Intervalo fixo da fonte em minutos (INTERVALO da definição, para as declarativas)."""
+    minutos = FONTES[fonte][2]
+    if minutos is None:
+        minutos = getattr(fontes.carregar(fonte), 'INTERVALO', 60)
+    return minutos
+
+
+def intervalo(fonte):
+    """Intervalo para agora: aprendido com o histórico da fonte (ver cadencia.py)."""
+    return cadencia.intervalo(fonte, intervalo_padrao(fonte))
+
+
+def proximo_intervalo(minutos):
+    """Intervalo em segundos com jitter aplicado."""
+    return minutos * 60 * (1 + random.uniform(-JITTER, JITTER))
+
+
+def executar_fonte(fonte):
+    """Executa uma fonte no processo atual. Nunca propaga exceções."""
+    nome_modulo, nome_funcao, _ = FONTES[fonte]
+    inicio = time.perf_counter()
+    try:
+        modulo = importlib.import_module(nome_modulo)
+        if nome_modulo == 'motor':
+            resultado = modulo.executar(fonte)
+        else:
+            resultado = getattr(modulo, nome_funcao)()
+        sucesso = resultado is not False
+    except Exception:
+        traceback.print_exc()
+        sucesso = False
+    duracao = time.perf_counter() - inicio
+    print(f"[{_hora()}] {'✅' if sucesso else '❌'} {fonte} em {duracao:.1f}s")
+    # Feed regravado localmente já está publicado: hub/webhook só se os itens mudaram
+    try:
+        notificacao.enviar(fonte, espera=0)
+    except Exception:
+        traceback.print_exc()
+    return sucesso
+
+
+def disparar(fonte):
+    """Cria o gatilho que faz o daemon rodar a fonte na próxima verificação."""
+    os.makedirs(PASTA_GATILHOS, exist_ok=True)
+    with open(os.path.join(PASTA_GATILHOS, fonte), 'w', encoding='utf-8') as f:
+        f.write(datetime.now().isoformat())
+
+
+def _consumir_gatilhos():
+    if not os.path.isdir(PASTA_GATILHOS):
+        return []
+    disparadas = []
+    for nome in os.listdir(PASTA_GATILHOS):
+        try:
+            os.remove(os.path.join(PASTA_GATILHOS, nome))
+        except OSError:
+            continue
+        if nome in FONTES:
+            disparadas.append(nome)
+        else:
+            print(f"[{_hora()}] ⚠️  Gatilho para fonte desconhecida: {nome}")
+    return disparadas
+
+
+def _tratar_sinal_parar(signum, frame):
+    _parar.set()
+    _acordar.set()
+
+
+def _tratar_sinal_rodar(signum, frame):
+    _rodar_todas.set()
+    _acordar.set()
+
+
+def daemon(selecionadas=None):
+    """Laço principal: roda cada fonte no seu intervalo até receber SIGINT/SIGTERM."""
+    selecionadas = selecionadas or list(FONTES)
+    os.chdir(PASTA_BASE)
+
+    signal.signal(signal.SIGINT, _tratar_sinal_parar)
+    signal.signal(signal.SIGTERM, _tratar_sinal_parar)
+    if hasattr(signal, 'SIGUSR1'):
+        signal.signal(signal.SIGUSR1, _tratar_sinal_rodar)
+
+    # Importar tudo uma vez, antes da primeira execução
+    for fonte in selecionadas:
+        importlib.import_module(FONTES[fonte][0])
+        if FONTES[fonte][0] == 'motor':
+            importlib.import_module('motor').compilar(fonte)
+
+    # Primeira rodada espalhada pelos primeiros segundos, não tudo de uma vez
+    agora = time.monotonic()
+    proxima = {fonte: agora + random.uniform(0, 30) for fonte in selecionadas}
+
+    print(f"[{_hora()}] 🟢 Daemon iniciado (pid {os.getpid()}) com {len(selecionadas)} fonte(s)")
+    for fonte in selecionadas:
+        print(f"    • {fonte}: a cada {intervalo(fonte)} min agora, padrão {intervalo_padrao(fonte)} (±{JITTER:.0%})")
+
+    try:
+        while not _parar.is_set():
+            pendentes = _consumir_gatilhos()
+            if _rodar_todas.is_set():
+                _rodar_todas.clear()
+                pendentes = list(selecionadas)
+
+            agora = time.monotonic()
+            pendentes += [f for f in selecionadas if proxima[f] <= agora and f not in pendentes]
+
+            for fonte in pendentes:
+                if _parar.is_set():
+                    break
+                if fonte not in proxima:
+                    continue
+                print(f"[{_hora()}] ▶️  {fonte}")
+                executar_fonte(fonte)
+                # Fonte falhando: nova tentativa antes do intervalo normal (ver reserva.py)
+                proxima[fonte] = time.monotonic() + proximo_intervalo(reserva.espera(fonte, intervalo(fonte)))
+
+            espera = min(proxima.values()) - time.monotonic()
+            _acordar.wait(max(0.0, min(espera, VERIFICACAO_GATILHOS)))
+            _acordar.clear()
+    finally:
+        transporte.fechar()
+        print(f"[{_hora()}] 🔴 Daemon encerrado")
+
+
+# ================= MAIN =================
+_registrar_declarativas()
+
+
+if __name__ == "__main__":
+    argumentos = sys.argv[1:]
+
+    if argumentos and argumentos[0] in ('rodar', 'disparar'):
+        comando, alvos = argumentos[0], argumentos[1:] or list(FONTES)
+        desconhecidas = [a for a in alvos if a not in FONTES]
+        if desconhecidas:
+            print(f"Fonte(s) desconhecida(s): {', '.join(desconhecidas)}")
+            print(f"Disponíveis: {', '.join(FONTES)}")
+            sys.exit(1)
+        if comando == 'disparar':
+            for alvo in alvos:
+                disparar(alvo)
+            print(f"Gatilho criado para: {', '.join(alvos)}")
+            sys.exit(0)
+        os.chdir(PASTA_BASE)
+        sys.exit(0 if all([executar_fonte(alvo) for alvo in alvos]) else 1)
+
+    desconhecidas = [a for a in argumentos if a not in FONTES]
+    if desconhecidas:
+        print(f"Fonte(s) desconhecida(s): {', '.join(desconhecidas)}")
+        sys.exit(1)
+    daemon(argumentos or None)
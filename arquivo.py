@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+# arquivo.py - Arquivo histórico compacto de todas as notícias emitidas
+#
+# Cada item publicado em qualquer feed é gravado uma única vez, com o corpo
+# comprimido (zlib), em um SQLite por fonte dentro de historico/.
+# Um arquivo por fonte evita conflitos de merge entre workflows paralelos.
+#
+# Uso na linha de comando:
+#   python arquivo.py fortaleza 2026-03-01 2026-03-31
+#   python arquivo.py alece 2026-03
+
+import sqlite3
+import zlib
+import hashlib
+import os
+import sys
+import re
+import threading
+from datetime import datetime, date, timedelta, timezone
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+from modelo import para_datetime, FUSO_BRASILIA
+
+# ================= CONFIGURAÇÕES =================
+PASTA_HISTORICO = os.path.join(os.path.dirname(os.path.abspath(__file__)), "historico")
+
+NIVEL_COMPRESSAO = 9
+
+# Parâmetros de rastreamento que não mudam a notícia
+PARAMETROS_IGNORADOS = re.compile(r'^(utm_\w+|fbclid|gclid|amp|ref)$', re.I)
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS itens (
+    fonte       TEXT NOT NULL,
+    url         TEXT NOT NULL,
+    dia         TEXT NOT NULL,
+    publicado   TEXT NOT NULL,
+    titulo      TEXT NOT NULL,
+    link        TEXT NOT NULL,
+    guid        TEXT,
+    imagem      TEXT,
+    resumo      TEXT,
+    conteudo    BLOB,
+    hash        TEXT NOT NULL,
+    arquivado   TEXT NOT NULL,
+    PRIMARY KEY (fonte, url)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_itens_fonte_dia ON itens (fonte, dia);
+"""
+
+# Uma conexão por thread e fonte (SQLite não compartilha conexões entre threads);
+# fecham junto com a thread
+_local = threading.local()
+
+
+# ================= FUNÇÕES =================
+def url_canonica(url):
+    """Normaliza a URL para servir de chave: esquema/host minúsculos, sem porta padrão,
+    sem fragmento, sem parâmetros de rastreamento e sem barra final."""
+    if not url:
+        return url
+    partes = urlsplit(url.strip())
+    esquema = (partes.scheme or 'https').lower()
+    host = (partes.hostname or '').lower()
+    porta = partes.port
+    if porta and not ((esquema == 'http' and porta == 80) or (esquema == 'https' and porta == 443)):
+        host = f"{host}:{porta}"
+    caminho = partes.path.rstrip('/') or '/'
+    query = urlencode([(k, v) for k, v in parse_qsl(partes.query, keep_blank_values=True)
+                       if not PARAMETROS_IGNORADOS.match(k)])
+    return urlunsplit((esquema, host, caminho, query, ''))
+
+
+def _hash_registro(registro):
+    base = '\x1f'.join([
+        registro.get('titulo') or '',
+        registro.get('imagem') or '',
+        registro.get('conteudo') or '',
+    ])
+    return hashlib.sha1(base.encode('utf-8')).hexdigest()
+
+
+def conectar(fonte):
+    """Abre (uma vez por thread) o banco histórico da fonte."""
+    conexoes = _local.__dict__.setdefault('conexoes', {})
+    if fonte in conexoes:
+        return conexoes[fonte]
+    os.makedirs(PASTA_HISTORICO, exist_ok=True)
+    caminho = os.path.join(PASTA_HISTORICO, f"{fonte}.sqlite3")
+    conexao = sqlite3.connect(caminho)
+    conexao.row_factory = sqlite3.Row
+    conexao.executescript(ESQUEMA)
+    conexoes[fonte] = conexao
+    return conexao
+
+
+def arquivar(fonte, registros):
+    """
+    Grava os registros (ver modelo.novo_registro) no histórico da fonte.
+    Itens já conhecidos só são regravados se o conteúdo mudou.
+    Retorna a quantidade de itens novos ou alterados.
+    """
+    conexao = conectar(fonte)
+    agora = datetime.now(timezone.utc).isoformat(timespec='seconds')
+    alterados = 0
+
+    with conexao:
+        for registro in registros:
+            if not registro.get('link'):
+                continue
+            url = url_canonica(registro['link'])
+            publicado = para_datetime(registro.get('publicado')) or datetime.now(timezone.utc)
+            dia = publicado.astimezone(FUSO_BRASILIA).date().isoformat()
+            hash_item = _hash_registro(registro)
+            conteudo = zlib.compress((registro.get('conteudo') or '').encode('utf-8'), NIVEL_COMPRESSAO)
+
+            cursor = conexao.execute(
+                """
+                INSERT INTO itens (fonte, url, dia, publicado, titulo, link, guid, imagem,
+                                   resumo, conteudo, hash, arquivado)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (fonte, url) DO UPDATE SET
+                    titulo = excluded.titulo,
+                    imagem = excluded.imagem,
+                    resumo = excluded.resumo,
+                    conteudo = excluded.conteudo,
+                    hash = excluded.hash
+                WHERE itens.hash != excluded.hash
+                """,
+                (fonte, url, dia, publicado.isoformat(), registro.get('titulo') or '',
+                 registro['link'], registro.get('guid'), registro.get('imagem'),
+                 registro.get('resumo') or '', conteudo, hash_item, agora)
+            )
+            alterados += cursor.rowcount
+
+    print(f"🗄️  Histórico: {alterados} item(ns) novo(s)/alterado(s) em historico/{fonte}.sqlite3")
+    return alterados
+
+
+def _para_registro(linha, com_conteudo):
+    registro = {
+        'fonte': linha['fonte'],
+        'titulo': linha['titulo'],
+        'link': linha['link'],
+        'publicado': datetime.fromisoformat(linha['publicado']),
+        'imagem': linha['imagem'],
+        'resumo': linha['resumo'],
+        'guid': linha['guid'] or linha['link'],
+        'conteudo': '',
+    }
+    if com_conteudo and linha['conteudo']:
+        registro['conteudo'] = zlib.decompress(linha['conteudo']).decode('utf-8')
+    return registro
+
+
+def consultar(fonte, inicio, fim=None, com_conteudo=True, limite=None):
+    """
+    Retorna os itens da fonte publicados entre inicio e fim (datas inclusivas,
+    no horário de Brasília), do mais recente para o mais antigo.
+    """
+    if isinstance(inicio, datetime):
+        inicio = inicio.date()
+    if isinstance(fim, datetime):
+        fim = fim.date()
+    fim = fim or inicio
+
+    conexao = conectar(fonte)
+    colunas = "fonte, link, publicado, titulo, guid, imagem, resumo, " + ("conteudo" if com_conteudo else "NULL AS conteudo")
+    sql = (f"SELECT {colunas} FROM itens WHERE fonte = ? AND dia BETWEEN ? AND ? "
+           "ORDER BY dia DESC, publicado DESC")
+    parametros = [fonte, inicio.isoformat(), fim.isoformat()]
+    if limite:
+        sql += " LIMIT ?"
+        parametros.append(limite)
+
+    return [_para_registro(linha, com_conteudo) for linha in conexao.execute(sql, parametros)]
+
+
+def consultar_mes(fonte, ano, mes, com_conteudo=True):
+    """Atalho para "todos os itens da fonte no mês"."""
+    inicio = date(ano, mes, 1)
+    proximo = date(ano + (mes == 12), mes % 12 + 1, 1)
+    return consultar(fonte, inicio, proximo - timedelta(days=1), com_conteudo=com_conteudo)
+
+
+def recentes(fonte, limite, com_conteudo=True):
+    """Os `limite` itens mais recentes da fonte, independentemente da data."""
+    conexao = conectar(fonte)
+    colunas = "fonte, link, publicado, titulo, guid, imagem, resumo, " + ("conteudo" if com_conteudo else "NULL AS conteudo")
+    sql = f"SELECT {colunas} FROM itens WHERE fonte = ? ORDER BY dia DESC, publicado DESC LIMIT ?"
+    return [_para_registro(linha, com_conteudo) for linha in conexao.execute(sql, (fonte, limite))]
+
+
+def dias(fonte):
+    """Lista ordenada (mais antigo primeiro) dos dias que têm itens arquivados."""
+    conexao = conectar(fonte)
+    linhas = conexao.execute("SELECT DISTINCT dia FROM itens WHERE fonte = ? ORDER BY dia", (fonte,))
+    return [date.fromisoformat(linha['dia']) for linha in linhas]
+
+
+def buscar(fonte, url):
+    """Retorna o item arquivado com a URL (canônica) informada, ou None."""
+    conexao = conectar(fonte)
+    linha = conexao.execute(
+        "SELECT fonte, link, publicado, titulo, guid, imagem, resumo, conteudo "
+        "FROM itens WHERE fonte = ? AND url = ?",
+        (fonte, url_canonica(url))
+    ).fetchone()
+    return _para_registro(linha, True) if linha else None
+
+
+# ================= MAIN =================
+if __name__ == "__main__":
+    if len(sys.argv) < 3:
+        print("Uso: python arquivo.py <fonte> <AAAA-MM | AAAA-MM-DD> [AAAA-MM-DD]")
+        sys.exit(1)
+
+    fonte_cli = sys.argv[1]
+    periodo = sys.argv[2]
+
+    if len(periodo) == 7:
+        ano_cli, mes_cli = map(int, periodo.split('-'))
+        resultado = consultar_mes(fonte_cli, ano_cli, mes_cli, com_conteudo=False)
+    else:
+        inicio_cli = date.fromisoformat(periodo)
+        fim_cli = date.fromisoformat(sys.argv[3]) if len(sys.argv) > 3 else inicio_cli
+        resultado = consultar(fonte_cli, inicio_cli, fim_cli, com_conteudo=False)
+
+    for r in resultado:
+        print(f"{r['publicado'].astimezone(FUSO_BRASILIA):%d/%m/%Y %H:%M}  {r['titulo'][:80]}")
+        print(f"    {r['link']}")
+    print(f"\n{len(resultado)} item(ns)")
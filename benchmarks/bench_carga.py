@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+# bench_carga.py - Teste de carga do pipeline com N fontes sintéticas
+#
+# Sobe um servidor HTTP local por fonte sintética (portas diferentes, como
+# hosts diferentes para o pool de conexões) servindo páginas geradas:
+#
+#   /noticias              listagem HTML (div.item, a.titulo, span.data)
+#   /noticia/<k>           página da notícia (h1, div.conteudo, og:image)
+#   /wp-json/wp/v2/posts   JSON da API REST do WordPress
+#   /feed                  RSS 2.0
+#
+# com latência (média, distribuição exponencial), taxa de erros 503 e
+# tamanho das páginas configuráveis. As fontes são definições declarativas
+# (fontes/) montadas em memória e alternam entre os modos html, wp e rss;
+# cada uma roda por motor.executar, várias ao mesmo tempo como no daemon.
+#
+# Os servidores ficam no processo principal; cada N roda num subprocesso
+# limpo (histórico, estado e caches em pasta temporária), então tempo e
+# memória medidos são só do pipeline. O resultado informa: vazão (fontes,
+# notícias e requisições por segundo), latência das requisições
+# (p50/p95/p99), duração por fonte (p95) e pico de memória (RSS).
+#
+# Uso: python benchmarks/bench_carga.py [N ...] [--latencia=MS] [--erros=FRACAO]
+#          [--tamanho=KB] [--itens=N] [--simultaneas=N] [--rodadas=N] [--modos=html,wp,rss]
+#      python benchmarks/bench_carga.py 1 4 16 32 --latencia=80 --erros=0.02
+
+import contextlib
+import io
+import json
+import os
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import types
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+# ================= CONFIGURAÇÕES =================
+PADROES = {
+    'latencia': 50,       # ms, média
+    'erros': 0.0,         # fração das respostas que viram 503
+    'tamanho': 20,        # KB de texto por notícia
+    'itens': 10,          # notícias por listagem/índice
+    'simultaneas': 1,     # fontes executando ao mesmo tempo (1 = como o agendador)
+    'rodadas': 1,         # execuções seguidas de cada fonte (2+ mostra marca d'água e caches)
+    'modos': 'html,wp,rss',
+}
+SEMENTE = 2026
+
+PARAGRAFO = ("A prefeitura anunciou nesta semana um conjunto de ações para a cidade, "
+             "com investimentos em saúde, educação e infraestrutura nos bairros. ")
+
+
+# ================= SERVIDOR SINTÉTICO =================
+def _agora():
+    return datetime.now(timezone.utc).replace(microsecond=0)
+
+
+def _listagem(base, itens):
+    hoje = datetime.now(timezone(timedelta(hours=-3)))
+    blocos = ''.join(
+        f'<div class="item"><a class="titulo" href="/noticia/{k}">Notícia sintética número {k} da fonte</a>'
+        f'<span class="data">{hoje:%d/%m/%Y} {10 + k % 10:02d}:00</span></div>'
+        for k in range(1, itens + 1)
+    )
+    return f'<html><head><title>Notícias</title></head><body><nav><a href="/">Início</a></nav>{blocos}</body></html>'
+
+
+def _noticia(base, k, tamanho):
+    paragrafos = ''.join(f'<p>{PARAGRAFO}</p>' for _ in range(max(1, tamanho * 1024 // len(PARAGRAFO))))
+    return (f'<html><head><meta property="og:image" content="{base}/imagens/{k}.jpg"></head><body>'
+            f'<header class="site-header">menu</header><h1>Notícia sintética número {k} da fonte</h1>'
+            f'<div class="conteudo">{paragrafos}<script>x()</script></div><footer>rodapé</footer></body></html>')
+
+
+def _wp(base, itens):
+    agora = _agora()
+    return json.dumps([
+        {'link': f'{base}/noticia/{k}', 'title': {'rendered': f'Notícia sintética número {k} da fonte'},
+         'date_gmt': (agora - timedelta(minutes=10 * k)).strftime('%Y-%m-%dT%H:%M:%S'),
+         'modified_gmt': (agora - timedelta(minutes=10 * k)).strftime('%Y-%m-%dT%H:%M:%S')}
+        for k in range(1, itens + 1)
+    ])
+
+
+def _rss(base, itens):
+    agora = _agora()
+    corpo = ''.join(
+        f'<item><title>Notícia sintética número {k} da fonte</title><link>{base}/noticia/{k}</link>'
+        f'<pubDate>{(agora - timedelta(minutes=10 * k)).strftime("%a, %d %b %Y %H:%M:%S +0000")}</pubDate></item>'
+        for k in range(1, itens + 1)
+    )
+    return f'<?xml version="1.0"?><rss version="2.0"><channel><title>x</title>{corpo}</channel></rss>'
+
+
+def servidor(modo, opcoes):
+    """Sobe um portal sintético numa porta livre. Retorna (servidor, url_base)."""
+    sorteio = random.Random(SEMENTE)
+    trava = threading.Lock()
+
+    class Portal(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def log_message(self, *args):
+            pass
+
+        def do_GET(self):
+            with trava:
+                espera = sorteio.expovariate(1000 / opcoes['latencia']) if opcoes['latencia'] else 0
+                falha = sorteio.random() < opcoes['erros']
+            time.sleep(espera)
+
+            base = f"http://{self.headers['Host']}"
+            caminho = self.path.split('?', 1)[0]
+            conteudo, tipo = None, 'text/html; charset=utf-8'
+            if falha:
+                pass
+            elif caminho == '/noticias':
+                conteudo = _listagem(base, opcoes['itens'])
+            elif caminho.startswith('/noticia/'):
+                conteudo = _noticia(base, caminho.rsplit('/', 1)[-1], opcoes['tamanho'])
+            elif caminho == '/wp-json/wp/v2/posts' and modo == 'wp':
+                conteudo, tipo = _wp(base, opcoes['itens']), 'application/json'
+            elif caminho == '/feed' and modo == 'rss':
+                conteudo, tipo = _rss(base, opcoes['itens']), 'application/rss+xml'
+
+            dados = (conteudo or '').encode('utf-8')
+            self.send_response(503 if falha else 200 if conteudo is not None else 404)
+            self.send_header('Content-Type', tipo)
+            self.send_header('Content-Length', str(len(dados)))
+            self.end_headers()
+            self.wfile.write(dados)
+
+    http = ThreadingHTTPServer(('127.0.0.1', 0), Portal)
+    http.daemon_threads = True
+    threading.Thread(target=http.serve_forever, daemon=True).start()
+    return http, f"http://127.0.0.1:{http.server_address[1]}"
+
+
+def definicao(nome, modo, base):
+    """Módulo de definição (como fontes/<nome>.py) para uma fonte sintética."""
+    modulo = types.ModuleType(f"fontes.{nome}")
+    modulo.__dict__.update(
+        NOME=nome, TITULO=f'Fonte sintética {nome}', URL_BASE=base, URL_LISTA=f'{base}/noticias',
+        FEED_FILE=f'feed_{nome}.xml',
+        SELETOR_ITEM='div.item', SELETOR_TITULO='a.titulo', SELETOR_LINK='a.titulo', SELETOR_DATA='span.data',
+        DESCOBERTA=modo != 'html', FILTRO_DESCOBERTA=r'/noticia/\d+',
+        SELETORES_CONTEUDO=['div.conteudo'],
+        REGRAS_IMAGEM=[{'seletor': 'meta[property="og:image"]', 'atributo': 'content'}],
+        CONCORRENCIA=4, TIMEOUT_LISTA=10, TIMEOUT_DETALHE=10,
+    )
+    return modulo
+
+
+# ================= MEDIÇÃO (subprocesso) =================
+def percentil(valores, p):
+    if not valores:
+        return 0.0
+    ordenados = sorted(valores)
+    return ordenados[min(len(ordenados) - 1, int(round(p / 100 * (len(ordenados) - 1))))]
+
+
+def medir(portais, opcoes):
+    """Executa as fontes sintéticas [(modo, url_base)] e devolve o dict de resultados."""
+    pasta = tempfile.mkdtemp(prefix='bench_carga_')
+    os.chdir(pasta)
+
+    import arquivo
+    import cache_extracao
+    import estado
+    import feed_paginado
+    import jsonfeed
+    import latencia
+    import motor
+    import transporte
+
+    arquivo.PASTA_HISTORICO = os.path.join(pasta, 'historico')
+    estado.PASTA_ESTADO = os.path.join(pasta, 'estado')
+    cache_extracao.PASTA_CACHE = os.path.join(pasta, 'cache')
+    feed_paginado.PASTA_PAGINAS = os.path.join(pasta, 'paginas')
+    jsonfeed.PASTA_SAIDA = pasta
+    latencia.ARQUIVO = os.path.join(pasta, 'cache', 'latencias.json')
+
+    nomes = []
+    for indice, (modo, base) in enumerate(portais):
+        nome = f"sintetica{indice:03d}"
+        sys.modules[f"fontes.{nome}"] = definicao(nome, modo, base)
+        nomes.append(nome)
+
+    latencias = []
+    transporte.sessao().hooks['response'].append(
+        lambda resposta, *args, **kwargs: latencias.append(resposta.elapsed.total_seconds()))
+
+    duracoes = []
+    resultados = []
+
+    def rodar(nome):
+        inicio = time.perf_counter()
+        sucesso = motor.executar(nome)
+        duracoes.append(time.perf_counter() - inicio)
+        return sucesso
+
+    inicio = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(opcoes['rodadas']):
+            with ThreadPoolExecutor(max_workers=opcoes['simultaneas']) as executor:
+                resultados += list(executor.map(rodar, nomes))
+    total = time.perf_counter() - inicio
+
+    publicadas = sum(len(arquivo.consultar(nome, datetime.now(timezone(timedelta(hours=-3))).date(),
+                                           com_conteudo=False)) for nome in nomes)
+    return {
+        'n': len(portais),
+        'segundos': total,
+        'fontes_s': len(resultados) / total,
+        'noticias_s': publicadas / total,
+        'requisicoes_s': len(latencias) / total,
+        'p50_ms': percentil(latencias, 50) * 1000,
+        'p95_ms': percentil(latencias, 95) * 1000,
+        'p99_ms': percentil(latencias, 99) * 1000,
+        'p95_fonte_s': percentil(duracoes, 95),
+        'falhas': resultados.count(False),
+        'rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    }
+
+
+# ================= MAIN =================
+def main():
+    argumentos = sys.argv[1:]
+    opcoes = dict(PADROES)
+    for arg in argumentos:
+        if arg.startswith('--') and '=' in arg:
+            chave, valor = arg[2:].split('=', 1)
+            opcoes[chave] = type(PADROES[chave])(valor)
+
+    if argumentos[:1] == ['--um']:
+        portais = json.loads(os.environ['BENCH_PORTAIS'])[:int(argumentos[1])]
+        print(json.dumps(medir(portais, opcoes)))
+        return
+
+    escalas = [int(a) for a in argumentos if not a.startswith('--')] or [1, 4, 16]
+    extras = [a for a in argumentos if a.startswith('--')]
+    modos = opcoes['modos'].split(',')
+    portais = [(modos[i % len(modos)], servidor(modos[i % len(modos)], opcoes)[1]) for i in range(max(escalas))]
+    ambiente = dict(os.environ, BENCH_PORTAIS=json.dumps(portais))
+    print(f"latência {opcoes['latencia']} ms, erros {opcoes['erros']:.0%}, {opcoes['tamanho']} KB/notícia, "
+          f"{opcoes['itens']} itens, {opcoes['simultaneas']} simultâneas, modos {opcoes['modos']}")
+    print(f"{'N':>4}{'tempo s':>9}{'fontes/s':>10}{'notícias/s':>12}{'req/s':>8}"
+          f"{'p50 ms':>8}{'p95 ms':>8}{'p99 ms':>8}{'p95 fonte s':>13}{'falhas':>8}{'RSS MB':>8}")
+    print("-" * 94)
+    for n in escalas:
+        saida = subprocess.run([sys.executable, os.path.abspath(__file__), '--um', str(n)] + extras,
+                               capture_output=True, text=True, env=ambiente)
+        if saida.returncode != 0:
+            print(f"{n:>4}  ❌ {saida.stderr.strip().splitlines()[-1] if saida.stderr.strip() else 'falhou'}")
+            continue
+        r = json.loads(saida.stdout.strip().splitlines()[-1])
+        print(f"{r['n']:>4}{r['segundos']:>9.2f}{r['fontes_s']:>10.2f}{r['noticias_s']:>12.1f}{r['requisicoes_s']:>8.1f}"
+              f"{r['p50_ms']:>8.1f}{r['p95_ms']:>8.1f}{r['p99_ms']:>8.1f}{r['p95_fonte_s']:>13.2f}"
+              f"{r['falhas']:>8}{r['rss_mb']:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
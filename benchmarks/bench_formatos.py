@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+# bench_formatos.py - Compara tamanho e tempo de leitura: feeds XML x JSON Feed
+#
+# Usa os feeds XML gravados na raiz do repositório como amostra: extrai os
+# registros de cada um, gera o JSON Feed equivalente com jsonfeed.py e mede
+# bytes e tempo de parse de cada formato.
+#
+# Uso: python benchmarks/bench_formatos.py [repeticoes]
+
+import os
+import sys
+import json
+import time
+import xml.etree.ElementTree as ET
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+import jsonfeed
+from modelo import novo_registro
+
+FEEDS = {
+    'cmfor': 'feed.xml',
+    'agenciabrasil': 'feed_agenciabrasil_wp.xml',
+    'alece': 'feed_alce_news.xml',
+    'caucaia': 'feed_caucaia_limpo.xml',
+    'ceara': 'feed_ceara_news.xml',
+    'fortaleza': 'feed_fortaleza_hoje.xml',
+}
+
+NS = {
+    'content': 'http://purl.org/rss/1.0/modules/content/',
+    'wp': 'http://wordpress.org/export/1.2/',
+}
+
+
+def registros_do_xml(fonte, raiz):
+    """Reconstrói os registros comuns a partir de um feed RSS/WXR já gerado."""
+    registros = []
+    for item in raiz.iter('item'):
+        imagem = None
+        enclosure = item.find('enclosure')
+        if enclosure is not None:
+            imagem = enclosure.get('url')
+        else:
+            for meta in item.findall('wp:postmeta', NS):
+                if meta.findtext('wp:meta_key', namespaces=NS) == '_thumbnail_ext_url':
+                    imagem = meta.findtext('wp:meta_value', namespaces=NS)
+        registros.append(novo_registro(
+            fonte,
+            item.findtext('title') or '',
+            item.findtext('link') or item.findtext('guid') or '',
+            item.findtext('pubDate'),
+            conteudo=item.findtext('content:encoded', namespaces=NS) or '',
+            imagem=imagem,
+            resumo=item.findtext('description') or '',
+            guid=item.findtext('guid'),
+        ))
+    return registros
+
+
+def cronometrar(funcao, repeticoes):
+    inicio = time.perf_counter()
+    for _ in range(repeticoes):
+        funcao()
+    return (time.perf_counter() - inicio) / repeticoes * 1000
+
+
+def main():
+    repeticoes = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+
+    print(f"{'fonte':<14}{'itens':>6}{'XML bytes':>12}{'JSON bytes':>12}{'tam.':>7}"
+          f"{'XML ms':>10}{'JSON ms':>10}{'parse':>8}")
+    print("-" * 79)
+
+    total_xml = total_json = 0
+    for fonte, nome in FEEDS.items():
+        caminho = os.path.join(RAIZ, nome)
+        if not os.path.exists(caminho):
+            continue
+        with open(caminho, 'rb') as f:
+            dados_xml = f.read()
+
+        registros = registros_do_xml(fonte, ET.fromstring(dados_xml))
+        dados_json = jsonfeed.serializar(jsonfeed.gerar(fonte, registros)).encode('utf-8')
+
+        ms_xml = cronometrar(lambda: ET.fromstring(dados_xml), repeticoes)
+        ms_json = cronometrar(lambda: json.loads(dados_json), repeticoes)
+
+        total_xml += len(dados_xml)
+        total_json += len(dados_json)
+        print(f"{fonte:<14}{len(registros):>6}{len(dados_xml):>12,}{len(dados_json):>12,}"
+              f"{len(dados_json) / len(dados_xml):>7.0%}{ms_xml:>10.3f}{ms_json:>10.3f}"
+              f"{ms_xml / ms_json:>7.1f}x")
+
+    print("-" * 79)
+    print(f"{'total':<14}{'':>6}{total_xml:>12,}{total_json:>12,}{total_json / total_xml:>7.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+# bench_leitura_parcial.py - Página inteira x leitura parcial (leitura_parcial.py)
+#
+# Sobe um servidor HTTP local com uma página no formato do portal de
+# Fortaleza: <head> com og:image/og:title, menu, div.itemFullText com a
+# notícia e, depois dela, o peso que o extrator não usa (blocos de "leia
+# também", rodapé, scripts), com gzip e keep-alive. Cada versão extrai a
+# mesma notícia com upnewsfortaleza.extrair_conteudo_completo:
+#   completa - FIM_CONTEUDO vazio: baixa e faz o parsing da página inteira
+#   parcial  - FIM_CONTEUDO padrão: para no fechamento de div.itemFullText
+# e informa bytes na rede, bytes com parsing, tempo por página e se o
+# resultado da extração é idêntico.
+#
+# Uso: python benchmarks/bench_leitura_parcial.py [repeticoes] [--resto=KB] [--artigo=KB]
+
+import base64
+import contextlib
+import gzip
+import io
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+import cache_extracao
+import latencia
+import metricas
+import upnewsfortaleza
+
+SEMENTE = 2026
+PARAGRAFO = ("A prefeitura anunciou nesta semana um conjunto de ações para a cidade, "
+             "com investimentos em saúde, educação e infraestrutura nos bairros. ")
+
+
+# ================= PÁGINA =================
+def pagina(artigo_kb, resto_kb):
+    paragrafos = ''.join(f'<p>{PARAGRAFO * 3}</p>\n' for _ in range(artigo_kb * 1024 // (len(PARAGRAFO) * 3)))
+    relacionados = ''.join(
+        f'<div class="related-item"><a href="/noticias/r{k}"><img src="/img/r{k}.jpg"></a>'
+        f'<h3>Notícia relacionada {k}</h3><p>{PARAGRAFO}</p></div>\n'
+        for k in range(resto_kb * 1024 // 2 // (len(PARAGRAFO) + 120)))
+    # Scripts minificados quase não comprimem: dados aleatórios (semente fixa)
+    aleatorio = random.Random(SEMENTE)
+    scripts = ''.join(f'<script>var bloco{k} = "</div>" + "{base64.b64encode(aleatorio.randbytes(300)).decode()}";</script>\n'
+                      for k in range(resto_kb * 1024 // 2 // 430))
+    return f'''<!DOCTYPE html>
+<html lang="pt-br"><head>
+<meta charset="utf-8">
+<title>Notícia de teste</title>
+<meta property="og:title" content="Prefeitura anuncia ações para os bairros">
+<meta property="og:image" content="https://www.fortaleza.ce.gov.br/images/destaque.jpg">
+</head><body>
+<nav><ul>{''.join(f'<li><a href="/m{k}">Menu {k}</a></li>' for k in range(40))}</ul></nav>
+<!-- <div class="itemFullText"> modelo antigo -->
+<div class="blog-item-full-content">
+<div class="itemFullText">
+<div class="legenda"><img src="/images/foto.jpg" alt="Foto"></div>
+{paragrafos}
+</div>
+</div>
+<div class="related-posts">{relacionados}</div>
+{scripts}
+<footer>{PARAGRAFO * 20}</footer>
+</body></html>'''.encode('utf-8')
+
+
+def servidor(corpo):
+    comprimido = gzip.compress(corpo)
+
+    class Manipulador(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def do_GET(self):
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/html; charset=utf-8')
+            self.send_header('Content-Encoding', 'gzip')
+            self.send_header('Content-Length', str(len(comprimido)))
+            self.end_headers()
+            try:
+                # Em blocos, como um servidor real: o cliente pode desistir no meio
+                for inicio in range(0, len(comprimido), 8192):
+                    self.wfile.write(comprimido[inicio:inicio + 8192])
+            except (BrokenPipeError, ConnectionResetError):
+                pass
+
+        def log_message(self, *args):
+            pass
+
+    http = ThreadingHTTPServer(('127.0.0.1', 0), Manipulador)
+    http.handle_error = lambda *args: None   # conexões encerradas pelo cliente no meio da página
+    threading.Thread(target=http.serve_forever, daemon=True).start()
+    return http, len(comprimido)
+
+
+# ================= MEDIÇÃO =================
+def medir(url, fim, repeticoes):
+    upnewsfortaleza.FIM_CONTEUDO = fim
+    metricas.reiniciar()
+    resultado = None
+    inicio = time.perf_counter()
+    for _ in range(repeticoes):
+        with contextlib.redirect_stdout(io.StringIO()):
+            resultado = upnewsfortaleza.extrair_conteudo_completo(url, {}, None)
+    segundos = (time.perf_counter() - inicio) / repeticoes
+    contadores = metricas.resumo()['contadores']
+    return {
+        'ms': segundos * 1000,
+        'rede': contadores.get('transporte.bytes_rede', 0) / repeticoes,
+        'parsing': contadores.get('leitura_parcial.bytes_usados', 0) / repeticoes,
+        'resultado': resultado,
+    }
+
+
+def main():
+    argumentos = [a for a in sys.argv[1:] if not a.startswith('--')]
+    opcoes = dict(a[2:].split('=', 1) for a in sys.argv[1:] if a.startswith('--') and '=' in a)
+    repeticoes = int(argumentos[0]) if argumentos else 20
+    corpo = pagina(int(opcoes.get('artigo', 8)), int(opcoes.get('resto', 300)))
+
+    with tempfile.TemporaryDirectory() as pasta:
+        cache_extracao.PASTA_CACHE = pasta
+        latencia.ARQUIVO = os.path.join(pasta, 'latencias.json')
+        http, comprimido = servidor(corpo)
+        url = f'http://127.0.0.1:{http.server_address[1]}/noticias/teste'
+        print(f"📄 Página: {len(corpo) // 1024} KB ({comprimido // 1024} KB com gzip), {repeticoes} repetições\n")
+
+        # Cache de extração desligado: cada repetição baixa e extrai de novo
+        obter, guardar = cache_extracao.obter, cache_extracao.guardar
+        cache_extracao.obter = lambda *a, **k: None
+        cache_extracao.guardar = lambda *a, **k: None
+        try:
+            medir(url, [], 2)  # aquecimento (conexão, imports do parser)
+            versoes = {'completa': medir(url, [], repeticoes),
+                       'parcial': medir(url, ['div.itemFullText'], repeticoes)}
+        finally:
+            cache_extracao.obter, cache_extracao.guardar = obter, guardar
+            http.shutdown()
+
+    print(f"{'versão':<10}{'rede KB':>10}{'parsing KB':>12}{'ms/página':>12}")
+    print("-" * 44)
+    for nome, v in versoes.items():
+        parsing = v['parsing'] or len(corpo)
+        print(f"{nome:<10}{v['rede'] / 1024:>10.1f}{parsing / 1024:>12.1f}{v['ms']:>12.2f}")
+    completa, parcial = versoes['completa'], versoes['parcial']
+    print(f"\n⚡ {completa['ms'] / parcial['ms']:.1f}x mais rápido, "
+          f"{1 - parcial['rede'] / completa['rede']:.0%} menos bytes na rede")
+    print("✅ Extração idêntica" if completa['resultado'] == parcial['resultado']
+          else "❌ Extração diferente entre as versões")
+
+
+if __name__ == "__main__":
+    main()
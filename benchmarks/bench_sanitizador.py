@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+# bench_sanitizador.py - Limpeza antiga (várias passadas) x sanitizador.py (uma passada)
+#
+# Páginas gravadas em benchmarks/paginas/<fonte>/*.html são usadas como
+# amostra; `--gravar` baixa as notícias mais recentes do histórico de cada
+# fonte para essa pasta. Sem páginas gravadas (ex.: sem rede), as páginas
+# são remontadas a partir dos corpos de notícia dos feeds commitados, com o
+# ruído típico dos portais (scripts, compartilhamento, anúncios, lazy load).
+#
+# Mede só a limpeza (o parse de cada repetição fica fora do cronômetro).
+#
+# Uso: python benchmarks/bench_sanitizador.py [repeticoes]
+#      python benchmarks/bench_sanitizador.py --gravar
+
+import os
+import re
+import sys
+import time
+import xml.etree.ElementTree as ET
+from urllib.parse import urljoin
+
+from bs4 import BeautifulSoup
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+import arquivo
+import sanitizador
+import transporte
+import upnewsagenciabr
+import upnewsfortaleza
+
+PASTA_PAGINAS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "paginas")
+
+AMOSTRAS = {
+    'fortaleza': ('feed_fortaleza_hoje.xml', 'https://www.fortaleza.ce.gov.br/noticias/x', 'div.itemFullText'),
+    'agenciabrasil': ('feed_agenciabrasil_wp.xml', 'https://agenciabrasil.ebc.com.br/geral/noticia/x', 'article'),
+}
+
+NS_CONTENT = '{http://purl.org/rss/1.0/modules/content/}encoded'
+
+RUIDO = '''
+<div class="social-share"><a href="/share?fb" style="x"><img src="/icons/fb.png" class="icon"></a></div>
+<script>var _gaq = _gaq || []; _gaq.push(['_trackPageview']);</script>
+<div class="google-ad ads-top"><iframe src="//ads.example.com/x"></iframe></div>
+<style>.x{color:red}</style>
+<p class="texto destaque" style="font-weight:bold">Leia também: <a href="/noticias/outra" class="link">outra notícia</a></p>
+<figure class="imagem"><img src="data:image/gif;base64,R0lGOD" data-src="/images/foto ção.jpg" alt="Foto" width="800" class="lazy"></figure>
+<div class="related-posts"><ul><li><a href="/noticias/1">Relacionada 1</a></li><li><a href="/noticias/2">Relacionada 2</a></li></ul></div>
+<div class="comments"><form><input name="q"><button>Enviar</button></form></div>
+<nav class="breadcrumb"><a href="/">Início</a></nav>
+'''
+
+
+# ================= LIMPEZAS ANTIGAS (copiadas dos scripts) =================
+def limpeza_antiga_fortaleza(conteudo, url_noticia):
+    for tag in conteudo.find_all(['script', 'style', 'iframe', 'nav', 'aside']):
+        tag.decompose()
+
+    classes_para_remover = [
+        'social-share', 'share-buttons', 'compartilhar',
+        'related-posts', 'posts-relacionados',
+        'comments', 'comentarios', 'newsletter',
+        'ad', 'ads', 'advertisement'
+    ]
+    for elemento in conteudo.find_all(True):
+        # No script original faltava esta guarda: descendentes de um elemento já
+        # removido quebravam a extração inteira (AttributeError no bs4 atual)
+        if elemento.decomposed:
+            continue
+        if elemento.get('class'):
+            classes = elemento.get('class')
+            if any(cls in str(classes) for cls in classes_para_remover):
+                elemento.decompose()
+                continue
+
+    for tag in conteudo.find_all(True):
+        if tag.name == 'img':
+            src = None
+            for attr in ['src', 'data-src', 'data-lazy-src', 'data-original', 'data-actual-src']:
+                val = tag.get(attr)
+                if val and not val.startswith('data:'):
+                    src = val
+                    break
+            if not src:
+                src = tag.get('src')
+            if src:
+                src = src.strip().replace('\n', '').replace('\r', '')
+                if not src.startswith(('http://', 'https://', 'data:')):
+                    if src.startswith('//'):
+                        src = 'https:' + src
+                    elif src.startswith('/'):
+                        src = '/'.join(url_noticia.split('/')[:3]) + src
+                    else:
+                        src = urljoin(url_noticia, src)
+                tag['src'] = upnewsfortaleza.encodificar_url(src)
+            for attr in list(dict(tag.attrs).keys()):
+                if attr not in ['src', 'alt', 'title']:
+                    del tag[attr]
+            tag['style'] = 'max-width:100%; height:auto;'
+        elif tag.name == 'a':
+            href = tag.get('href')
+            if href:
+                href = href.strip().replace('\n', '').replace('\r', '')
+                if not href.startswith(('http://', 'https://', 'mailto:', 'tel:', 'javascript:', '#')):
+                    if href.startswith('//'):
+                        href = 'https:' + href
+                    elif href.startswith('/'):
+                        href = '/'.join(url_noticia.split('/')[:3]) + href
+                    else:
+                        href = urljoin(url_noticia, href)
+                tag['href'] = upnewsfortaleza.encodificar_url(href)
+            for attr in list(dict(tag.attrs).keys()):
+                if attr != 'href':
+                    del tag[attr]
+        else:
+            if 'style' in tag.attrs:
+                del tag['style']
+            if 'class' in tag.attrs:
+                del tag['class']
+    return conteudo
+
+
+def limpeza_antiga_agenciabrasil(content_div, url):
+    for tag_name in ["script", "style", "iframe", "aside", "nav", "header", "footer",
+                     "form", "button", "input", "select", "textarea"]:
+        for element in content_div.find_all(tag_name):
+            element.decompose()
+    for element in content_div.find_all(class_=re.compile(
+            r"ad|banner|publicidade|propaganda|ads|widget|related|share|social|comentario|comment|meta|footer|header|navigation",
+            re.I)):
+        element.decompose()
+    return content_div
+
+
+LIMPEZAS = {
+    'fortaleza': (limpeza_antiga_fortaleza, upnewsfortaleza.REGRAS_CONTEUDO),
+    'agenciabrasil': (limpeza_antiga_agenciabrasil, upnewsagenciabr.REGRAS_CONTEUDO),
+}
+
+
+# ================= AMOSTRAS =================
+def gravar_paginas(por_fonte=10):
+    """Baixa as notícias mais recentes do histórico de cada fonte."""
+    for fonte in AMOSTRAS:
+        pasta = os.path.join(PASTA_PAGINAS, fonte)
+        os.makedirs(pasta, exist_ok=True)
+        for indice, registro in enumerate(arquivo.recentes(fonte, por_fonte, com_conteudo=False), 1):
+            try:
+                resposta = transporte.sessao().get(registro['link'], timeout=20)
+                resposta.raise_for_status()
+            except Exception as e:
+                print(f"⚠️  {registro['link'][:70]}: {str(e)[:60]}")
+                continue
+            with open(os.path.join(pasta, f"{indice:02d}.html"), 'wb') as f:
+                f.write(resposta.content)
+        print(f"💾 {fonte}: {len(os.listdir(pasta))} página(s) em {pasta}")
+
+
+def paginas_gravadas(fonte):
+    pasta = os.path.join(PASTA_PAGINAS, fonte)
+    if not os.path.isdir(pasta):
+        return []
+    paginas = []
+    for nome in sorted(os.listdir(pasta)):
+        if nome.endswith('.html'):
+            with open(os.path.join(pasta, nome), 'rb') as f:
+                paginas.append(f.read().decode('utf-8', 'replace'))
+    return paginas
+
+
+def paginas_sinteticas(fonte):
+    """Corpos de notícia do feed commitado dentro de uma página com ruído de portal."""
+    nome_feed, _, seletor = AMOSTRAS[fonte]
+    caminho = os.path.join(RAIZ, nome_feed)
+    if not os.path.exists(caminho):
+        return []
+    classe = seletor.split('.', 1)[1] if '.' in seletor else None
+    abre = f'<div class="{classe}">' if classe else f'<{seletor}>'
+    fecha = '</div>' if classe else f'</{seletor}>'
+    paginas = []
+    for item in ET.parse(caminho).getroot().iter('item'):
+        corpo = item.findtext(NS_CONTENT) or item.findtext('description') or ''
+        paginas.append(
+            '<html><head><title>x</title><script>x()</script></head><body>'
+            f'<header class="site-header"><nav><a href="/">Início</a></nav></header>'
+            f'{abre}{RUIDO}{corpo}{RUIDO}{fecha}'
+            '<footer class="footer">Rodapé</footer></body></html>'
+        )
+    return paginas
+
+
+# ================= MEDIÇÃO =================
+def medir(paginas, seletor, limpar, repeticoes):
+    total = 0.0
+    resultado = None
+    for _ in range(repeticoes):
+        for pagina in paginas:
+            soup = BeautifulSoup(pagina, 'html.parser')
+            alvo = soup.select_one(seletor) or soup
+            inicio = time.perf_counter()
+            resultado = limpar(alvo)
+            total += time.perf_counter() - inicio
+    return total / (repeticoes * len(paginas)) * 1000, resultado
+
+
+def main():
+    if sys.argv[1:] == ['--gravar']:
+        gravar_paginas()
+        return
+
+    repeticoes = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+
+    print(f"{'fonte':<15}{'origem':<11}{'páginas':>8}{'antiga ms':>11}{'nova ms':>10}{'ganho':>8}{'texto':>8}")
+    print("-" * 71)
+    for fonte, (antiga, regras) in LIMPEZAS.items():
+        _, url, seletor = AMOSTRAS[fonte]
+        paginas, origem = paginas_gravadas(fonte), 'gravadas'
+        if not paginas:
+            paginas, origem = paginas_sinteticas(fonte), 'sintéticas'
+        if not paginas:
+            continue
+
+        ms_antiga, saida_antiga = medir(paginas, seletor, lambda no: antiga(no, url), repeticoes)
+        ms_nova, saida_nova = medir(paginas, seletor, lambda no: sanitizador.sanitizar(no, regras, url), repeticoes)
+
+        # Quanto do texto da última página cada limpeza preservou (a nova casa classes por palavra inteira)
+        texto_antigo = len(saida_antiga.get_text(strip=True))
+        texto_novo = len(saida_nova.get_text(strip=True))
+        print(f"{fonte:<15}{origem:<11}{len(paginas):>8}{ms_antiga:>11.3f}{ms_nova:>10.3f}"
+              f"{ms_antiga / ms_nova:>7.1f}x{texto_novo / max(texto_antigo, 1):>8.0%}")
+
+
+if __name__ == "__main__":
+    main()
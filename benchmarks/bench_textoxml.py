@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+# bench_textoxml.py - Escape antigo (laço por caractere) x textoxml.py
+#
+# Amostra: parágrafos de texto dos feeds commitados (acentuados, como os
+# reais) e os mesmos parágrafos só em ASCII. Compara, por parágrafo:
+#   antiga    - 5 .replace + gerador com char.isprintable() (upnewsagenciabr)
+#   translate - str.translate com tabela-dicionário para tudo (escapes inclusos)
+#   textoxml  - textoxml.escapar (classe compilada + translate só se preciso)
+# e, por documento, a limpeza de controles do feed inteiro.
+#
+# Uso: python benchmarks/bench_textoxml.py [repeticoes]
+
+import glob
+import html
+import os
+import re
+import sys
+import time
+import unicodedata
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+import textoxml
+
+TABELA_ESCAPE = {**textoxml.TABELA_TEXTO, ord('&'): '&amp;', ord('<'): '&lt;', ord('>'): '&gt;',
+                 ord('"'): '&quot;', ord("'"): '&apos;'}
+
+
+# ================= VERSÕES =================
+def antiga(texto):
+    texto = texto.replace('&', '&amp;')
+    texto = texto.replace('<', '&lt;')
+    texto = texto.replace('>', '&gt;')
+    texto = texto.replace('"', '&quot;')
+    texto = texto.replace("'", '&apos;')
+    return ''.join(char for char in texto if char.isprintable() or char in '\n\r\t')
+
+
+def so_translate(texto):
+    return texto.translate(TABELA_ESCAPE)
+
+
+def antiga_documento(texto):
+    return ''.join(char for char in texto if char.isprintable() or char in '\n\r\t')
+
+
+VERSOES = {'antiga': antiga, 'translate': so_translate, 'textoxml': textoxml.escapar}
+
+
+# ================= AMOSTRAS =================
+def paragrafos():
+    saida = []
+    for caminho in sorted(glob.glob(os.path.join(RAIZ, 'feed*.xml'))):
+        with open(caminho, encoding='utf-8') as f:
+            bruto = html.unescape(re.sub(r'<[^>]+>', '\n', html.unescape(f.read())))
+        saida.extend(p.strip() for p in bruto.split('\n') if len(p.strip()) > 80)
+    return saida
+
+
+def ascii_de(texto):
+    return unicodedata.normalize('NFKD', texto).encode('ascii', 'ignore').decode()
+
+
+def documentos():
+    saida = []
+    for caminho in sorted(glob.glob(os.path.join(RAIZ, 'feed*.xml'))):
+        with open(caminho, encoding='utf-8') as f:
+            saida.append(f.read())
+    return saida
+
+
+# ================= MEDIÇÃO =================
+def medir(funcao, textos, repeticoes):
+    inicio = time.perf_counter()
+    for _ in range(repeticoes):
+        for texto in textos:
+            funcao(texto)
+    return (time.perf_counter() - inicio) / (repeticoes * len(textos)) * 1e6
+
+
+def main():
+    repeticoes = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+
+    textos = paragrafos()
+    if not textos:
+        print("❌ Nenhum feed*.xml com texto na raiz")
+        return
+    media = sum(map(len, textos)) // len(textos)
+    print(f"📄 {len(textos)} parágrafos (média {media} caracteres)\n")
+
+    print(f"{'amostra':<14}" + ''.join(f"{nome + ' µs':>15}" for nome in VERSOES) + f"{'ganho':>8}")
+    print("-" * (14 + 15 * len(VERSOES) + 8))
+    for rotulo, amostra in (('acentuada', textos), ('ascii', [ascii_de(t) for t in textos])):
+        tempos = {nome: medir(funcao, amostra, repeticoes) for nome, funcao in VERSOES.items()}
+        print(f"{rotulo:<14}" + ''.join(f"{t:>15.2f}" for t in tempos.values())
+              + f"{tempos['antiga'] / tempos['textoxml']:>7.1f}x")
+
+    # Mesma saída nas três versões (exceto invisíveis/NBSP, que só a nova trata)
+    for texto in textos:
+        if antiga(texto) != textoxml.escapar(texto) and not textoxml.RE_TEXTO.search(texto):
+            print(f"⚠️  saída diferente: {texto[:60]!r}")
+            break
+
+    docs = documentos()
+    tamanho = sum(map(len, docs)) / len(docs) / 1024
+    ms_antiga = medir(antiga_documento, docs, max(repeticoes // 4, 1)) / 1000
+    ms_nova = medir(textoxml.limpar, docs, max(repeticoes // 4, 1)) / 1000
+    print(f"\n📦 documento inteiro ({len(docs)} feeds, média {tamanho:.0f} KB): "
+          f"antiga {ms_antiga:.2f} ms, textoxml.limpar {ms_nova:.2f} ms ({ms_antiga / ms_nova:.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+# cache_extracao.py - Cache de extração endereçado pelo conteúdo da página
+#
+# A chave é o hash do corpo HTML baixado + o nome e a versão do extrator (+
+# entradas extras que influenciam o resultado, como o link ou a miniatura da
+# listagem). Se a página veio byte a byte igual à da execução anterior, o
+# resultado final (HTML limpo, imagem, título) sai daqui e as etapas de
+# parsing/limpeza são puladas. Mudar a VERSAO_EXTRATOR de um script invalida
+# automaticamente tudo o que ele gravou.
+#
+# Um SQLite por fonte em cache/ (fora do git; os workflows o preservam com
+# actions/cache). Entradas sem uso há mais de DIAS_RETENCAO dias são podadas
+# ao abrir o banco.
+#
+# Uso: python cache_extracao.py            # tamanho do cache por fonte
+#      python cache_extracao.py podar      # remove entradas antigas
+
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import threading
+import zlib
+from datetime import date, timedelta
+
+import metricas
+
+# ================= CONFIGURAÇÕES =================
+PASTA_CACHE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cache")
+DIAS_RETENCAO = 7
+NIVEL_COMPRESSAO = 6
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS extracoes (
+    chave     TEXT PRIMARY KEY,
+    extrator  TEXT NOT NULL,
+    versao    TEXT NOT NULL,
+    resultado BLOB NOT NULL,
+    usado     TEXT NOT NULL
+) WITHOUT ROWID;
+"""
+
+_conexoes = {}
+_trava = threading.Lock()
+
+
+# ================= FUNÇÕES =================
+def _conectar(extrator):
+    if extrator not in _conexoes:
+        os.makedirs(PASTA_CACHE, exist_ok=True)
+        # O motor extrai em várias threads: uma conexão protegida pela trava
+        conexao = sqlite3.connect(os.path.join(PASTA_CACHE, f"{extrator}.sqlite3"), check_same_thread=False)
+        conexao.executescript(ESQUEMA)
+        # Poda uma vez por processo, na abertura
+        limite = (date.today() - timedelta(days=DIAS_RETENCAO)).isoformat()
+        with conexao:
+            conexao.execute("DELETE FROM extracoes WHERE usado < ?", (limite,))
+        _conexoes[extrator] = conexao
+    return _conexoes[extrator]
+
+
+def chave(extrator, versao, corpo, *extras):
+    """Hash de (corpo da página, extrator, versão, entradas extras)."""
+    h = hashlib.sha256(corpo if isinstance(corpo, bytes) else corpo.encode('utf-8'))
+    h.update(f"\0{extrator}\0{versao}".encode('utf-8'))
+    for extra in extras:
+        h.update(b"\0" + str(extra).encode('utf-8'))
+    return h.hexdigest()
+
+
+def obter(extrator, versao, corpo, *extras):
+    """Resultado guardado para esta página (dict), ou None se ainda não extraída."""
+    k = chave(extrator, versao, corpo, *extras)
+    with _trava:
+        conexao = _conectar(extrator)
+        linha = conexao.execute("SELECT resultado FROM extracoes WHERE chave = ?", (k,)).fetchone()
+        if linha is None:
+            metricas.contar('cache_extracao.faltas')
+            return None
+        hoje = date.today().isoformat()
+        with conexao:
+            conexao.execute("UPDATE extracoes SET usado = ? WHERE chave = ? AND usado != ?", (hoje, k, hoje))
+    metricas.contar('cache_extracao.acertos')
+    return json.loads(zlib.decompress(linha[0]).decode('utf-8'))
+
+
+def guardar(extrator, versao, corpo, resultado, *extras):
+    """Guarda o resultado (serializável em JSON) da extração desta página."""
+    k = chave(extrator, versao, corpo, *extras)
+    dados = zlib.compress(json.dumps(resultado, ensure_ascii=False).encode('utf-8'), NIVEL_COMPRESSAO)
+    with _trava:
+        conexao = _conectar(extrator)
+        with conexao:
+            conexao.execute(
+                "INSERT OR REPLACE INTO extracoes (chave, extrator, versao, resultado, usado) VALUES (?, ?, ?, ?, ?)",
+                (k, extrator, str(versao), dados, date.today().isoformat())
+            )
+
+
+def podar(extrator, dias=DIAS_RETENCAO):
+    """Remove entradas sem uso há mais de `dias` dias. Retorna quantas saíram."""
+    limite = (date.today() - timedelta(days=dias)).isoformat()
+    with _trava:
+        conexao = _conectar(extrator)
+        with conexao:
+            removidas = conexao.execute("DELETE FROM extracoes WHERE usado < ?", (limite,)).rowcount
+    return removidas
+
+
+def extratores():
+    if not os.path.isdir(PASTA_CACHE):
+        return []
+    return sorted(n[:-len('.sqlite3')] for n in os.listdir(PASTA_CACHE) if n.endswith('.sqlite3'))
+
+
+# ================= MAIN =================
+if __name__ == "__main__":
+    for nome in extratores():
+        if sys.argv[1:] == ['podar']:
+            print(f"🧹 {nome}: {podar(nome)} entrada(s) removida(s)")
+        total, tamanho = _conectar(nome).execute(
+            "SELECT COUNT(*), COALESCE(SUM(LENGTH(resultado)), 0) FROM extracoes"
+        ).fetchone()
+        print(f"🗃️  {nome}: {total} extração(ões), {tamanho / 1024:.1f} KB")
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+# cadencia.py - Intervalo de coleta aprendido com o histórico de publicação de cada fonte
+#
+# Todas as fontes eram consultadas no mesmo cron de hora em hora (ou no
+# INTERVALO fixo do agendador), mas a Agência Brasil publica o dia inteiro e
+# Caucaia algumas vezes por semana, quase sempre em horário de expediente.
+#
+# Aqui as datas de publicação dos últimos JANELA_DIAS dias do histórico
+# (arquivo.py) viram uma taxa esperada de notícias por hora do dia (horário
+# de Brasília), separada em dias úteis e fim de semana e suavizada com as
+# horas vizinhas. O intervalo de cada hora é o tempo para sair, em média,
+# ALVO_ITENS notícia nova, limitado a [MIN_MINUTOS, MAX_MINUTOS]: fonte
+# movimentada no horário de pico é consultada mais vezes; fonte parada e
+# madrugada recuam até MAX_MINUTOS.
+#
+#   - sem histórico suficiente (MIN_ITENS): vale o intervalo padrão da fonte;
+#   - fonte que só informa o dia (quase tudo no mesmo HH:MM, como o
+#     HORA_PADRAO de Caucaia): só a taxa diária conta, espalhada pelo dia.
+#
+# O mesmo perfil vira dica nos feeds: <ttl> com o intervalo da hora atual e
+# <skipHours> (em GMT, como pede o RSS 2.0) com as horas sem publicação.
+#
+# Nos workflows (cron mais frequente que o necessário), devido() diz se já
+# passou o intervalo desde a última coleta registrada em estado/<fonte>.json.
+# Só coleta concluída é registrada: execução que falha não adia a próxima.
+#
+# Uso:
+#   minutos = cadencia.intervalo('alece', 60)          # agendador
+#   cadencia.ttl('fortaleza', 60), cadencia.skip_hours('fortaleza')
+#   python cadencia.py [fonte...]                       # perfil aprendido
+#   python cadencia.py devido caucaia 120               # código 0 se é hora de coletar
+
+import os
+import sys
+import threading
+from datetime import datetime, date, timedelta, timezone
+
+import arquivo
+import estado
+from modelo import FUSO_BRASILIA
+
+# ================= CONFIGURAÇÕES =================
+JANELA_DIAS = 28
+MIN_ITENS = 20
+ALVO_ITENS = 1.0          # notícias novas esperadas por coleta
+MIN_MINUTOS = 20          # o cron dos workflows roda a cada 20 min: menos que isso não acontece
+MAX_MINUTOS = 240
+FOLGA_MINUTOS = 5         # atraso tolerado do cron ao decidir se a coleta está devida
+
+# Uma hora entra em <skipHours> se a taxa suavizada dela fica abaixo disto
+TAXA_SILENCIO = 0.02      # notícias/hora (menos de ~1 a cada 50 dias)
+
+# Fração de itens no mesmo HH:MM a partir da qual a fonte "não tem hora"
+CONCENTRACAO_SEM_HORA = 0.8
+
+_perfis = {}              # fonte -> (dia calculado, perfil)
+_trava = threading.Lock()
+
+
+# ================= APRENDIZADO =================
+def _suavizar(contagens):
+    """Média com as horas vizinhas (0,25 / 0,5 / 0,25), circular."""
+    return [0.25 * contagens[h - 1] + 0.5 * contagens[h] + 0.25 * contagens[(h + 1) % 24] for h in range(24)]
+
+
+def _classe(dia):
+    return 'fim_de_semana' if dia.weekday() >= 5 else 'util'
+
+
+def _aprender(fonte, hoje):
+    if not os.path.exists(os.path.join(arquivo.PASTA_HISTORICO, f"{fonte}.sqlite3")):
+        return None
+    inicio = hoje - timedelta(days=JANELA_DIAS)
+    try:
+        itens = arquivo.consultar(fonte, inicio, hoje - timedelta(days=1), com_conteudo=False)
+    except Exception:
+        return None
+    if len(itens) < MIN_ITENS:
+        return None
+
+    dias = {'util': 0, 'fim_de_semana': 0}
+    for k in range(JANELA_DIAS):
+        dias[_classe(inicio + timedelta(days=k))] += 1
+
+    locais = [r['publicado'].astimezone(FUSO_BRASILIA) for r in itens]
+    horarios = {}
+    for local in locais:
+        horarios[(local.hour, local.minute)] = horarios.get((local.hour, local.minute), 0) + 1
+    sem_hora = max(horarios.values()) >= CONCENTRACAO_SEM_HORA * len(locais)
+
+    contagens = {'util': [0] * 24, 'fim_de_semana': [0] * 24}
+    for local in locais:
+        contagens[_classe(local.date())][local.hour] += 1
+
+    taxas = {}
+    for classe, por_hora in contagens.items():
+        if sem_hora:
+            por_hora = [sum(por_hora) / 24] * 24
+        taxas[classe] = [c / max(dias[classe], 1) for c in _suavizar(por_hora)]
+    return {'itens': len(itens), 'sem_hora': sem_hora, 'taxas': taxas}
+
+
+def perfil(fonte):
+    """{'itens', 'sem_hora', 'taxas': {'util'|'fim_de_semana': [24 taxas/hora]}}, ou None."""
+    hoje = datetime.now(FUSO_BRASILIA).date()
+    with _trava:
+        em_cache = _perfis.get(fonte)
+        if em_cache and em_cache[0] == hoje:
+            return em_cache[1]
+    calculado = _aprender(fonte, hoje)
+    with _trava:
+        _perfis[fonte] = (hoje, calculado)
+    return calculado
+
+
+# ================= INTERVALO =================
+def intervalo(fonte, padrao, quando=None):
+    """Minutos até a próxima coleta da fonte, pela taxa aprendida para a hora de `quando`."""
+    p = perfil(fonte)
+    if p is None:
+        return padrao
+    local = (quando or datetime.now(timezone.utc)).astimezone(FUSO_BRASILIA)
+    taxa = p['taxas'][_classe(local.date())][local.hour]
+    if taxa <= 0:
+        return MAX_MINUTOS
+    return int(round(min(MAX_MINUTOS, max(MIN_MINUTOS, 60 * ALVO_ITENS / taxa))))
+
+
+def ttl(fonte, padrao):
+    """<ttl> do feed: o intervalo de coleta na hora atual."""
+    return intervalo(fonte, padrao)
+
+
+def horas_silenciosas(fonte):
+    """Horas (GMT) sem publicação em nenhum tipo de dia, para <skipHours>."""
+    p = perfil(fonte)
+    if p is None or p['sem_hora']:
+        return []
+    silenciosas = [h for h in range(24) if all(p['taxas'][c][h] < TAXA_SILENCIO for c in p['taxas'])]
+    deslocamento = int(-datetime.now(FUSO_BRASILIA).utcoffset().total_seconds() // 3600)
+    return sorted((h + deslocamento) % 24 for h in silenciosas)
+
+
+def skip_hours(fonte):
+    """Elemento <skipHours> (ou '' sem horas silenciosas)."""
+    horas = horas_silenciosas(fonte)
+    if not horas:
+        return ''
+    return '<skipHours>' + ''.join(f'<hour>{h}</hour>' for h in horas) + '</skipHours>'
+
+
+# ================= COLETAS =================
+def registrar_coleta(fonte):
+    """Guarda o instante de uma coleta concluída (base de devido() nos workflows)."""
+    estado.atualizar(fonte, ultima_coleta=datetime.now(timezone.utc).isoformat(timespec='minutes'))
+
+
+def devido(fonte, padrao=60):
+    """True se já passou o intervalo aprendido desde a última coleta registrada."""
+    ultima = estado.ler(fonte).get('ultima_coleta')
+    if not ultima:
+        return True
+    decorrido = (datetime.now(timezone.utc) - datetime.fromisoformat(ultima)).total_seconds() / 60
+    return decorrido + FOLGA_MINUTOS >= intervalo(fonte, padrao)
+
+
+# ================= RELATÓRIO =================
+def imprimir(fonte):
+    p = perfil(fonte)
+    if p is None:
+        print(f"⏱️  {fonte}: histórico insuficiente (menos de {MIN_ITENS} itens em {JANELA_DIAS} dias)")
+        return
+    hoje = date.today()
+    util = hoje - timedelta(days=hoje.weekday())   # uma segunda e um sábado quaisquer
+    sabado = util + timedelta(days=5)
+    print(f"⏱️  {fonte}: {p['itens']} itens em {JANELA_DIAS} dias{' (sem hora: só a taxa diária)' if p['sem_hora'] else ''}")
+    for nome, dia in (('úteis', util), ('fim de semana', sabado)):
+        minutos = [intervalo(fonte, None, datetime(dia.year, dia.month, dia.day, h, 30, tzinfo=FUSO_BRASILIA))
+                   for h in range(24)]
+        coletas = sum(60 / m for m in minutos)
+        print(f"   {nome:<14} " + ' '.join(f"{m:>3}" for m in minutos) + f"  ≈ {coletas:.0f} coletas/dia")
+    horas = horas_silenciosas(fonte)
+    if horas:
+        print(f"   skipHours (GMT): {', '.join(map(str, horas))}")
+
+
+if __name__ == "__main__":
+    argumentos = sys.argv[1:]
+    if argumentos[:1] == ['devido']:
+        # Código de saída para os workflows: 0 = coletar, 1 = ainda não
+        alvo, padrao = argumentos[1], int(argumentos[2]) if len(argumentos) > 2 else 60
+        sys.exit(0 if devido(alvo, padrao) else 1)
+    import fontes
+    for nome in argumentos or (fontes.listar() + ['fortaleza', 'agenciabrasil', 'ceara', 'cmfor']):
+        imprimir(nome)
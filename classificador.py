@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+# classificador.py - Tema da notícia por termos ponderados, em uma passada
+#
+# O update_feed escolhia a imagem temática com sete elif em sequência, cada um
+# varrendo de novo o título e o HTML inteiro em minúsculas com "p in texto":
+# '99' casava com qualquer número, 'lei' com "leitura" e "eleição", 'jogo'
+# com "jogou"... e o primeiro tema da lista sempre ganhava.
+#
+# Aqui o texto (sem tags, em minúsculas) é quebrado em palavras uma vez e
+# cada palavra distinta é procurada nas tabelas compiladas, sem acento:
+#   'onibus'          - palavra exata
+#   'vacin*'          - prefixo (vacina, vacinação, vacinal)
+#   'projeto de lei'  - sequência de palavras
+# A resolução de cada palavra (acentos, exata, prefixo) fica guardada: a
+# contagem e o cruzamento com as palavras que pontuam são operações de
+# conjunto, e só palavras nunca vistas passam pelo Python. Todos os temas
+# pontuam na mesma passada; palavras do título valem
+# PESO_TITULO vezes mais. O resultado é o tema com mais pontos e a confiança
+# (fração dos pontos que ficou com ele, menor quando a evidência é pouca).
+#
+# Uso:
+#   tema, confianca = classificador.classificar(titulo, html_do_corpo)
+#   url = classificador.imagem(titulo, html_do_corpo, IMAGENS_POR_TEMA)
+#   rotulo = classificador.categoria(titulo, html_do_corpo)   # 'Saúde' ou None
+
+import html
+import re
+import unicodedata
+from collections import Counter
+
+# ================= CONFIGURAÇÕES =================
+PESO_TITULO = 3
+MIN_PONTOS = 4           # abaixo disso, nenhum tema (uma menção solta no corpo não basta)
+PONTOS_FIRMES = 12       # a partir disso a confiança é só a fração dos pontos
+MIN_CONFIANCA = 0.4      # para categoria(): abaixo disso, sem categoria
+MAX_CARACTERES = 6000    # corpo além disso não muda o tema, só custa tempo
+MAX_PALAVRAS = 50000     # palavras distintas guardadas (modo daemon)
+
+# Termos sem acento e em minúsculas; a ordem dos temas desempata
+TEMAS = {
+    'transporte': {
+        'transporte*': 3, 'onibus': 3, 'transito': 3, 'mobilidade': 3, 'uber': 3,
+        'mototaxi*': 3, 'motocicleta*': 2, 'motorista*': 2, 'ciclofaixa*': 3, 'ciclovia*': 3,
+        'metro': 2, 'metrofor': 3, 'vlt': 3, 'terminal': 1, 'passagem': 1,
+        'motorista de aplicativo': 3, '99 pop': 3, 'bilhete unico': 3,
+    },
+    'educacao': {
+        'educa*': 3, 'escola*': 3, 'professor*': 3, 'aluno*': 3,
+        'estudante*': 2, 'ensino': 3, 'creche*': 3, 'matricula*': 2, 'universidade*': 2,
+        'pedagog*': 2, 'enem': 3,
+    },
+    'saude': {
+        'saude': 3, 'hospita*': 3, 'medico*': 2, 'medica': 2, 'medicas': 2, 'medicina': 2,
+        'medicamento*': 2, 'vacina*': 3, 'sus': 3, 'upa': 2, 'upas': 2, 'doenca*': 2,
+        'dengue': 3, 'enfermeir*': 2, 'paciente*': 2, 'posto de saude': 2,
+    },
+    'seguranca': {
+        'seguranca publica': 3, 'guarda municipal': 3, 'policia*': 3, 'policial': 3,
+        'crime*': 2, 'criminal*': 2, 'violencia': 2, 'viatura*': 2, 'videomonitoramento': 3,
+    },
+    'cultura': {
+        'cultura*': 3, 'cultural': 3, 'musica*': 2, 'musical': 2, 'teatro*': 3, 'show*': 2,
+        'festival': 2, 'carnaval': 3, 'artista*': 2, 'exposicao': 2, 'museu*': 3,
+        'cinema': 2, 'evento*': 1, 'biblioteca*': 2, 'patrimonio historico': 3,
+    },
+    'esporte': {
+        'esport*': 3, 'atleta*': 3, 'campeonato*': 3, 'futebol': 3, 'arena': 2,
+        'torneio*': 2, 'olimpiada*': 2, 'jogo': 1, 'jogos': 1, 'ginasio*': 2, 'maratona*': 3,
+    },
+    'meioambiente': {
+        'meio ambiente': 3, 'ambiental': 2, 'ambientais': 2, 'sustentab*': 3,
+        'reciclage*': 3, 'arboriza*': 3, 'residuos': 2, 'lixo': 2, 'coleta seletiva': 3,
+        'desmatamento': 3, 'lagoa*': 1, 'praia*': 1, 'clima*': 1,
+    },
+    'sessao': {
+        'sessao': 3, 'sessoes': 3, 'plenario': 3, 'vereador*': 2, 'votacao': 2,
+        'deputad*': 2, 'parlamentar*': 1, 'audiencia publica': 2, 'ordem do dia': 2,
+    },
+    'projeto': {
+        'projeto de lei': 4, 'projetos de lei': 4, 'lei': 2, 'leis': 2, 'regulamenta*': 2,
+        'aprova*': 1, 'requerimento*': 2, 'emenda*': 2, 'sancion*': 2, 'indicacao': 1,
+        'lei complementar': 3,
+    },
+}
+
+ROTULOS = {
+    'transporte': 'Transporte',
+    'educacao': 'Educação',
+    'saude': 'Saúde',
+    'seguranca': 'Segurança',
+    'cultura': 'Cultura',
+    'esporte': 'Esporte',
+    'meioambiente': 'Meio Ambiente',
+    'sessao': 'Sessões',
+    'projeto': 'Projetos de Lei',
+}
+
+RE_TAG = re.compile(r'<[^>]+>')
+RE_PALAVRA = re.compile(r'\w+')
+
+
+# ================= COMPILAÇÃO =================
+ACENTOS = {'a': 'aáàâã', 'e': 'eéê', 'i': 'ií', 'o': 'oóôõ', 'u': 'uúü', 'c': 'cç'}
+
+
+def compilar(temas):
+    """Tabelas de busca a partir de {tema: {termo: peso}}."""
+    exatos, prefixos, sequencias = {}, {}, {}
+    for tema, termos in temas.items():
+        for termo, peso in termos.items():
+            prefixo = termo.endswith('*')
+            termo = ' '.join(normalizar(termo.rstrip('*')).split())
+            destino = sequencias if ' ' in termo else prefixos if prefixo else exatos
+            destino.setdefault(termo, []).append((tema, peso))
+    # Cada sequência tem seu regex, aceitando as letras com ou sem acento
+    regexes = {
+        termo: re.compile(r'\b' + r'\s+'.join(
+            ''.join(f'[{ACENTOS[l]}]' if l in ACENTOS else re.escape(l) for l in palavra)
+            for palavra in termo.split()) + r'\b')
+        for termo in sequencias
+    }
+    return {
+        'temas': list(temas),
+        'exatos': exatos,
+        'prefixos': prefixos,
+        'tamanhos': sorted({len(p) for p in prefixos}, reverse=True),
+        'sequencias': [(termo, frozenset(termo.split()), regexes[termo], alvos)
+                       for termo, alvos in sequencias.items()],
+        'palavras_sequencia': {p for termo in sequencias for p in termo.split()},
+        'vistas': set(),     # palavras (como aparecem no texto) já resolvidas
+        'relevantes': {},    # palavra -> [(tema, peso)], só as que pontuam
+        'dobradas': {},      # palavra -> forma sem acento, só as que compõem sequências
+    }
+
+
+def normalizar(texto):
+    """Minúsculas e sem acentos."""
+    texto = unicodedata.normalize('NFKD', texto.lower())
+    return texto.encode('ascii', 'ignore').decode('ascii')
+
+
+def _resolver(palavras, tabela):
+    """Resolve palavras nunca vistas (acentos, exata, prefixo) e guarda o resultado."""
+    exatos, prefixos, relevantes, vistas = (
+        tabela['exatos'], tabela['prefixos'], tabela['relevantes'], tabela['vistas'])
+    if len(vistas) >= MAX_PALAVRAS:
+        vistas.clear()
+        relevantes.clear()
+        tabela['dobradas'].clear()
+    for palavra in palavras:
+        dobrada = normalizar(palavra)
+        alvos = exatos.get(dobrada)
+        if alvos is None:
+            alvos = next((prefixos[dobrada[:n]] for n in tabela['tamanhos'] if dobrada[:n] in prefixos), None)
+        if alvos:
+            relevantes[palavra] = alvos
+        if dobrada in tabela['palavras_sequencia']:
+            tabela['dobradas'][palavra] = dobrada
+        vistas.add(palavra)
+
+
+TABELA = compilar(TEMAS)
+
+
+# ================= CLASSIFICAÇÃO =================
+def _pontuar(texto, peso_base, tabela, placar):
+    if not texto:
+        return
+    texto = texto[:MAX_CARACTERES].lower()
+    if '<' in texto:
+        texto = RE_TAG.sub(' ', texto)
+    if '&' in texto:
+        texto = html.unescape(texto)
+
+    # Contagem e interseções ficam em C; Python só vê palavras novas e as que pontuam
+    contagem = Counter(RE_PALAVRA.findall(texto))
+    novas = contagem.keys() - tabela['vistas']
+    if novas:
+        _resolver(novas, tabela)
+    relevantes = tabela['relevantes']
+    for palavra in contagem.keys() & relevantes.keys():
+        for tema, peso in relevantes.get(palavra, ()):
+            placar[tema] += peso * contagem[palavra] * peso_base
+
+    # Sequências: o regex só roda quando todas as palavras dela aparecem no texto
+    dobradas = tabela['dobradas']
+    presentes = {dobradas.get(p) for p in contagem.keys() & dobradas.keys()}
+    for termo, palavras, regex, alvos in tabela['sequencias']:
+        if palavras <= presentes:
+            vezes = len(regex.findall(texto))
+            for tema, peso in alvos:
+                placar[tema] += peso * vezes * peso_base
+
+
+def pontuar(titulo, texto='', tabela=None):
+    """Pontos de cada tema ({tema: pontos})."""
+    tabela = tabela or TABELA
+    placar = dict.fromkeys(tabela['temas'], 0)
+    _pontuar(titulo, PESO_TITULO, tabela, placar)
+    _pontuar(texto, 1, tabela, placar)
+    return placar
+
+
+def classificar(titulo, texto='', tabela=None, minimo=MIN_PONTOS):
+    """
+    Retorna (tema, confiança 0-1) ou (None, 0.0) quando nenhum tema alcança o mínimo.
+    A confiança é a fração dos pontos que ficou com o tema, reduzida quando a
+    evidência é pouca (menos de PONTOS_FIRMES).
+    """
+    placar = pontuar(titulo, texto, tabela)
+    tema = max(placar, key=placar.get) if placar else None
+    if not tema or placar[tema] < minimo:
+        return None, 0.0
+    fracao = placar[tema] / sum(placar.values())
+    return tema, round(fracao * min(1.0, placar[tema] / PONTOS_FIRMES), 2)
+
+
+def imagem(titulo, texto, imagens, tabela=None):
+    """URL de imagens[tema] para a notícia, ou imagens['default']."""
+    tema, _ = classificar(titulo, texto, tabela)
+    return imagens.get(tema) or imagens.get('default')
+
+
+def categoria(titulo, texto='', tabela=None, minimo_confianca=MIN_CONFIANCA):
+    """Rótulo legível do tema (ex.: 'Saúde'), ou None se a classificação for incerta."""
+    tema, confianca = classificar(titulo, texto, tabela)
+    if not tema or confianca < minimo_confianca:
+        return None
+    return ROTULOS.get(tema, tema)
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+# codificacao.py - Codificação decidida por host, decodificação única e mojibake
+#
+# Os parsers recebiam response.content (bytes): a cada página o BeautifulSoup
+# (UnicodeDammit) farejava a codificação de novo, e sem charset declarado o
+# palpite do charset_normalizer custa o dobro do parsing e pode errar (latin-1
+# lido como windows-1250 troca "ã" por "ă"). O upnewsfortaleza ainda definia
+# response.encoding = 'utf-8' e depois passava .content, que o ignora.
+#
+# Aqui a codificação de cada resposta vem, nesta ordem:
+#   1. do charset do Content-Type (vale só para a resposta);
+#   2. da decisão já tomada para o host;
+#   3. de BOM, <meta charset> / http-equiv ou declaração XML nos primeiros
+#      AMOSTRA_META bytes, ou de tentar UTF-8 estrito (senão windows-1252,
+#      como fazem os navegadores) - e essa decisão fica guardada para o host.
+# O corpo é decodificado uma vez e o parser recebe str.
+#
+# Mojibake (UTF-8 lido como latin-1/windows-1252: "Ã§", "Ã£", "â€œ") é
+# procurado no texto decodificado:
+#   - decodificado como 8 bits e o corpo é UTF-8 válido: decodifica de novo
+#     em UTF-8 e o host passa a UTF-8 (codificacao.corrigidas);
+#   - já em UTF-8 (texto duplamente codificado na origem): cada sequência é
+#     trocada pelo caractere certo (codificacao.mojibake).
+# Bytes inválidos na codificação guardada refazem a decisão do host.
+#
+# Uso:
+#   texto = codificacao.decodificar(resposta)     # resposta do requests
+#   soup = BeautifulSoup(texto, 'html.parser')
+
+import codecs
+import re
+import threading
+from urllib.parse import urlsplit
+
+import metricas
+
+# ================= CONFIGURAÇÕES =================
+AMOSTRA_META = 4096
+PADRAO_8_BITS = 'cp1252'
+
+RE_CHARSET = re.compile(r'''charset\s*=\s*["']?([\w.:-]+)''', re.I)
+RE_META = re.compile(rb'''<meta[^>]+charset\s*=\s*["']?([\w.:-]+)''', re.I)
+RE_XML = re.compile(rb'''^\s*<\?xml[^>]+encoding\s*=\s*["']([\w.:-]+)''', re.I)
+
+BOMS = (
+    (codecs.BOM_UTF8, 'utf-8'),
+    (codecs.BOM_UTF16_LE, 'utf-16'),
+    (codecs.BOM_UTF16_BE, 'utf-16'),
+)
+
+# Caracteres comuns em português e na tipografia dos portais
+_CARACTERES = 'áàâãäéèêëíìîïóòôõöúùûüçñÁÀÂÃÄÉÈÊËÍÌÎÏÓÒÔÕÖÚÙÛÜÇÑ“”‘’–—…ºª°€•'
+
+_hosts = {}               # host -> codificação decidida
+_avisados = set()
+_trava = threading.Lock()
+
+
+# ================= TABELAS =================
+def _reparos():
+    """{sequência mojibake: caractere}, para cada caractere lido como cp1252 ou latin-1."""
+    reparos = {}
+    for caractere in _CARACTERES:
+        bruto = caractere.encode('utf-8')
+        for errada in ('cp1252', 'latin-1'):
+            try:
+                reparos[bruto.decode(errada)] = caractere
+            except UnicodeDecodeError:
+                continue
+    return reparos
+
+
+REPAROS = _reparos()
+RE_MOJIBAKE = re.compile('|'.join(re.escape(s) for s in sorted(REPAROS, key=len, reverse=True)))
+# Toda sequência começa por um destes: a busca em C (str.__contains__) evita o
+# regex nas páginas limpas, que são quase todas
+INICIOS = sorted({s[:2] if s[0] == 'â' else s[0] for s in REPAROS})
+
+
+def _tem_mojibake(texto):
+    return any(inicio in texto for inicio in INICIOS) and RE_MOJIBAKE.search(texto) is not None
+
+
+# ================= DECISÃO =================
+def normalizar(nome):
+    """Nome canônico da codificação (latin-1/ascii viram cp1252, como nos navegadores), ou None."""
+    try:
+        nome = codecs.lookup(nome.strip().strip('"\'')).name
+    except (LookupError, AttributeError):
+        return None
+    return PADRAO_8_BITS if nome in ('iso8859-1', 'ascii', 'latin-1') else nome
+
+
+def _do_cabecalho(tipo):
+    m = RE_CHARSET.search(tipo or '')
+    return normalizar(m.group(1)) if m else None
+
+
+def _farejar(corpo):
+    """(codificação, origem) a partir do próprio corpo."""
+    for bom, nome in BOMS:
+        if corpo.startswith(bom):
+            return nome, 'bom'
+    amostra = corpo[:AMOSTRA_META]
+    m = RE_META.search(amostra) or RE_XML.search(amostra)
+    if m:
+        nome = normalizar(m.group(1).decode('ascii', 'ignore'))
+        if nome:
+            return nome, 'meta'
+    try:
+        corpo.decode('utf-8')
+        return 'utf-8', 'utf-8'
+    except UnicodeDecodeError:
+        return PADRAO_8_BITS, '8-bits'
+
+
+def _host(url):
+    return (urlsplit(url or '').hostname or '').lower()
+
+
+def esquecer(url=None):
+    """Descarta a decisão de um host (ou de todos)."""
+    with _trava:
+        if url is None:
+            _hosts.clear()
+        else:
+            _hosts.pop(_host(url), None)
+
+
+# ================= DECODIFICAÇÃO =================
+def _avisar(host, mensagem):
+    if host not in _avisados:
+        _avisados.add(host)
+        print(f"⚠️  {host}: {mensagem}")
+
+
+def decodificar(resposta, corpo=None):
+    """Texto da resposta (requests) decodificado uma vez, com a codificação do host."""
+    corpo = resposta.content if corpo is None else corpo
+    if not corpo:
+        return ''
+    host = _host(resposta.url)
+
+    codificacao = _do_cabecalho(resposta.headers.get('Content-Type'))
+    if codificacao:
+        metricas.contar('codificacao.cabecalho')
+    else:
+        with _trava:
+            codificacao = _hosts.get(host)
+        if codificacao:
+            metricas.contar('codificacao.cache')
+        else:
+            codificacao, origem = _farejar(corpo)
+            metricas.contar(f'codificacao.decididas.{origem}')
+            with _trava:
+                _hosts[host] = codificacao
+
+    texto = corpo.decode(codificacao, errors='replace')
+    if '\ufffd' in texto and codificacao != 'utf-8':
+        # Bytes que não existem na codificação escolhida: decidir de novo pela página
+        metricas.contar('codificacao.invalidos')
+        codificacao, _ = _farejar(corpo)
+        with _trava:
+            _hosts[host] = codificacao
+        texto = corpo.decode(codificacao, errors='replace')
+    elif '\ufffd' in texto:
+        metricas.contar('codificacao.invalidos')
+
+    if not _tem_mojibake(texto):
+        return texto
+
+    if codificacao != 'utf-8':
+        try:
+            texto = corpo.decode('utf-8')
+        except UnicodeDecodeError:
+            pass
+        else:
+            # Declarado (ou decidido) como 8 bits, mas é UTF-8
+            metricas.contar('codificacao.corrigidas')
+            with _trava:
+                _hosts[host] = 'utf-8'
+            _avisar(host, f"página declarada como {codificacao}, mas em UTF-8")
+            if not _tem_mojibake(texto):
+                return texto
+
+    # Texto duplamente codificado na origem: troca sequência a sequência
+    metricas.contar('codificacao.mojibake')
+    _avisar(host, "texto com mojibake (UTF-8 lido como latin-1 na origem), reparado")
+    return RE_MOJIBAKE.sub(lambda m: REPAROS[m.group()], texto)
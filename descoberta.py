@@ -0,0 +1,337 @@
+#!/usr/bin/env python3
+# descoberta.py - Descoberta de notícias por índices legíveis por máquina
+#
+# Antes de raspar a listagem HTML (seletores frágeis como blog-post-item ou
+# noticias_item), procura no portal um índice estruturado, nesta ordem:
+#
+#   1. WordPress REST (/wp-json/wp/v2/posts) - título e datas exatos
+#   2. Sitemaps de notícias e sitemaps comuns (robots.txt e caminhos usuais)
+#   3. RSS/Atom do próprio portal
+#
+# O modo encontrado fica guardado em estado/<fonte>.json e só é sondado de
+# novo depois de REVALIDAR_DIAS (ou se parar de funcionar). Cada execução
+# compara o lastmod de cada entrada com a maior modificação já vista: o que
+# não mudou sai marcado como conhecido e vem do histórico. Quando o portal
+# não oferece nada disso, descobrir() devolve None e o chamador usa a
+# listagem HTML de sempre.
+#
+# Uso: python descoberta.py <fonte> <url_base> [regex_de_links]
+
+import json
+import re
+import sys
+import xml.etree.ElementTree as ET
+from datetime import datetime, timedelta, timezone
+from urllib.parse import urljoin, urlsplit, unquote
+
+import estado
+import metricas
+import transporte
+from modelo import para_datetime
+
+# ================= CONFIGURAÇÕES =================
+REVALIDAR_DIAS = 7
+TIMEOUT = 15
+MAX_ENTRADAS = 50
+MAX_SITEMAPS_FILHOS = 3
+
+CAMINHOS_WP = ['/wp-json/wp/v2/posts?per_page=20&_fields=link,title,date_gmt,modified_gmt']
+CAMINHOS_SITEMAP = ['/news-sitemap.xml', '/sitemap-news.xml', '/sitemap_index.xml', '/sitemap.xml']
+CAMINHOS_RSS = ['/feed', '/rss', '/feed.xml', '/rss.xml']
+
+HEADERS = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64)'}
+
+
+# ================= FUNÇÕES AUXILIARES =================
+def _local(tag):
+    """Nome da tag sem namespace ('{ns}loc' -> 'loc')."""
+    return tag.rsplit('}', 1)[-1] if isinstance(tag, str) else ''
+
+
+def _filho(elemento, *nomes):
+    """Texto do primeiro descendente com um dos nomes locais informados."""
+    for sub in elemento.iter():
+        if _local(sub.tag) in nomes and sub.text and sub.text.strip():
+            return sub.text.strip()
+    return None
+
+
+def _baixar(url, headers, verify, estrito=False):
+    """
+    Resposta 200 com conteúdo, ou None. Com estrito (recuperação histórica),
+    qualquer outra resposta vira exceção, para não ser confundida com o fim
+    da listagem; só o 400 de página inexistente do WordPress passa.
+    """
+    resposta = transporte.sessao().get(url, headers=headers or HEADERS, timeout=TIMEOUT, verify=verify)
+    metricas.contar('http.requisicoes')
+    metricas.contar('http.bytes', len(resposta.content))
+    if resposta.status_code == 200 and resposta.content:
+        return resposta
+    if not estrito:
+        return None
+    if resposta.status_code == 400 and b'rest_post_invalid_page_number' in resposta.content:
+        return resposta
+    resposta.raise_for_status()
+    raise ValueError(f"HTTP {resposta.status_code} sem conteúdo em {url}")
+
+
+def _invalido(estrito, motivo):
+    """None para a sondagem; exceção na recuperação histórica."""
+    if estrito:
+        raise ValueError(motivo)
+    return None
+
+
+def _entrada(link, titulo, publicado, modificado=None):
+    publicado = para_datetime(publicado)
+    return {
+        'link': link,
+        'titulo': titulo or None,
+        'publicado': publicado,
+        'modificado': para_datetime(modificado) or publicado,
+    }
+
+
+def titulo_do_link(url):
+    """Título provisório a partir do slug da URL, para sitemaps sem título."""
+    slug = unquote(urlsplit(url).path.rstrip('/').rsplit('/', 1)[-1])
+    slug = re.sub(r'\.\w+$', '', slug)
+    texto = re.sub(r'[-_]+', ' ', slug).strip()
+    return texto[:1].upper() + texto[1:]
+
+
+# ================= LEITORES =================
+def ler_wp(url, headers=None, verify=True, estrito=False):
+    """Posts da API REST do WordPress ([] depois da última página)."""
+    resposta = _baixar(url, headers, verify, estrito)
+    if resposta is None:
+        return None
+    try:
+        posts = resposta.json()
+    except ValueError:
+        return _invalido(estrito, f"JSON inválido em {url}")
+    if isinstance(posts, dict) and posts.get('code') == 'rest_post_invalid_page_number':
+        return []
+    if not isinstance(posts, list):
+        return _invalido(estrito, f"resposta inesperada da API REST em {url}")
+    entradas = []
+    for post in posts:
+        if not isinstance(post, dict) or not post.get('link'):
+            continue
+        titulo = (post.get('title') or {}).get('rendered') if isinstance(post.get('title'), dict) else post.get('title')
+        titulo = re.sub(r'<[^>]+>', '', titulo or '')
+        # date_gmt vem sem fuso: é UTC
+        publicado = (post.get('date_gmt') or '') + ('+00:00' if post.get('date_gmt') else '')
+        modificado = (post.get('modified_gmt') or '') + ('+00:00' if post.get('modified_gmt') else '')
+        entradas.append(_entrada(post['link'], titulo, publicado or None, modificado or None))
+    return entradas
+
+
+def ler_sitemap(url, headers=None, verify=True, desde=None, max_filhos=MAX_SITEMAPS_FILHOS, estrito=False):
+    """
+    Entradas de um sitemap (comum ou de notícias). Num índice de sitemaps,
+    segue só os `max_filhos` filhos mais recentes (None: todos), e apenas os
+    modificados desde `desde`.
+    """
+    resposta = _baixar(url, headers, verify, estrito)
+    if resposta is None:
+        return None
+    try:
+        raiz = ET.fromstring(resposta.content)
+    except ET.ParseError:
+        return _invalido(estrito, f"XML inválido em {url}")
+
+    if _local(raiz.tag) == 'sitemapindex':
+        filhos = []
+        for no in raiz:
+            loc = _filho(no, 'loc')
+            if loc:
+                filhos.append((para_datetime(_filho(no, 'lastmod')), loc))
+        minimo = datetime.min.replace(tzinfo=timezone.utc)
+        filhos.sort(key=lambda f: f[0] or minimo, reverse=True)
+        entradas = []
+        for lastmod, loc in filhos[:max_filhos]:
+            if desde and lastmod and lastmod <= desde and entradas:
+                break
+            entradas.extend(ler_sitemap(loc, headers, verify, max_filhos=max_filhos, estrito=estrito) or [])
+        return entradas
+
+    if _local(raiz.tag) != 'urlset':
+        return _invalido(estrito, f"{url} não é um sitemap")
+    entradas = []
+    for no in raiz:
+        loc = _filho(no, 'loc')
+        if not loc:
+            continue
+        # Título e data de publicação só no bloco <news:news> (image:title é outra coisa).
+        # Num sitemap comum o lastmod é a última edição, não a publicação: a
+        # data fica para a listagem ou para a página da notícia
+        noticia = next((sub for sub in no if _local(sub.tag) == 'news'), None)
+        titulo = _filho(noticia, 'title') if noticia is not None else None
+        publicacao = _filho(noticia, 'publication_date') if noticia is not None else None
+        lastmod = _filho(no, 'lastmod')
+        entradas.append(_entrada(loc, titulo, publicacao, lastmod or publicacao))
+    return entradas
+
+
+def ler_rss(url, headers=None, verify=True, estrito=False):
+    """Itens de um RSS 2.0 ou Atom."""
+    resposta = _baixar(url, headers, verify, estrito)
+    if resposta is None:
+        return None
+    try:
+        raiz = ET.fromstring(resposta.content)
+    except ET.ParseError:
+        return _invalido(estrito, f"XML inválido em {url}")
+    if _local(raiz.tag) not in ('rss', 'feed', 'RDF'):
+        return _invalido(estrito, f"{url} não é RSS/Atom")
+    entradas = []
+    for no in raiz.iter():
+        if _local(no.tag) not in ('item', 'entry'):
+            continue
+        link = _filho(no, 'link')
+        if not link:
+            for sub in no:
+                if _local(sub.tag) == 'link' and sub.get('href'):
+                    link = sub.get('href')
+                    break
+        if not link:
+            continue
+        publicado = _filho(no, 'pubDate', 'published', 'date')
+        modificado = _filho(no, 'updated', 'modified') or publicado
+        entradas.append(_entrada(link, _filho(no, 'title'), publicado, modificado))
+    return entradas
+
+
+LEITORES = {'wp': ler_wp, 'sitemap': ler_sitemap, 'rss': ler_rss}
+
+
+# ================= SONDAGEM =================
+def _sitemaps_do_robots(url_base, headers, verify):
+    try:
+        resposta = _baixar(urljoin(url_base, '/robots.txt'), headers, verify)
+    except Exception:
+        return []
+    if resposta is None:
+        return []
+    sitemaps = re.findall(r'(?im)^\s*sitemap:\s*(\S+)', resposta.text)
+    # Sitemaps de notícias primeiro
+    return sorted(sitemaps, key=lambda u: 'news' not in u.lower())
+
+
+def filtrar(entradas, filtro):
+    padrao = re.compile(filtro) if filtro else None
+    return [e for e in entradas if e['link'] and (not padrao or padrao.search(e['link']))]
+
+
+def _datadas(entradas, sem_data):
+    """Entradas com data de publicação (ou só de modificação, se a página da notícia traz a data)."""
+    return [e for e in entradas if e['publicado'] or (sem_data and e['modificado'])]
+
+
+def sondar(url_base, filtro=None, headers=None, verify=True, sem_data=False):
+    """
+    Procura o melhor índice estruturado do portal.
+    sem_data: aceitar índice sem data de publicação (sitemap comum), para
+    fontes que tiram a data da página da notícia.
+    Retorna (modo, url) ou ('html', None) se nenhum serve.
+    """
+    candidatos = [('wp', urljoin(url_base, c)) for c in CAMINHOS_WP]
+    candidatos += [('sitemap', u) for u in _sitemaps_do_robots(url_base, headers, verify)]
+    candidatos += [('sitemap', urljoin(url_base, c)) for c in CAMINHOS_SITEMAP]
+    candidatos += [('rss', urljoin(url_base, c)) for c in CAMINHOS_RSS]
+
+    vistos = set()
+    for modo, url in candidatos:
+        if url in vistos:
+            continue
+        vistos.add(url)
+        try:
+            entradas = LEITORES[modo](url, headers, verify)
+        except Exception:
+            continue
+        # Só serve se traz notícias (links do padrão da fonte) com data
+        if entradas and _datadas(filtrar(entradas, filtro), sem_data):
+            return modo, url
+    return 'html', None
+
+
+# ================= API =================
+def indice(fonte, url_base, filtro=None, headers=None, verify=True, sem_data=False):
+    """
+    Modo de descoberta da fonte ({'modo', 'url', 'verificado', ...}), do
+    estado ou sondado de novo quando vencido. 'modo' é 'html' quando o portal
+    não tem índice estruturado.
+    """
+    dados = estado.ler(fonte).get('descoberta') or {}
+    verificado = para_datetime(dados.get('verificado'))
+    agora = datetime.now(timezone.utc)
+
+    if not dados.get('modo') or not verificado or agora - verificado > timedelta(days=REVALIDAR_DIAS):
+        modo, url = sondar(url_base, filtro, headers, verify, sem_data)
+        dados = {'modo': modo, 'url': url, 'verificado': agora.isoformat(timespec='seconds'),
+                 'ultima_modificacao': dados.get('ultima_modificacao') if modo == dados.get('modo') else None}
+        estado.atualizar(fonte, descoberta=dados)
+        print(f"🔎 Descoberta ({fonte}): {modo}{' em ' + url if url else ''}")
+    return dados
+
+
+def descobrir(fonte, url_base, filtro=None, headers=None, verify=True, sem_data=False):
+    """
+    Entradas da fonte pelo índice estruturado, da mais nova para a mais antiga:
+    [{'link', 'titulo', 'publicado', 'modificado', 'novo'}].
+    'publicado' é None quando o índice não informa a publicação (sitemap
+    comum; só com sem_data). 'novo' indica lastmod posterior à última
+    execução (ou entrada nunca vista).
+    Retorna None quando a fonte só tem a listagem HTML.
+    """
+    dados = indice(fonte, url_base, filtro, headers, verify, sem_data)
+
+    if dados['modo'] == 'html':
+        return None
+
+    desde = para_datetime(dados.get('ultima_modificacao'))
+    try:
+        if dados['modo'] == 'sitemap':
+            entradas = ler_sitemap(dados['url'], headers, verify, desde=desde)
+        else:
+            entradas = LEITORES[dados['modo']](dados['url'], headers, verify)
+    except Exception as e:
+        print(f"⚠️  Descoberta ({fonte}) falhou: {str(e)[:60]}")
+        entradas = None
+
+    entradas = filtrar(entradas or [], filtro)
+    if not _datadas(entradas, sem_data):
+        # Índice sumiu ou mudou: sondar de novo na próxima execução, listagem HTML nesta
+        dados['verificado'] = None
+        estado.atualizar(fonte, descoberta=dados)
+        return None
+
+    minimo = datetime.min.replace(tzinfo=timezone.utc)
+    entradas.sort(key=lambda e: e['publicado'] or e['modificado'] or minimo, reverse=True)
+    entradas = entradas[:MAX_ENTRADAS]
+    for entrada in entradas:
+        entrada['novo'] = not desde or not entrada['modificado'] or entrada['modificado'] > desde
+    return entradas
+
+
+def gravar_marca(fonte, entradas):
+    """Depois de uma execução bem-sucedida, guarda a maior modificação vista."""
+    datas = [e['modificado'] for e in entradas or [] if e.get('modificado')]
+    if not datas:
+        return
+    dados = estado.ler(fonte).get('descoberta') or {}
+    anterior = para_datetime(dados.get('ultima_modificacao'))
+    maior = max(datas + ([anterior] if anterior else []))
+    dados['ultima_modificacao'] = maior.isoformat()
+    estado.atualizar(fonte, descoberta=dados)
+
+
+# ================= MAIN =================
+if __name__ == "__main__":
+    if len(sys.argv) < 3:
+        print("Uso: python descoberta.py <fonte> <url_base> [regex_de_links]")
+        sys.exit(1)
+
+    modo_encontrado, url_indice = sondar(sys.argv[2], sys.argv[3] if len(sys.argv) > 3 else None)
+    print(json.dumps({'fonte': sys.argv[1], 'modo': modo_encontrado, 'url': url_indice}, ensure_ascii=False))
@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+# espelho.py - Espelho local das imagens destacadas, publicado junto dos feeds
+#
+# As imagens iam para o WP Automatic como URLs originais, em tamanho cheio
+# (fotos de 4-8 MB), e as do portal de Fortaleza ainda dependiam do proxy
+# externo i0.wp.com para contornar o bloqueio de hotlink. Aqui cada imagem
+# destacada é baixada uma vez, reduzida para no máximo LARGURA_MAX x
+# ALTURA_MAX (JPEG, com Pillow) e publicada em imagens/<fonte>/ no GitHub
+# Pages; enclosure, media:content e o <img> do conteúdo passam a apontar
+# para a cópia.
+#
+#   - URL já espelhada: nenhuma requisição (índice url -> hash);
+#   - URL nova com conteúdo já conhecido (mesma foto em outro endereço):
+#     deduplicada pelo hash SHA-256 dos bytes originais;
+#   - sem Pillow a imagem é publicada como veio, se couber em
+#     MAX_BYTES_SEM_PILLOW; senão fica a URL original;
+#   - qualquer falha (rede, tipo, tamanho) mantém a URL original.
+#
+# Cada fonte tem a sua pasta e o seu imagens/<fonte>/indice.json (os
+# workflows rodam em paralelo e cada um commita só os arquivos da sua
+# fonte). A pasta é limitada a MAX_BYTES_FONTE: ao gravar o índice, as
+# imagens usadas há mais tempo (LRU pela data de uso) saem primeiro; as
+# usadas na execução atual nunca saem.
+#
+# Atenção: esse teto vale para a árvore de trabalho (o que o Pages publica),
+# não para o repositório. Os workflows commitam imagens/<fonte>/ em main, e
+# uma imagem removida pela poda continua no histórico do git: o .git cresce
+# o tamanho reduzido de cada imagem nova (tipicamente 100-250 KB), sem
+# limite. Acompanhe com `git count-objects -vH`; para parar o crescimento,
+# ESPELHO_IMAGENS=0 no ambiente desliga o espelho em todas as fontes (volta
+# às URLs originais; ESPELHAR_IMAGENS = False faz o mesmo numa definição do
+# motor), e reescrever o histórico (git filter-repo --path imagens
+# --invert-paths) libera o espaço já usado.
+#
+# Uso:
+#   url = espelho.espelhar('fortaleza', url_da_imagem, HEADERS)
+#   espelho.espelhar_registro('alece', registro, HEADERS)   # imagem + <img> do conteúdo
+#   python espelho.py                                        # tamanho do espelho por fonte
+
+import atexit
+import hashlib
+import io
+import json
+import os
+import threading
+from datetime import date
+
+import metricas
+import textoxml
+import transporte
+from modelo import URL_PUBLICACAO
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+# ================= CONFIGURAÇÕES =================
+PASTA = os.path.join(os.path.dirname(os.path.abspath(__file__)), "imagens")
+URL_IMAGENS = f"{URL_PUBLICACAO}/imagens"
+
+LARGURA_MAX = 1200
+ALTURA_MAX = 1200
+QUALIDADE_JPEG = 82
+MAX_BYTES_ORIGINAL = 15 * 1024 * 1024    # imagem maior que isso nem é baixada por inteiro
+MAX_BYTES_SEM_PILLOW = 1024 * 1024       # sem Pillow, só publica como veio até este tamanho
+MAX_BYTES_FONTE = 40 * 1024 * 1024       # teto da pasta de cada fonte (LRU; não limita o histórico do git)
+ATIVO = os.environ.get('ESPELHO_IMAGENS', '1') != '0'
+TIMEOUT = (10, 30)
+
+EXTENSOES = {'image/jpeg': '.jpg', 'image/png': '.png', 'image/webp': '.webp', 'image/gif': '.gif'}
+ACEITAR = 'image/jpeg,image/png;q=0.9,image/*;q=0.8'
+
+_indices = {}        # fonte -> {'urls': {url: hash}, 'imagens': {hash: {...}}}
+_alterados = set()
+_em_uso = {}         # fonte -> hashes usados nesta execução
+_trava = threading.Lock()
+
+
+# ================= ÍNDICE =================
+def _pasta(fonte):
+    return os.path.join(PASTA, fonte)
+
+
+def _carregar(fonte):
+    if fonte not in _indices:
+        try:
+            with open(os.path.join(_pasta(fonte), 'indice.json'), 'r', encoding='utf-8') as f:
+                _indices[fonte] = json.load(f)
+        except (FileNotFoundError, ValueError):
+            _indices[fonte] = {'urls': {}, 'imagens': {}}
+        _em_uso.setdefault(fonte, set())
+    return _indices[fonte]
+
+
+def _usar(fonte, indice, digest):
+    """Marca o uso da imagem e devolve a URL publicada."""
+    imagem = indice['imagens'][digest]
+    hoje = date.today().isoformat()
+    if imagem['usado'] != hoje:
+        imagem['usado'] = hoje
+        _alterados.add(fonte)
+    _em_uso[fonte].add(digest)
+    return f"{URL_IMAGENS}/{fonte}/{imagem['arquivo']}"
+
+
+def _existe(fonte, indice, digest):
+    imagem = indice['imagens'].get(digest)
+    return bool(imagem) and os.path.exists(os.path.join(_pasta(fonte), imagem['arquivo']))
+
+
+# ================= DOWNLOAD E REDUÇÃO =================
+def _baixar(url, headers):
+    """(bytes, tipo) da imagem, ou None."""
+    cabecalhos = dict(headers or {}, Accept=ACEITAR)
+    with transporte.sessao().get(url, headers=cabecalhos, timeout=TIMEOUT, stream=True) as resposta:
+        tipo = resposta.headers.get('Content-Type', '').split(';')[0].strip().lower()
+        if resposta.status_code != 200 or not tipo.startswith('image/'):
+            metricas.contar('espelho.recusadas')
+            return None
+        tamanho = resposta.headers.get('Content-Length')
+        if tamanho and tamanho.isdigit() and int(tamanho) > MAX_BYTES_ORIGINAL:
+            metricas.contar('espelho.grandes_demais')
+            return None
+        bruto = bytearray()
+        for bloco in resposta.iter_content(64 * 1024):
+            bruto += bloco
+            if len(bruto) > MAX_BYTES_ORIGINAL:
+                metricas.contar('espelho.grandes_demais')
+                return None
+    return bytes(bruto), tipo
+
+
+def _reduzir(bruto, tipo):
+    """(bytes, extensão) da versão publicada, ou None se não der para publicar."""
+    if Image is None:
+        metricas.contar('espelho.sem_pillow')
+        if tipo in EXTENSOES and len(bruto) <= MAX_BYTES_SEM_PILLOW:
+            return bruto, EXTENSOES[tipo]
+        return None
+
+    try:
+        with Image.open(io.BytesIO(bruto)) as imagem:
+            grande = imagem.width > LARGURA_MAX or imagem.height > ALTURA_MAX
+            if not grande and tipo in ('image/jpeg', 'image/png') and len(bruto) <= MAX_BYTES_SEM_PILLOW:
+                return bruto, EXTENSOES[tipo]   # já pequena: publicada como veio
+            if imagem.mode in ('RGBA', 'LA', 'P'):
+                imagem = imagem.convert('RGBA')
+                fundo = Image.new('RGB', imagem.size, (255, 255, 255))
+                fundo.paste(imagem, mask=imagem.split()[-1])
+                imagem = fundo
+            elif imagem.mode != 'RGB':
+                imagem = imagem.convert('RGB')
+            imagem.thumbnail((LARGURA_MAX, ALTURA_MAX), Image.LANCZOS)
+            saida = io.BytesIO()
+            imagem.save(saida, 'JPEG', quality=QUALIDADE_JPEG, optimize=True, progressive=True)
+    except Exception as e:
+        print(f"    ⚠️  Imagem ilegível ({str(e)[:40]})")
+        metricas.contar('espelho.ilegiveis')
+        return None
+    return saida.getvalue(), '.jpg'
+
+
+def _gravar_arquivo(caminho, dados):
+    os.makedirs(os.path.dirname(caminho), exist_ok=True)
+    temporario = f"{caminho}.{os.getpid()}.tmp"
+    with open(temporario, 'wb') as f:
+        f.write(dados)
+    os.replace(temporario, caminho)
+
+
+# ================= API =================
+def espelhar(fonte, url, headers=None):
+    """URL da cópia publicada da imagem, ou a própria url se não der para espelhar."""
+    if not ATIVO or not url or url.startswith(URL_IMAGENS) or not url.startswith(('http://', 'https://')):
+        return url
+
+    with _trava:
+        indice = _carregar(fonte)
+        digest = indice['urls'].get(url)
+        if digest and _existe(fonte, indice, digest):
+            metricas.contar('espelho.reaproveitadas')
+            return _usar(fonte, indice, digest)
+
+    try:
+        baixada = _baixar(url, headers)
+    except Exception as e:
+        print(f"    ⚠️  Imagem não espelhada: {str(e)[:60]}")
+        metricas.contar('espelho.falhas')
+        return url
+    if baixada is None:
+        return url
+    bruto, tipo = baixada
+    digest = hashlib.sha256(bruto).hexdigest()[:24]
+
+    with _trava:
+        if _existe(fonte, indice, digest):
+            # Mesma foto em outro endereço
+            metricas.contar('espelho.duplicadas')
+            indice['urls'][url] = digest
+            _alterados.add(fonte)
+            return _usar(fonte, indice, digest)
+
+    reduzida = _reduzir(bruto, tipo)
+    if reduzida is None:
+        return url
+    dados, extensao = reduzida
+    arquivo = digest + extensao
+    _gravar_arquivo(os.path.join(_pasta(fonte), arquivo), dados)
+    metricas.contar('espelho.baixadas')
+    metricas.contar('espelho.bytes_originais', len(bruto))
+    metricas.contar('espelho.bytes_publicados', len(dados))
+
+    with _trava:
+        indice['imagens'][digest] = {'arquivo': arquivo, 'bytes': len(dados), 'usado': ''}
+        indice['urls'][url] = digest
+        _alterados.add(fonte)
+        return _usar(fonte, indice, digest)
+
+
+def espelhar_registro(fonte, registro, headers=None):
+    """Troca registro['imagem'] pela cópia, também nos <img> do conteúdo."""
+    original = registro.get('imagem')
+    espelhada = espelhar(fonte, original, headers)
+    if espelhada != original:
+        registro['imagem'] = espelhada
+        if registro.get('conteudo'):
+            # O motor grava o src escapado ('&' -> '&amp;'): trocar as duas formas
+            conteudo = registro['conteudo'].replace(original, espelhada)
+            registro['conteudo'] = conteudo.replace(textoxml.escapar(original), textoxml.escapar(espelhada))
+    return registro
+
+
+def podar(fonte):
+    """Remove as imagens usadas há mais tempo até a pasta caber em MAX_BYTES_FONTE."""
+    indice = _carregar(fonte)
+    total = sum(imagem['bytes'] for imagem in indice['imagens'].values())
+    if total <= MAX_BYTES_FONTE:
+        return 0
+    removidas = set()
+    candidatas = sorted((imagem['usado'], digest) for digest, imagem in indice['imagens'].items()
+                        if digest not in _em_uso[fonte])
+    for _, digest in candidatas:
+        if total <= MAX_BYTES_FONTE:
+            break
+        imagem = indice['imagens'].pop(digest)
+        total -= imagem['bytes']
+        removidas.add(digest)
+        try:
+            os.remove(os.path.join(_pasta(fonte), imagem['arquivo']))
+        except FileNotFoundError:
+            pass
+    indice['urls'] = {url: d for url, d in indice['urls'].items() if d not in removidas}
+    metricas.contar('espelho.removidas', len(removidas))
+    return len(removidas)
+
+
+def gravar():
+    """Poda e grava o índice das fontes alteradas nesta execução."""
+    with _trava:
+        for fonte in sorted(_alterados):
+            removidas = podar(fonte)
+            if removidas:
+                print(f"🧹 Espelho {fonte}: {removidas} imagem(ns) antiga(s) removida(s)")
+            _gravar_arquivo(os.path.join(_pasta(fonte), 'indice.json'),
+                            json.dumps(_indices[fonte], ensure_ascii=False, sort_keys=True, indent=1).encode('utf-8'))
+        _alterados.clear()
+
+
+atexit.register(gravar)
+
+
+# ================= RELATÓRIO =================
+def main():
+    if not os.path.isdir(PASTA):
+        print(f"ℹ️ Sem espelho em {PASTA}")
+        return
+    print(f"🖼️  Pillow: {'sim' if Image else 'não (imagens publicadas como vieram, até ' + str(MAX_BYTES_SEM_PILLOW // 1024) + ' KB)'}")
+    for fonte in sorted(os.listdir(PASTA)):
+        if not os.path.isdir(_pasta(fonte)):
+            continue
+        indice = _carregar(fonte)
+        total = sum(imagem['bytes'] for imagem in indice['imagens'].values())
+        print(f"   {fonte}: {len(indice['imagens'])} imagem(ns), {len(indice['urls'])} URL(s), "
+              f"{total / 1024 / 1024:.1f} de {MAX_BYTES_FONTE // 1024 // 1024} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+# estado.py - Estado persistente por fonte entre execuções
+#
+# Um JSON pequeno por fonte em estado/<fonte>.json, versionado junto com os
+# feeds pelos workflows. Guarda a marca d'água da listagem (o item mais novo
+# visto na última execução) e os links descartados pelos filtros, para que a
+# próxima execução pare assim que chegar em algo já conhecido.
+
+import json
+import os
+from datetime import date
+
+# ================= CONFIGURAÇÕES =================
+PASTA_ESTADO = os.path.join(os.path.dirname(os.path.abspath(__file__)), "estado")
+
+# Quantos links descartados lembrar por fonte
+MAX_DESCARTADOS = 200
+
+
+# ================= FUNÇÕES =================
+def _caminho(fonte):
+    return os.path.join(PASTA_ESTADO, f"{fonte}.json")
+
+
+def ler(fonte):
+    """Estado completo da fonte ({} se ainda não existe ou está corrompido)."""
+    try:
+        with open(_caminho(fonte), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def gravar(fonte, dados):
+    """Grava o estado de forma atômica (arquivo temporário + rename)."""
+    os.makedirs(PASTA_ESTADO, exist_ok=True)
+    caminho = _caminho(fonte)
+    temporario = caminho + '.tmp'
+    with open(temporario, 'w', encoding='utf-8') as f:
+        json.dump(dados, f, ensure_ascii=False, indent=1, sort_keys=True)
+        f.write('\n')
+    os.replace(temporario, caminho)
+
+
+def remover(fonte):
+    """Apaga o estado da fonte (se existir)."""
+    try:
+        os.remove(_caminho(fonte))
+    except FileNotFoundError:
+        pass
+
+
+def atualizar(fonte, **valores):
+    """Altera só as chaves informadas, preservando o resto do estado."""
+    dados = ler(fonte)
+    dados.update(valores)
+    gravar(fonte, dados)
+    return dados
+
+
+# ----- Marca d'água da listagem -----
+def marca_dagua(fonte):
+    """{'url': ..., 'dia': date, 'descartados': set} da última execução, ou None."""
+    marca = ler(fonte).get('marca_dagua')
+    if not marca or not marca.get('url'):
+        return None
+    return {
+        'url': marca['url'],
+        'dia': date.fromisoformat(marca['dia']) if marca.get('dia') else None,
+        'descartados': set(marca.get('descartados', [])),
+    }
+
+
+def alcancou_marca(marca, url, dia):
+    """
+    True quando o item da listagem (ordenada do mais novo para o mais antigo)
+    já era conhecido: é o próprio item da marca ou é de um dia anterior a ela.
+    """
+    if not marca:
+        return False
+    if url and url == marca['url']:
+        return True
+    return bool(dia and marca['dia'] and dia < marca['dia'])
+
+
+def gravar_marca_dagua(fonte, url, dia, descartados=()):
+    """Registra o item mais novo desta execução (e os links descartados pelos filtros)."""
+    if not url:
+        return
+    atual = ler(fonte).get('marca_dagua') or {}
+    lista = [u for u in atual.get('descartados', []) if u not in set(descartados)]
+    lista = (list(descartados) + lista)[:MAX_DESCARTADOS]
+    atualizar(fonte, marca_dagua={
+        'url': url,
+        'dia': dia.isoformat() if dia else None,
+        'descartados': lista,
+    })
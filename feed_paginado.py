@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+# feed_paginado.py - Feeds paginados e arquivados (RFC 5005) a partir do histórico
+#
+# Para cada fonte gera, em paginas/<fonte>/:
+#   atual.xml         - feed "cabeça", pequeno: itens de hoje + os mais recentes
+#   AAAA-MM-DD.xml    - uma página de arquivo imutável por dia com itens
+#
+# As páginas são ligadas por <atom:link rel="prev-archive"/"next-archive"> e
+# marcadas com <fh:archive/>, então podem ser cacheadas para sempre. Só são
+# regravadas quando o conteúdo muda (na prática, apenas ao ganhar o link
+# next-archive quando surge um dia mais novo).
+#
+# Uso: python feed_paginado.py fortaleza
+
+import os
+import sys
+from datetime import datetime, timezone
+
+import arquivo
+import textoxml
+from modelo import FUSO_BRASILIA, CANAIS, URL_PUBLICACAO
+
+# ================= CONFIGURAÇÕES =================
+PASTA_PAGINAS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "paginas")
+
+# Mínimo de itens no feed atual, mesmo logo depois da meia-noite
+MIN_ITENS_ATUAL = 10
+
+# Quantos dias (com itens) mais recentes são sempre re-renderizados
+DIAS_REVISADOS = 3
+
+NS_HISTORY = "http://purl.org/syndication/history/1.0"
+
+
+# ================= FUNÇÕES =================
+def _data_rss(dt):
+    return dt.astimezone(timezone.utc).strftime("%a, %d %b %Y %H:%M:%S +0000")
+
+
+def url_pagina(fonte, nome):
+    return f"{URL_PUBLICACAO}/paginas/{fonte}/{nome}.xml"
+
+
+def renderizar_item(registro):
+    """Um <item> RSS 2.0 a partir do registro comum (modelo.novo_registro)."""
+    partes = [
+        '<item>',
+        f'<title>{textoxml.escapar(registro["titulo"])}</title>',
+        f'<link>{textoxml.escapar(registro["link"])}</link>',
+        f'<guid isPermaLink="false">{textoxml.escapar(registro["guid"])}</guid>',
+        f'<pubDate>{_data_rss(registro["publicado"])}</pubDate>',
+    ]
+    if registro.get('resumo'):
+        partes.append(f'<description>{textoxml.escapar(registro["resumo"])}</description>')
+    if registro.get('conteudo'):
+        partes.append(f'<content:encoded>{textoxml.cdata(registro["conteudo"])}</content:encoded>')
+    if registro.get('imagem'):
+        partes.append(f'<enclosure url="{textoxml.escapar(registro["imagem"])}" type="image/jpeg" length="0" />')
+    partes.append('</item>')
+    return '\n'.join(partes)
+
+
+def renderizar_documento(canal, registros, links, arquivada, ttl=None):
+    """Documento RSS com os links de navegação RFC 5005."""
+    partes = [
+        '<?xml version="1.0" encoding="UTF-8"?>',
+        '<rss version="2.0" xmlns:atom="http://www.w3.org/2005/Atom" '
+        'xmlns:content="http://purl.org/rss/1.0/modules/content/" '
+        f'xmlns:fh="{NS_HISTORY}">',
+        '<channel>',
+        f'<title>{textoxml.escapar(canal["titulo"])}</title>',
+        f'<link>{textoxml.escapar(canal["link"])}</link>',
+        f'<description>{textoxml.escapar(canal.get("descricao") or canal["titulo"])}</description>',
+        '<language>pt-br</language>',
+    ]
+    if arquivada:
+        partes.append('<fh:archive/>')
+    for rel, href in links:
+        partes.append(f'<atom:link rel="{rel}" href="{href}" type="application/rss+xml" />')
+
+    # Páginas arquivadas usam a data do item mais novo, para não mudar a cada execução
+    if registros:
+        ultima = max(r['publicado'] for r in registros)
+    else:
+        ultima = datetime.now(timezone.utc)
+    partes.append(f'<lastBuildDate>{_data_rss(ultima)}</lastBuildDate>')
+    if ttl:
+        partes.append(f'<ttl>{ttl}</ttl>')
+
+    for registro in registros:
+        partes.append(renderizar_item(registro))
+
+    partes.append('</channel>')
+    partes.append('</rss>')
+    return '\n'.join(partes) + '\n'
+
+
+def _gravar_se_mudou(caminho, conteudo):
+    try:
+        with open(caminho, 'r', encoding='utf-8') as f:
+            if f.read() == conteudo:
+                return False
+    except FileNotFoundError:
+        pass
+    with open(caminho, 'w', encoding='utf-8') as f:
+        f.write(conteudo)
+    return True
+
+
+def publicar(fonte, canal=None, ttl=60):
+    """
+    Gera o feed atual e as páginas de arquivo da fonte a partir do histórico.
+    canal = {'titulo': ..., 'link': ..., 'descricao': ...} (padrão: CANAIS[fonte])
+    Retorna quantos arquivos foram (re)gravados.
+    """
+    canal = canal or CANAIS[fonte]
+    pasta = os.path.join(PASTA_PAGINAS, fonte)
+    os.makedirs(pasta, exist_ok=True)
+
+    hoje = datetime.now(FUSO_BRASILIA).date()
+    dias_fechados = [d for d in arquivo.dias(fonte) if d < hoje]
+    gravados = 0
+
+    # Páginas de arquivo: as que faltam em disco + as mais recentes
+    revisar = set(dias_fechados[-DIAS_REVISADOS:])
+    for dia in dias_fechados:
+        if not os.path.exists(os.path.join(pasta, f"{dia.isoformat()}.xml")):
+            revisar.add(dia)
+
+    for indice, dia in enumerate(dias_fechados):
+        if dia not in revisar:
+            continue
+        nome = dia.isoformat()
+        links = [('self', url_pagina(fonte, nome)), ('current', url_pagina(fonte, 'atual'))]
+        if indice > 0:
+            links.append(('prev-archive', url_pagina(fonte, dias_fechados[indice - 1].isoformat())))
+        if indice + 1 < len(dias_fechados):
+            links.append(('next-archive', url_pagina(fonte, dias_fechados[indice + 1].isoformat())))
+
+        canal_dia = dict(canal, titulo=f"{canal['titulo']} - {dia.strftime('%d/%m/%Y')}")
+        documento = renderizar_documento(canal_dia, arquivo.consultar(fonte, dia), links, arquivada=True)
+        gravados += _gravar_se_mudou(os.path.join(pasta, f"{nome}.xml"), documento)
+
+    # Feed atual: itens de hoje, completando com os mais recentes
+    itens_atuais = arquivo.consultar(fonte, hoje)
+    if len(itens_atuais) < MIN_ITENS_ATUAL:
+        itens_atuais = arquivo.recentes(fonte, MIN_ITENS_ATUAL)
+
+    links = [('self', url_pagina(fonte, 'atual')), ('current', url_pagina(fonte, 'atual'))]
+    if dias_fechados:
+        links.append(('prev-archive', url_pagina(fonte, dias_fechados[-1].isoformat())))
+    documento = renderizar_documento(canal, itens_atuais, links, arquivada=False, ttl=ttl)
+    gravados += _gravar_se_mudou(os.path.join(pasta, "atual.xml"), documento)
+
+    print(f"📚 Feed paginado: paginas/{fonte}/atual.xml ({gravados} arquivo(s) atualizado(s))")
+    return gravados
+
+
+# ================= MAIN =================
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Uso: python feed_paginado.py <fonte>")
+        sys.exit(1)
+
+    publicar(sys.argv[1])
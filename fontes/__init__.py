@@ -0,0 +1,19 @@
+# fontes - Definições declarativas dos portais executados por motor.py
+#
+# Cada módulo deste pacote descreve um portal só com constantes (ver
+# motor.PADROES). Os módulos não são importados aqui: listar() apenas lê os
+# nomes dos arquivos e carregar() importa uma definição quando ela é usada,
+# então o custo de inicialização não cresce com o número de fontes.
+
+import importlib
+import pkgutil
+
+
+def listar():
+    """Nomes das fontes declaradas, sem importar nenhuma delas."""
+    return sorted(m.name for m in pkgutil.iter_modules(__path__) if not m.name.startswith('_'))
+
+
+def carregar(nome):
+    """Importa (uma vez) e devolve o módulo de definição da fonte."""
+    return importlib.import_module(f"{__name__}.{nome}")
@@ -0,0 +1,66 @@
+# fontes/alece.py - Assembleia Legislativa do Ceará (ALCE)
+
+import html
+import re
+
+NOME = 'alece'
+TITULO = 'Notícias ALCE - Clean Feed'
+DESCRICAO = 'Notícias da Assembleia Legislativa do Ceará'
+URL_BASE = "https://www.al.ce.gov.br"
+URL_LISTA = "https://www.al.ce.gov.br/noticias"
+FEED_FILE = "feed_alce_news.xml"
+INTERVALO = 60
+
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64)'
+}
+VERIFICAR_TLS = False
+TIMEOUT_LISTA = 20
+TIMEOUT_DETALHE = 15
+
+# ----- Listagem -----
+SELETOR_ITEM = 'div.noticias_item'
+SELETOR_TITULO = 'h3.noticias_title'
+SELETOR_LINK = 'a:has(h3.noticias_title)'
+SELETOR_DATA = 'span.noticias_data'
+DATAS = 'hoje'
+
+# Índices estruturados (sitemap/WP REST/RSS) antes da listagem HTML
+DESCOBERTA = True
+FILTRO_DESCOBERTA = r'/noticias/[^/?#]+'
+
+# ----- Detalhe -----
+SELETORES_CONTEUDO = ['article', '.item-page', 'body']
+TAGS_REMOVIDAS = ['script', 'style', 'iframe', 'form', 'nav']
+MODO_CONTEUDO = 'texto'
+MIN_PARAGRAFO = 21
+REGRAS_IMAGEM = [
+    {'seletor': 'figure img, .noticia-imagem img, img', 'atributo': 'src',
+     'contem': '/storage/noticias/', 'escopo': 'conteudo'},
+]
+EXIGIR_IMAGEM = True
+IMAGEM_NO_CONTEUDO = True
+
+PALAVRAS_BLOQUEADAS = [
+    "prisão", "preso", "delegacia", "homicídio", "assassinato",
+    "tráfico", "drogas", "armas", "polícia", "criminoso",
+    "suspeito", "captura", "foragido", "sspds", "bombeiros",
+    "policial", "crimes", "investigação"
+]
+
+# ----- Saída -----
+DESCRICAO_ITEM = 'conteudo'
+
+
+def limpar_texto(texto):
+    """Remove linhas de data/créditos e o rodapé institucional do texto da ALCE."""
+    if not texto:
+        return ""
+    texto = html.unescape(texto)
+    texto = re.sub(r'(?m)^.*?\d{1,2}\s+de\s+[a-zç]+\s+de\s+\d{4}.*?$', '', texto, flags=re.I)
+    texto = re.sub(r'(?m)^.*?(Foto|Edição|Texto|Fonte):.*?$', '', texto, flags=re.I)
+    texto = texto.replace("Compartilhe esta notícia:", "")
+    if "Assembleia Legislativa do Estado do Ceará" in texto:
+        texto = texto.split("Assembleia Legislativa do Estado do Ceará")[0]
+    linhas = [l.strip() for l in texto.split('\n') if len(l.strip()) > 5]
+    return '\n\n'.join(linhas)
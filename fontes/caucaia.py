@@ -0,0 +1,55 @@
+# fontes/caucaia.py - Prefeitura de Caucaia
+
+NOME = 'caucaia'
+TITULO = 'Notícias da Prefeitura de Caucaia'
+DESCRICAO = 'Conteúdo limpo para WordPress'
+URL_BASE = "https://www.caucaia.ce.gov.br"
+URL_LISTA = "https://www.caucaia.ce.gov.br/informa.php"
+FEED_FILE = "feed_caucaia_limpo.xml"
+INTERVALO = 120
+
+HEADERS = {'User-Agent': 'Mozilla/5.0'}
+TIMEOUT_LISTA = 30
+TIMEOUT_DETALHE = 30
+
+# ----- Listagem -----
+# A listagem não tem blocos por notícia: cada link para /informa/ é um item
+SELETOR_ITEM = 'a[href*="/informa/"]'
+MIN_TITULO = 21
+TITULOS_IGNORADOS = ['Continue']
+LIMITE = 10
+
+# Índices estruturados (sitemap/WP REST/RSS) antes da listagem HTML
+DESCOBERTA = True
+FILTRO_DESCOBERTA = r'/informa/[^/?#]+'
+
+# ----- Detalhe -----
+SELETOR_TITULO_DETALHE = 'h1.DataInforma'
+SELETORES_CONTEUDO = ['div.p-info', 'body']
+MODO_CONTEUDO = 'paragrafos'
+MIN_PARAGRAFO = 10
+SIMILARIDADE_MAXIMA = 0.85
+REGRAS_IMAGEM = [
+    {'seletor': 'img.imginfo', 'atributo': 'src'},
+]
+REGEX_DATA_DETALHE = r'(\d{2}/\d{2}/\d{4})'
+HORA_PADRAO = '09:00'
+
+# O servidor é lento e sensível a rajadas: uma requisição por vez, com pausa
+CONCORRENCIA = 1
+PAUSA = 1
+
+# ----- Saída -----
+TTL = 180
+GUID_PREFIXO = 'caucaia'
+DESCRICAO_ITEM = 'titulo'
+MEDIA_RSS = True
+MEDIA_DESCRICAO = True
+GERADOR = 'Scraper Caucaia'
+TAMANHO_ENCLOSURE = 80000
+RODAPE_HTML = (
+    '<div style="margin-top:30px;padding:15px;'
+    'background:#f8f9fa;border-left:4px solid #0073aa">'
+    '<strong>Fonte:</strong> <a href="{link}">'
+    'Prefeitura de Caucaia</a></div>'
+)
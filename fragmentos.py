@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+# fragmentos.py - Cache dos <item> já renderizados, reaproveitados entre execuções
+#
+# De uma hora para a outra quase todos os itens de um feed são os mesmos, mas
+# cada execução montava todos de novo: f-strings com escapes e CDATA no motor
+# e no upnewsfortaleza, e no upnewsagenciabr uma árvore ElementTree com 25+
+# subelementos por item, serializada e reformatada pelo minidom.
+#
+# Aqui cada item é guardado pela sua identidade (link/guid) junto com o hash
+# de tudo o que entra na renderização (campos do item + versão do
+# renderizador). Se o hash bate, o fragmento serializado sai do cache e o
+# feed vira uma concatenação de fragmentos; se o item mudou (título
+# corrigido, imagem espelhada, conteúdo atualizado), é renderizado de novo e
+# a linha da identidade é substituída - versões antigas não se acumulam.
+#
+# O que muda a cada execução sem mudar o item (posição no feed, data de
+# geração) não entra no hash: o renderizador deixa um marcador no fragmento e
+# quem monta o feed o substitui.
+#
+# Um SQLite por fonte em cache/fragmentos/ (fora do git, preservado pelos
+# workflows com actions/cache). As gravações e marcas de uso ficam em memória
+# e vão para o banco numa transação só, em gravar() (também no atexit).
+# Itens sem uso há mais de DIAS_RETENCAO dias são podados ao abrir o banco.
+#
+# Uso:
+#   xml = fragmentos.renderizar('alece', link, versao, dados, lambda: montar_item(...))
+#   fragmentos.gravar()
+#   python fragmentos.py                # tamanho do cache por fonte
+
+import atexit
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from datetime import date, timedelta
+
+import metricas
+
+# ================= CONFIGURAÇÕES =================
+PASTA = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cache", "fragmentos")
+DIAS_RETENCAO = 3
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS fragmentos (
+    item      TEXT PRIMARY KEY,
+    hash      TEXT NOT NULL,
+    fragmento TEXT NOT NULL,
+    usado     TEXT NOT NULL
+) WITHOUT ROWID;
+"""
+
+_conexoes = {}
+_novos = {}       # fonte -> {item: (hash, fragmento)}
+_usados = {}      # fonte -> itens reaproveitados com data de uso antiga
+_trava = threading.Lock()
+
+
+# ================= FUNÇÕES =================
+def _conectar(fonte):
+    if fonte not in _conexoes:
+        os.makedirs(PASTA, exist_ok=True)
+        conexao = sqlite3.connect(os.path.join(PASTA, f"{fonte}.sqlite3"), check_same_thread=False)
+        conexao.executescript(ESQUEMA)
+        limite = (date.today() - timedelta(days=DIAS_RETENCAO)).isoformat()
+        with conexao:
+            conexao.execute("DELETE FROM fragmentos WHERE usado < ?", (limite,))
+        _conexoes[fonte] = conexao
+        _novos.setdefault(fonte, {})
+        _usados.setdefault(fonte, set())
+    return _conexoes[fonte]
+
+
+def impressao(versao, dados):
+    """Hash de tudo o que entra na renderização (datas viram texto ISO)."""
+    serial = json.dumps([str(versao), dados], ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha256(serial.encode('utf-8')).hexdigest()
+
+
+def renderizar(fonte, item, versao, dados, funcao):
+    """Fragmento do item: o do cache se `dados` não mudou, senão funcao() (e guarda)."""
+    h = impressao(versao, dados)
+    hoje = date.today().isoformat()
+    with _trava:
+        conexao = _conectar(fonte)
+        novo = _novos[fonte].get(item)
+        if novo is not None and novo[0] == h:
+            metricas.contar('fragmentos.acertos')
+            return novo[1]
+        linha = conexao.execute("SELECT hash, fragmento, usado FROM fragmentos WHERE item = ?", (item,)).fetchone()
+        if linha is not None and linha[0] == h:
+            if linha[2] != hoje:
+                _usados[fonte].add(item)
+            metricas.contar('fragmentos.acertos')
+            return linha[1]
+
+    metricas.contar('fragmentos.faltas' if linha is None else 'fragmentos.alterados')
+    fragmento = funcao()
+    with _trava:
+        _novos[fonte][item] = (h, fragmento)
+    return fragmento
+
+
+def gravar():
+    """Leva ao banco os fragmentos novos e as marcas de uso, uma transação por fonte."""
+    hoje = date.today().isoformat()
+    with _trava:
+        for fonte, conexao in _conexoes.items():
+            novos, usados = _novos[fonte], _usados[fonte]
+            if not novos and not usados:
+                continue
+            with conexao:
+                conexao.executemany(
+                    "INSERT OR REPLACE INTO fragmentos (item, hash, fragmento, usado) VALUES (?, ?, ?, ?)",
+                    [(item, h, fragmento, hoje) for item, (h, fragmento) in novos.items()]
+                )
+                conexao.executemany("UPDATE fragmentos SET usado = ? WHERE item = ?",
+                                    [(hoje, item) for item in usados - novos.keys()])
+            novos.clear()
+            usados.clear()
+
+
+atexit.register(gravar)
+
+
+def fontes():
+    if not os.path.isdir(PASTA):
+        return []
+    return sorted(n[:-len('.sqlite3')] for n in os.listdir(PASTA) if n.endswith('.sqlite3'))
+
+
+# ================= MAIN =================
+if __name__ == "__main__":
+    for nome in fontes():
+        total, tamanho = _conectar(nome).execute(
+            "SELECT COUNT(*), COALESCE(SUM(LENGTH(fragmento)), 0) FROM fragmentos"
+        ).fetchone()
+        print(f"🧩 {nome}: {total} fragmento(s), {tamanho / 1024:.1f} KB")
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+# jsonfeed.py - Saída JSON Feed 1.1 a partir do registro comum
+#
+# Gerado na mesma passada que o RSS/WXR de cada script, a partir dos mesmos
+# registros (modelo.novo_registro), em feed_<fonte>.json. É compacto (sem
+# indentação nem boilerplate por item) e muito mais rápido de ler que o XML.
+# Especificação: https://www.jsonfeed.org/version/1.1/
+
+import json
+import os
+from datetime import timezone
+
+from modelo import CANAIS, URL_PUBLICACAO
+
+# ================= CONFIGURAÇÕES =================
+VERSAO = "https://jsonfeed.org/version/1.1"
+PASTA_SAIDA = os.path.dirname(os.path.abspath(__file__))
+
+
+# ================= FUNÇÕES =================
+def nome_arquivo(fonte):
+    return f"feed_{fonte}.json"
+
+
+def item_json(registro):
+    """Item JSON Feed a partir do registro comum; campos vazios são omitidos."""
+    item = {
+        'id': registro['guid'],
+        'url': registro['link'],
+        'title': registro['titulo'],
+        'date_published': registro['publicado'].astimezone(timezone.utc).isoformat(timespec='seconds'),
+    }
+    if registro.get('conteudo'):
+        item['content_html'] = registro['conteudo']
+    if registro.get('resumo'):
+        item['summary'] = registro['resumo']
+    if registro.get('imagem'):
+        item['image'] = registro['imagem']
+    return item
+
+
+def gerar(fonte, registros, canal=None):
+    """Documento JSON Feed 1.1 (dict) da fonte."""
+    canal = canal or CANAIS[fonte]
+    documento = {
+        'version': VERSAO,
+        'title': canal['titulo'],
+        'home_page_url': canal['link'],
+        'feed_url': f"{URL_PUBLICACAO}/{nome_arquivo(fonte)}",
+        'language': 'pt-BR',
+        'items': [item_json(r) for r in registros],
+    }
+    if canal.get('descricao'):
+        documento['description'] = canal['descricao']
+    return documento
+
+
+def serializar(documento):
+    return json.dumps(documento, ensure_ascii=False, separators=(',', ':'))
+
+
+def gravar(fonte, registros, canal=None):
+    """Grava feed_<fonte>.json e retorna o caminho."""
+    caminho = os.path.join(PASTA_SAIDA, nome_arquivo(fonte))
+    with open(caminho, 'w', encoding='utf-8') as f:
+        f.write(serializar(gerar(fonte, registros, canal)))
+    print(f"🧾 JSON Feed: {os.path.basename(caminho)} ({len(registros)} itens)")
+    return caminho
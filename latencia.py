@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+# latencia.py - Histórico de latência por host e timeouts adaptativos
+#
+# Os timeouts eram constantes chutadas (10 s, 15-20 s, 30 s, nenhum no
+# urllib do Ceará): uma execução esperava 30 s por um host que costuma
+# responder em 400 ms. Aqui cada resposta (tempo até os cabeçalhos, ou o
+# erro) é registrada por host, e o histórico guarda as últimas amostras:
+#
+#   - timeout(url, padrao): com MIN_AMOSTRAS ou mais, conexão e leitura
+#     passam a FATOR_CONEXAO x p95 e FATOR_LEITURA x p99 do host, com piso
+#     (MIN_CONEXAO / MIN_LEITURA) e nunca acima do timeout do script;
+#   - host degradado (taxa de erro recente >= LIMITE_ERROS ou p50 recente
+#     >= LIMITE_LENTIDAO x p50 histórico): volta ao timeout do script e é
+#     avisado uma vez por processo. Timeouts causados pelo corte contam como
+#     erro, então um corte apertado demais se corrige sozinho.
+#
+# Persistido em cache/latencias.json (fora do git; os workflows o preservam
+# com actions/cache junto com o cache de extração). Gravado ao final do
+# processo e a cada GRAVAR_A_CADA registros (modo daemon).
+#
+# Uso: python latencia.py            # p50/p95/p99, erros e timeouts por host
+
+import atexit
+import json
+import os
+import threading
+from urllib.parse import urlsplit
+
+import metricas
+
+# ================= CONFIGURAÇÕES =================
+ARQUIVO = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cache", "latencias.json")
+
+MAX_AMOSTRAS = 200       # últimas latências guardadas por host
+JANELA_RECENTE = 20      # últimas requisições usadas para taxa de erro e p50 recente
+MIN_AMOSTRAS = 20        # antes disso vale o timeout do script
+
+FATOR_CONEXAO = 3        # conexão = 3 x p95
+FATOR_LEITURA = 4        # leitura = 4 x p99
+MIN_CONEXAO = 3.05
+MIN_LEITURA = 5.0
+TIMEOUT_PADRAO = (10.0, 30.0)  # quando o script não informa timeout
+
+LIMITE_ERROS = 0.25
+LIMITE_LENTIDAO = 3.0
+
+GRAVAR_A_CADA = 200
+
+_hosts = None            # host -> {'amostras': [...], 'resultados': [1/0...], 'requisicoes', 'erros'}
+_avisados = set()
+_pendentes = 0
+_trava = threading.Lock()
+
+
+# ================= HISTÓRICO =================
+def _host(url):
+    return (urlsplit(url).hostname or url).lower() if '/' in url else url.lower()
+
+
+def _carregar():
+    global _hosts
+    if _hosts is None:
+        try:
+            with open(ARQUIVO, 'r', encoding='utf-8') as f:
+                _hosts = json.load(f)
+        except (FileNotFoundError, ValueError):
+            _hosts = {}
+    return _hosts
+
+
+def salvar():
+    """Grava o histórico (atômico: arquivo temporário + rename)."""
+    global _pendentes
+    with _trava:
+        if _hosts is None or not _pendentes:
+            return
+        dados = json.dumps(_hosts, sort_keys=True)
+        _pendentes = 0
+    os.makedirs(os.path.dirname(ARQUIVO), exist_ok=True)
+    temporario = f"{ARQUIVO}.{os.getpid()}.tmp"
+    with open(temporario, 'w', encoding='utf-8') as f:
+        f.write(dados)
+    os.replace(temporario, ARQUIVO)
+
+
+atexit.register(salvar)
+
+
+def registrar(url, segundos, ok=True):
+    """Registra uma requisição ao host da URL: latência (s) e se deu certo."""
+    global _pendentes
+    host = _host(url)
+    with _trava:
+        registro = _carregar().setdefault(host, {'amostras': [], 'resultados': [], 'requisicoes': 0, 'erros': 0})
+        registro['requisicoes'] += 1
+        registro['resultados'] = (registro['resultados'] + [1 if ok else 0])[-MAX_AMOSTRAS:]
+        if ok:
+            registro['amostras'] = (registro['amostras'] + [round(segundos, 4)])[-MAX_AMOSTRAS:]
+        else:
+            registro['erros'] += 1
+        _pendentes += 1
+        gravar = _pendentes >= GRAVAR_A_CADA
+    if gravar:
+        salvar()
+
+
+# ================= ESTATÍSTICAS =================
+def _percentil(ordenadas, p):
+    if not ordenadas:
+        return None
+    return ordenadas[min(len(ordenadas) - 1, int(p / 100 * len(ordenadas)))]
+
+
+def resumo(url):
+    """p50/p95/p99 (s), taxas de erro e se o host está degradado. None sem histórico."""
+    with _trava:
+        registro = _carregar().get(_host(url))
+        if not registro:
+            return None
+        amostras = list(registro['amostras'])
+        resultados = list(registro['resultados'])
+        requisicoes, erros = registro['requisicoes'], registro['erros']
+
+    ordenadas = sorted(amostras)
+    recentes = sorted(amostras[-JANELA_RECENTE:])
+    janela = resultados[-JANELA_RECENTE:]
+    dados = {
+        'amostras': len(amostras),
+        'p50': _percentil(ordenadas, 50),
+        'p95': _percentil(ordenadas, 95),
+        'p99': _percentil(ordenadas, 99),
+        'p50_recente': _percentil(recentes, 50),
+        'erros': erros / requisicoes if requisicoes else 0.0,
+        'erros_recentes': janela.count(0) / len(janela) if janela else 0.0,
+    }
+    lento = (dados['p50'] and len(amostras) > JANELA_RECENTE
+             and dados['p50_recente'] >= LIMITE_LENTIDAO * dados['p50'])
+    dados['degradado'] = bool(len(janela) >= 5 and dados['erros_recentes'] >= LIMITE_ERROS or lento)
+    return dados
+
+
+def _separar(padrao):
+    if padrao is None:
+        return TIMEOUT_PADRAO
+    if isinstance(padrao, (tuple, list)):
+        conexao, leitura = padrao
+        return (conexao or TIMEOUT_PADRAO[0], leitura or TIMEOUT_PADRAO[1])
+    return (float(padrao), float(padrao))
+
+
+def timeout(url, padrao=None):
+    """(conexão, leitura) para a próxima requisição ao host, a partir do histórico."""
+    conexao, leitura = _separar(padrao)
+    dados = resumo(url)
+    if not dados or dados['amostras'] < MIN_AMOSTRAS:
+        return (conexao, leitura)
+
+    if dados['degradado']:
+        host = _host(url)
+        if host not in _avisados:
+            _avisados.add(host)
+            metricas.contar('latencia.hosts_degradados')
+            print(f"⚠️  Host degradado: {host} (erros recentes {dados['erros_recentes']:.0%}, "
+                  f"p50 recente {dados['p50_recente'] or 0:.2f}s x histórico {dados['p50'] or 0:.2f}s)")
+        return (conexao, leitura)
+
+    adaptado = (min(conexao, max(MIN_CONEXAO, FATOR_CONEXAO * dados['p95'])),
+                min(leitura, max(MIN_LEITURA, FATOR_LEITURA * dados['p99'])))
+    if adaptado != (conexao, leitura):
+        metricas.contar('latencia.timeouts_reduzidos')
+    return adaptado
+
+
+# ================= RELATÓRIO =================
+def main():
+    hosts = sorted(_carregar())
+    if not hosts:
+        print(f"ℹ️ Sem histórico em {ARQUIVO}")
+        return
+    print(f"{'host':<36}{'n':>5}{'p50':>8}{'p95':>8}{'p99':>8}{'erros':>8}{'timeout':>14}")
+    print("-" * 87)
+    for host in hosts:
+        d = resumo(host)
+        conexao, leitura = TIMEOUT_PADRAO if d['degradado'] else timeout(host, TIMEOUT_PADRAO)
+        marca = '  ⚠️ degradado' if d['degradado'] else ''
+        print(f"{host[:35]:<36}{d['amostras']:>5}"
+              + ''.join(f"{(d[p] or 0):>7.2f}s" for p in ('p50', 'p95', 'p99'))
+              + f"{d['erros']:>8.0%}{conexao:>6.1f}/{leitura:<6.1f}{marca}")
+
+
+if __name__ == "__main__":
+    main()
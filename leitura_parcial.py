@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+# leitura_parcial.py - Download da página só até o fim do corpo da notícia
+#
+# Os extratores baixavam a página inteira (menus, rodapé, blocos de "leia
+# também", scripts de terceiros) para usar só os metadados do <head>
+# (og:image, og:title, twitter:image) e o primeiro contêiner do artigo.
+#
+# Aqui a resposta é lida com stream=True, bloco a bloco, e cada bloco passa
+# por um varredor incremental de tags (regex sobre bytes, em C): só as tags
+# dos seletores de `fim` são acompanhadas, pulando comentários e <script>.
+# Quando o primeiro contêiner que casa com um deles é fechado, a leitura
+# para. O <head> vem antes de qualquer contêiner do <body>, então os
+# metadados já estão no trecho lido. O corpo devolvido termina exatamente no
+# fechamento do contêiner (mesmos bytes a cada execução, o que mantém o
+# cache de extração funcionando).
+#
+# Sem o contêiner a página é lida até o fim, como antes; em qualquer caso,
+# nunca além de MAX_BYTES. Se o que falta da resposta é pouco (DRENAR_ATE),
+# o resto é lido e descartado para a conexão voltar ao pool keep-alive; se
+# não, a conexão é fechada (a retomada de sessão TLS do transporte torna a
+# próxima barata).
+#
+# Seletores aceitos: 'tag' e 'tag.classe' (ex.: 'article', 'div.itemFullText').
+#
+# Uso:
+#   resposta = leitura_parcial.obter(url, ['div.itemFullText'], headers=HEADERS, timeout=20)
+#   resposta.raise_for_status()
+#   soup = BeautifulSoup(resposta.content, 'html.parser')   # só o trecho necessário
+
+import re
+
+import metricas
+import transporte
+
+# ================= CONFIGURAÇÕES =================
+MAX_BYTES = 3 * 1024 * 1024    # teto do corpo lido, com ou sem contêiner
+TAMANHO_BLOCO = 16 * 1024
+DRENAR_ATE = 32 * 1024         # resto da resposta lido só para reaproveitar a conexão
+
+RE_CLASSE = re.compile(rb'''\bclass\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s>]+))''', re.I)
+RE_FIM_SCRIPT = re.compile(rb'</script', re.I)
+
+
+# ================= SELETORES =================
+def _compilar(fim):
+    """[(tag, classe ou None)] e o regex que acha as tags envolvidas, comentários e scripts."""
+    seletores = []
+    for seletor in fim:
+        tag, _, classe = seletor.partition('.')
+        seletores.append((tag.lower().encode(), classe.encode() or None))
+    nomes = b'|'.join(sorted({re.escape(tag) for tag, _ in seletores}))
+    regex = re.compile(rb'<!--|<script\b|<(/?)(' + nomes + rb')\b([^>]*)>', re.I)
+    return seletores, regex
+
+
+def _casa(seletores, tag, atributos):
+    for alvo, classe in seletores:
+        if alvo != tag:
+            continue
+        if classe is None:
+            return True
+        m = RE_CLASSE.search(atributos)
+        if m and classe in (m.group(1) or m.group(2) or m.group(3)).split():
+            return True
+    return False
+
+
+# ================= VARREDURA INCREMENTAL =================
+def _varredor(fim):
+    """
+    Retorna avancar(buffer): continua a varredura de onde parou e devolve a
+    posição logo após o fechamento do contêiner, ou None se ainda não fechou.
+    """
+    seletores, regex = _compilar(fim)
+    situacao = {'pos': 0, 'tag': None, 'profundidade': 0}
+
+    def avancar(buffer):
+        pos = situacao['pos']
+        while True:
+            m = regex.search(buffer, pos)
+            if m is None:
+                # Nada completo daqui em diante: só um '<' no fim pode ser tag cortada
+                ultimo = buffer.rfind(b'<', pos)
+                situacao['pos'] = ultimo if ultimo >= 0 else len(buffer)
+                return None
+            abertura = m.group(0).lower()
+            if abertura == b'<!--' or abertura.startswith(b'<script'):
+                if abertura == b'<!--':
+                    final = buffer.find(b'-->', m.end())
+                    final = final + 3 if final >= 0 else None
+                else:
+                    final = RE_FIM_SCRIPT.search(buffer, m.end())
+                    final = final.end() if final else None
+                if final is None:
+                    situacao['pos'] = m.start()   # espera o resto do comentário/script
+                    return None
+                pos = final
+                continue
+            pos = m.end()
+            fechando, tag = m.group(1), m.group(2).lower()
+            if situacao['tag'] is None:
+                if not fechando and _casa(seletores, tag, m.group(3)):
+                    situacao['tag'], situacao['profundidade'] = tag, 1
+            elif tag == situacao['tag'] and not m.group(3).rstrip().endswith(b'/'):
+                situacao['profundidade'] += -1 if fechando else 1
+                if situacao['profundidade'] == 0:
+                    return pos
+
+    return avancar
+
+
+# ================= DOWNLOAD =================
+def obter(url, fim, headers=None, timeout=None, max_bytes=MAX_BYTES, sessao=None):
+    """
+    GET que para de baixar quando o primeiro contêiner de `fim` fecha (ou em
+    max_bytes). Retorna a resposta do requests com .content já preenchido com
+    o trecho lido; resposta.parcial indica se o download foi interrompido.
+    """
+    resposta = (sessao or transporte.sessao()).get(url, headers=headers, timeout=timeout, stream=True)
+    resposta.parcial = False
+    if not resposta.ok:
+        resposta._content = resposta.raw.read(max_bytes, decode_content=True) or b''
+        resposta._content_consumed = True
+        resposta.close()
+        return resposta
+
+    avancar = _varredor(fim) if fim else None
+    buffer = bytearray()
+    corte = None
+    for bloco in resposta.iter_content(TAMANHO_BLOCO):
+        buffer += bloco
+        if avancar is not None:
+            corte = avancar(buffer)
+        if corte is None and len(buffer) >= max_bytes:
+            corte = max_bytes
+            metricas.contar('leitura_parcial.limite_atingido')
+            print(f"    ⚠️  Página maior que {max_bytes // 1024} KB, lida só até o limite")
+        if corte is not None:
+            break
+
+    if corte is not None:
+        # Resto pequeno: ler e descartar para a conexão voltar ao pool
+        tamanho = resposta.headers.get('Content-Length')
+        restante = int(tamanho) - resposta.raw.tell() if tamanho and tamanho.isdigit() else None
+        if restante is not None and restante <= DRENAR_ATE:
+            for bloco in resposta.iter_content(TAMANHO_BLOCO):
+                buffer += bloco
+        else:
+            resposta.parcial = True
+            metricas.contar('leitura_parcial.interrompidas')
+            if restante is not None:
+                metricas.contar('leitura_parcial.bytes_evitados', restante)
+        corpo = bytes(buffer[:corte])
+    else:
+        corpo = bytes(buffer)
+
+    metricas.contar('transporte.bytes_rede', resposta.raw.tell())
+    metricas.contar('transporte.bytes_conteudo', len(buffer))
+    metricas.contar('leitura_parcial.bytes_usados', len(corpo))
+    resposta.close()
+    resposta._content = corpo
+    resposta._content_consumed = True
+    return resposta
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+# metricas.py - Contadores e cronômetros da execução atual
+#
+# Instrumentação mínima compartilhada: qualquer módulo pode contar eventos
+# (requisições, bytes, itens filtrados...) e cronometrar etapas. O resumo é
+# impresso ao final de cada execução e pode ser gravado em JSON.
+
+import json
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+_trava = threading.Lock()
+_contadores = defaultdict(int)
+_tempos = defaultdict(float)
+
+
+def reiniciar():
+    with _trava:
+        _contadores.clear()
+        _tempos.clear()
+
+
+def contar(nome, quantidade=1):
+    with _trava:
+        _contadores[nome] += quantidade
+
+
+def adicionar_tempo(nome, segundos):
+    with _trava:
+        _tempos[nome] += segundos
+
+
+@contextmanager
+def cronometro(nome):
+    """Soma o tempo do bloco em `nome` (segundos)."""
+    inicio = time.perf_counter()
+    try:
+        yield
+    finally:
+        adicionar_tempo(nome, time.perf_counter() - inicio)
+
+
+def resumo():
+    with _trava:
+        return {
+            'contadores': dict(sorted(_contadores.items())),
+            'tempos': {k: round(v, 4) for k, v in sorted(_tempos.items())},
+        }
+
+
+def imprimir(titulo="Métricas da execução"):
+    dados = resumo()
+    print(f"📈 {titulo}:")
+    for nome, valor in dados['tempos'].items():
+        print(f"   ⏱️  {nome}: {valor:.2f}s")
+    for nome, valor in dados['contadores'].items():
+        print(f"   🔢 {nome}: {valor:,}")
+
+
+def gravar(caminho):
+    with open(caminho, 'w', encoding='utf-8') as f:
+        json.dump(resumo(), f, ensure_ascii=False, indent=2)
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+# modelo.py - Registro comum de notícia compartilhado por todas as fontes
+
+from datetime import datetime, date, time, timezone, timedelta
+from email.utils import parsedate_to_datetime
+
+# Horário de Brasília (sem horário de verão desde 2019)
+FUSO_BRASILIA = timezone(timedelta(hours=-3))
+
+# Endereço público onde os feeds são servidos (GitHub Pages)
+URL_PUBLICACAO = "https://thecrossnow.github.io/feed-leg-ftz"
+
+# Metadados de canal de cada fonte, usados pelos geradores derivados do registro comum
+CANAIS = {
+    'cmfor': {'titulo': 'Câmara Municipal de Fortaleza', 'link': 'https://www.cmfor.ce.gov.br',
+              'descricao': 'Notícias Oficiais da Câmara Municipal de Fortaleza'},
+    'ceara': {'titulo': 'Notícias Ceará', 'link': 'https://www.ceara.gov.br',
+              'descricao': 'Notícias do Governo do Ceará'},
+    'alece': {'titulo': 'Notícias ALCE', 'link': 'https://www.al.ce.gov.br',
+              'descricao': 'Notícias da Assembleia Legislativa do Ceará'},
+    'caucaia': {'titulo': 'Notícias da Prefeitura de Caucaia', 'link': 'https://www.caucaia.ce.gov.br',
+                'descricao': 'Conteúdo limpo para WordPress'},
+    'agenciabrasil': {'titulo': 'Agência Brasil - Últimas Notícias', 'link': 'https://agenciabrasil.ebc.com.br',
+                      'descricao': 'Notícias oficiais da Agência Brasil'},
+    'fortaleza': {'titulo': 'Notícias Fortaleza', 'link': 'https://www.fortaleza.ce.gov.br',
+                  'descricao': 'Notícias da Prefeitura de Fortaleza'},
+}
+
+
+def para_datetime(valor):
+    """
+    Converte as várias representações de data usadas pelos scripts
+    (date, datetime ingênuo, RFC 822, ISO 8601, dd/mm/aaaa) em datetime com fuso.
+    Datas sem fuso são consideradas no horário de Brasília.
+    """
+    if valor is None or valor == '':
+        return None
+
+    if isinstance(valor, datetime):
+        dt = valor
+    elif isinstance(valor, date):
+        dt = datetime.combine(valor, time(0, 0))
+    else:
+        texto = str(valor).strip()
+        dt = None
+        try:
+            dt = parsedate_to_datetime(texto)
+        except (TypeError, ValueError, IndexError):
+            pass
+        if dt is None:
+            try:
+                dt = datetime.fromisoformat(texto.replace('Z', '+00:00'))
+            except ValueError:
+                pass
+        if dt is None:
+            try:
+                dt = datetime.strptime(texto[:10], '%d/%m/%Y')
+            except ValueError:
+                return None
+
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=FUSO_BRASILIA)
+    return dt
+
+
+def novo_registro(fonte, titulo, link, publicado, conteudo='', imagem=None, resumo=None, guid=None):
+    """
+    Monta o registro de notícia no formato comum usado pelo arquivo histórico
+    e pelos geradores de feed.
+
+    Campos:
+        fonte      - identificador curto da fonte ('fortaleza', 'alece', ...)
+        titulo     - título em texto puro (sem escape)
+        link       - URL original da notícia
+        publicado  - datetime com fuso (aceita date/str, ver para_datetime)
+        conteudo   - HTML final do corpo
+        imagem     - URL da imagem destacada
+        resumo     - texto curto em texto puro
+        guid       - identificador estável do item (padrão: o próprio link)
+    """
+    return {
+        'fonte': fonte,
+        'titulo': titulo or '',
+        'link': link,
+        'publicado': para_datetime(publicado) or datetime.now(timezone.utc),
+        'conteudo': conteudo or '',
+        'imagem': imagem or None,
+        'resumo': resumo or '',
+        'guid': guid or link,
+    }
+
+
+# ================= SAÍDAS DERIVADAS =================
+def sem_derrubar(descricao, funcao, *args, **kwargs):
+    """
+    Chama funcao(*args, **kwargs) para uma saída derivada do feed (histórico,
+    JSON Feed, paginação): nos scripts a falha só é avisada e nunca derruba a
+    geração do feed. Retorna o resultado, ou None se falhou.
+    """
+    try:
+        return funcao(*args, **kwargs)
+    except Exception as e:
+        print(f"⚠️  Falha ao {descricao}: {e}")
+        return None
@@ -0,0 +1,672 @@
+#!/usr/bin/env python3
+# motor.py - Motor único de extração para fontes declarativas (fontes/)
+#
+# Cada portal é descrito em fontes/<nome>.py apenas com constantes (URL da
+# listagem, seletores de item/título/data/corpo, regras de imagem, filtros,
+# saída) e, se precisar, um gancho limpar_texto(). O motor compila a
+# definição uma vez (seletores CSS, expressões de filtro) e executa sempre o
+# mesmo fluxo:
+#
+#   listagem -> filtro por data/palavras -> detalhe (concorrente) ->
+#   limpeza -> filtro no corpo -> RSS + JSON Feed + histórico + páginas
+#
+# com métricas por etapa. A marca d'água de estado.py (item mais novo da
+# execução anterior) separa a listagem em novos e conhecidos: os conhecidos
+# vêm do histórico, sem baixar a página de novo. Com DESCOBERTA ligada, a
+# listagem HTML só é usada se o portal não tiver WordPress REST, sitemap ou
+# RSS (ver descoberta.py). Uma fonte nova ganha tudo isso só com a definição.
+#
+# Uso: python motor.py alece
+#      python motor.py --listar
+
+import difflib
+import hashlib
+import re
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, date, timedelta, timezone
+from urllib.parse import urljoin
+
+import soupsieve
+from bs4 import BeautifulSoup
+
+import arquivo
+import cache_extracao
+import cadencia
+import classificador
+import codificacao
+import descoberta
+import espelho
+import estado
+import feed_paginado
+import fontes
+import fragmentos
+import jsonfeed
+import metricas
+import notificacao
+import reserva
+import textoxml
+import transporte
+import validador
+from modelo import novo_registro, FUSO_BRASILIA, sem_derrubar
+
+# ================= CONFIGURAÇÕES =================
+# Valores usados quando a definição não declara a constante
+PADROES = {
+    'DESCRICAO': '',
+    'HEADERS': {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64)'},
+    'VERIFICAR_TLS': True,
+    'TIMEOUT_LISTA': 20,
+    'TIMEOUT_DETALHE': 20,
+    'INTERVALO': 60,
+    'PARSER': 'lxml',
+
+    # Listagem
+    'SELETOR_TITULO': None,       # None: texto do próprio item
+    'SELETOR_LINK': None,         # None: o próprio item (precisa ter href)
+    'SELETOR_DATA': None,
+    'MIN_TITULO': 0,
+    'TITULOS_IGNORADOS': [],
+    'LIMITE': None,
+    'DATAS': None,                # None, 'hoje' ou 'hoje_ontem'
+    'DESCOBERTA': False,          # True: tentar índices estruturados antes da listagem HTML
+    'FILTRO_DESCOBERTA': None,    # regex dos links de notícia nos índices
+    'SELETOR_PROXIMA': 'a[rel="next"], link[rel="next"]',  # próxima página (recuperação histórica)
+
+    # Detalhe
+    'SELETORES_CONTEUDO': ['article', 'body'],
+    'TAGS_REMOVIDAS': ['script', 'style', 'iframe', 'form', 'nav'],
+    'MODO_CONTEUDO': 'paragrafos',  # 'paragrafos' (<p>...</p>) ou 'texto' (texto puro)
+    'MIN_PARAGRAFO': 20,
+    'SIMILARIDADE_MAXIMA': None,  # ex.: 0.85 descarta parágrafos quase repetidos
+    'SELETOR_TITULO_DETALHE': None,
+    'REGRAS_IMAGEM': [],          # [{'seletor', 'atributo', 'contem', 'escopo'}]
+    'REGEX_DATA_DETALHE': None,
+    'HORA_PADRAO': None,          # 'HH:MM' (Brasília) quando a fonte só informa o dia
+    'IMAGENS_TEMATICAS': None,    # {tema: url, 'default': url} quando a notícia não tem imagem
+    'TEMAS': None,                # None: classificador.TEMAS
+    'EXIGIR_IMAGEM': False,
+    'IMAGEM_NO_CONTEUDO': False,
+    'ESPELHAR_IMAGENS': True,     # imagem destacada copiada para imagens/<fonte>/ (espelho.py)
+    'PALAVRAS_BLOQUEADAS': [],
+    'FILTRAR_CORPO': True,
+    'CONCORRENCIA': 2,
+    'PAUSA': 0,
+
+    # Saída
+    'TTL': None,
+    'GUID_PREFIXO': None,         # None: o link é o guid
+    'DESCRICAO_ITEM': 'conteudo', # 'conteudo' ou 'titulo'
+    'RODAPE_HTML': None,          # modelo com {link}
+    'MEDIA_RSS': False,
+    'MEDIA_DESCRICAO': False,     # <media:description> (resumo) dentro do media:content
+    'GERADOR': None,              # <generator> do canal
+    'CATEGORIAS': False,          # <category> com o tema do classificador, quando confiável
+    'TAMANHO_ENCLOSURE': None,
+}
+
+# Incrementar ao mudar extrair(): invalida o cache de extração de todas as fontes
+VERSAO_EXTRATOR = 1
+
+# Incrementar ao mudar renderizar_item(): invalida o cache de fragmentos
+VERSAO_RSS = 2
+
+OBRIGATORIOS = ['NOME', 'TITULO', 'URL_BASE', 'URL_LISTA', 'FEED_FILE', 'SELETOR_ITEM']
+
+MESES = {
+    'janeiro': 1, 'fevereiro': 2, 'março': 3, 'abril': 4,
+    'maio': 5, 'junho': 6, 'julho': 7, 'agosto': 8,
+    'setembro': 9, 'outubro': 10, 'novembro': 11, 'dezembro': 12,
+    'jan': 1, 'fev': 2, 'mar': 3, 'abr': 4,
+    'mai': 5, 'jun': 6, 'jul': 7, 'ago': 8,
+    'set': 9, 'out': 10, 'nov': 11, 'dez': 12
+}
+
+RE_DATA_NUMERICA = re.compile(r'(\d{1,2})/(\d{1,2})/(\d{4})')
+RE_DATA_EXTENSO = re.compile(r'(\d{1,2})\s*(?:de\s+)?([a-zç]{3,9})\.?,?\s*(?:de\s+)?(\d{4})?')
+RE_HORA = re.compile(r'(\d{1,2})[:h](\d{2})')
+
+_compiladas = {}
+
+
+# ================= COMPILAÇÃO =================
+def compilar(nome):
+    """Carrega a definição (import preguiçoso) e pré-compila seletores e filtros.
+    O resultado fica em cache pelo resto do processo."""
+    if nome in _compiladas:
+        return _compiladas[nome]
+
+    definicao = fontes.carregar(nome)
+    faltando = [c for c in OBRIGATORIOS if not hasattr(definicao, c)]
+    if faltando:
+        raise ValueError(f"Definição '{nome}' sem: {', '.join(faltando)}")
+
+    c = dict(PADROES)
+    c.update({k: v for k, v in vars(definicao).items() if k.isupper()})
+    c['limpar_texto'] = getattr(definicao, 'limpar_texto', None)
+
+    def sel(texto):
+        return soupsieve.compile(texto) if texto else None
+
+    c['sel_item'] = sel(c['SELETOR_ITEM'])
+    c['sel_titulo'] = sel(c['SELETOR_TITULO'])
+    c['sel_link'] = sel(c['SELETOR_LINK'])
+    c['sel_data'] = sel(c['SELETOR_DATA'])
+    c['sel_proxima'] = sel(c['SELETOR_PROXIMA'])
+    c['sel_titulo_detalhe'] = sel(c['SELETOR_TITULO_DETALHE'])
+    c['sel_h1'] = sel('h1')  # título de itens descobertos sem título no índice
+    c['sel_conteudo'] = [(texto, sel(texto)) for texto in c['SELETORES_CONTEUDO']]
+    c['regras_imagem'] = [
+        (sel(r['seletor']), r.get('atributo', 'src'), r.get('contem'), r.get('escopo', 'pagina'))
+        for r in c['REGRAS_IMAGEM']
+    ]
+    c['tabela_temas'] = classificador.compilar(c['TEMAS']) if c['TEMAS'] else classificador.TABELA
+    c['re_data_detalhe'] = re.compile(c['REGEX_DATA_DETALHE']) if c['REGEX_DATA_DETALHE'] else None
+
+    # Uma única expressão para todas as palavras: uma passada pelo texto
+    palavras = sorted({p.lower() for p in c['PALAVRAS_BLOQUEADAS']}, key=len, reverse=True)
+    c['re_bloqueio'] = re.compile('|'.join(map(re.escape, palavras))) if palavras else None
+
+    c['canal'] = {'titulo': c['TITULO'], 'link': c['URL_BASE'], 'descricao': c['DESCRICAO']}
+
+    # Versão do extrator para o cache: motor + constantes da definição + gancho de limpeza
+    impressao = repr(sorted((k, repr(v)) for k, v in vars(definicao).items() if k.isupper()))
+    if c['limpar_texto']:
+        impressao += c['limpar_texto'].__code__.co_code.hex() + repr(c['limpar_texto'].__code__.co_consts)
+    c['versao_extrator'] = f"{VERSAO_EXTRATOR}-{hashlib.sha1(impressao.encode('utf-8')).hexdigest()[:12]}"
+
+    # Verificação TLS e pool por host ficam no transporte (valem para descoberta e recuperação também)
+    for url in {c['URL_BASE'], c['URL_LISTA']}:
+        transporte.configurar(url, verificar=c['VERIFICAR_TLS'], conexoes=c['CONCORRENCIA'])
+
+    _compiladas[nome] = c
+    return c
+
+
+# ================= FUNÇÕES AUXILIARES =================
+def interpretar_data(texto):
+    """Data em português ('12 de março de 2026', '12 mar 2026') ou dd/mm/aaaa."""
+    if not texto:
+        return None
+    texto = texto.lower()
+    try:
+        m = RE_DATA_NUMERICA.search(texto)
+        if m:
+            return date(int(m.group(3)), int(m.group(2)), int(m.group(1)))
+        for m in RE_DATA_EXTENSO.finditer(texto):
+            mes = MESES.get(m.group(2))
+            if mes:
+                ano = int(m.group(3)) if m.group(3) else datetime.now(FUSO_BRASILIA).year
+                return date(ano, mes, int(m.group(1)))
+    except ValueError:
+        pass
+    return None
+
+
+def _publicado(c, dia, texto_data=''):
+    if not dia:
+        return datetime.now(timezone.utc)
+    m = RE_HORA.search(texto_data or '') or (RE_HORA.search(c['HORA_PADRAO']) if c['HORA_PADRAO'] else None)
+    if m:
+        return datetime(dia.year, dia.month, dia.day, int(m.group(1)), int(m.group(2)), tzinfo=FUSO_BRASILIA)
+    return datetime(dia.year, dia.month, dia.day, tzinfo=FUSO_BRASILIA)
+
+
+def _datas_aceitas(c):
+    hoje = datetime.now(FUSO_BRASILIA).date()
+    if c['DATAS'] == 'hoje':
+        return {hoje}
+    if c['DATAS'] == 'hoje_ontem':
+        return {hoje, hoje - timedelta(days=1)}
+    return None
+
+
+def bloqueado(c, texto):
+    """True se o texto contém alguma das PALAVRAS_BLOQUEADAS da fonte."""
+    return bool(c['re_bloqueio'] and c['re_bloqueio'].search(texto.lower()))
+
+
+def _baixar(c, url, timeout):
+    resposta = transporte.sessao().get(url, headers=c['HEADERS'], timeout=timeout, verify=c['VERIFICAR_TLS'])
+    metricas.contar('http.requisicoes')
+    metricas.contar('http.bytes', len(resposta.content))
+    return resposta
+
+
+def _quase_repetido(texto, anteriores, limite):
+    for anterior in anteriores:
+        comparador = difflib.SequenceMatcher(None, texto, anterior)
+        # Os limites superiores baratos descartam a maioria antes do ratio() completo
+        if comparador.real_quick_ratio() < limite or comparador.quick_ratio() < limite:
+            continue
+        if comparador.ratio() >= limite:
+            return True
+    return False
+
+
+# ================= ETAPAS =================
+def ler_item(c, no):
+    """Título, link e data de um item da listagem ({'titulo', 'link', 'dia', 'texto_data'}), ou None."""
+    no_titulo = c['sel_titulo'].select_one(no) if c['sel_titulo'] else no
+    no_link = c['sel_link'].select_one(no) if c['sel_link'] else no
+    if not no_titulo or not no_link or not no_link.get('href'):
+        return None
+
+    titulo = no_titulo.get_text(strip=True)
+    if len(titulo) < c['MIN_TITULO'] or any(t in titulo for t in c['TITULOS_IGNORADOS']):
+        return None
+
+    texto_data = ''
+    dia = None
+    if c['sel_data']:
+        no_data = c['sel_data'].select_one(no)
+        texto_data = no_data.get_text(' ', strip=True) if no_data else ''
+        dia = interpretar_data(texto_data)
+
+    return {'titulo': titulo, 'link': urljoin(c['URL_BASE'], no_link['href']), 'dia': dia, 'texto_data': texto_data}
+
+
+def listar(c, marca=None):
+    """
+    Baixa a listagem e devolve (itens candidatos sem detalhe, link mais novo).
+    Com a marca d'água da execução anterior, os itens a partir dela saem
+    marcados como 'conhecido'.
+    """
+    resposta = _baixar(c, c['URL_LISTA'], c['TIMEOUT_LISTA'])
+    soup = BeautifulSoup(codificacao.decodificar(resposta), c['PARSER'])
+    aceitas = _datas_aceitas(c)
+
+    itens = []
+    vistos = set()
+    mais_novo = None
+    conhecido = False
+    for no in c['sel_item'].select(soup):
+        metricas.contar('itens.listados')
+
+        lido = ler_item(c, no)
+        if lido is None or lido['link'] in vistos:
+            continue
+        titulo, link, dia, texto_data = lido['titulo'], lido['link'], lido['dia'], lido['texto_data']
+
+        # A listagem vem do mais novo para o mais antigo: da marca em diante, tudo é conhecido
+        if mais_novo is None:
+            mais_novo = (link, dia)
+        if not conhecido and estado.alcancou_marca(marca, link, dia):
+            conhecido = True
+
+        if bloqueado(c, titulo):
+            metricas.contar('itens.filtrados.palavras')
+            continue
+
+        if aceitas is not None and c['sel_data'] and dia not in aceitas:
+            metricas.contar('itens.filtrados.data')
+            continue
+
+        vistos.add(link)
+        itens.append({'titulo': titulo[:300], 'link': link, 'dia': dia, 'texto_data': texto_data,
+                      'conhecido': conhecido})
+        if c['LIMITE'] and len(itens) >= c['LIMITE']:
+            break
+
+    return itens, mais_novo
+
+
+def itens_descobertos(c, entradas):
+    """Converte as entradas de descoberta.descobrir nos mesmos itens de listar()."""
+    aceitas = _datas_aceitas(c)
+    itens = []
+    for entrada in entradas:
+        metricas.contar('itens.listados')
+        titulo = entrada['titulo'] or ''
+        if titulo and bloqueado(c, titulo):
+            metricas.contar('itens.filtrados.palavras')
+            continue
+        publicado = entrada['publicado']
+        dia = publicado.astimezone(FUSO_BRASILIA).date() if publicado else None
+        # Sem data no índice (sitemap comum), detalhar() filtra pela data da página
+        if aceitas is not None and (dia not in aceitas if dia else not c['re_data_detalhe']):
+            metricas.contar('itens.filtrados.data')
+            continue
+        itens.append({'titulo': titulo[:300], 'link': entrada['link'], 'dia': dia, 'texto_data': '',
+                      'publicado': publicado, 'conhecido': not entrada['novo']})
+        if c['LIMITE'] and len(itens) >= c['LIMITE']:
+            break
+    return itens
+
+
+def extrair(c, item, corpo):
+    """
+    Parsing e limpeza da página já baixada (já decodificada, ver codificacao.py).
+    Depende só do corpo, do item e da definição, por isso o resultado pode ir
+    para o cache de extração:
+    {'titulo', 'conteudo', 'imagem', 'dia'} ou {'descartado': motivo}.
+    """
+    soup = BeautifulSoup(corpo, c['PARSER'])
+
+    # Data: da listagem ou, se ela não informa, da própria página
+    dia = item['dia']
+    if dia is None and c['re_data_detalhe']:
+        m = c['re_data_detalhe'].search(soup.get_text()[:2000])
+        dia = interpretar_data(m.group(1)) if m else None
+
+    titulo = item['titulo']
+    if c['sel_titulo_detalhe'] or not titulo:
+        no_titulo = (c['sel_titulo_detalhe'] or c['sel_h1']).select_one(soup)
+        if no_titulo and no_titulo.get_text(strip=True):
+            titulo = no_titulo.get_text(strip=True)
+    titulo = titulo or descoberta.titulo_do_link(item['link'])
+
+    area = None
+    for _, seletor in c['sel_conteudo']:
+        area = seletor.select_one(soup)
+        if area is not None:
+            break
+    if area is None:
+        return {'descartado': 'sem_conteudo'}
+
+    for tag in area.find_all(c['TAGS_REMOVIDAS']):
+        tag.decompose()
+
+    paragrafos = []
+    for p in area.find_all('p'):
+        texto = p.get_text(' ', strip=True)
+        if len(texto) < c['MIN_PARAGRAFO']:
+            continue
+        if c['SIMILARIDADE_MAXIMA'] and _quase_repetido(texto, paragrafos, c['SIMILARIDADE_MAXIMA']):
+            continue
+        paragrafos.append(texto)
+
+    texto = '\n\n'.join(paragrafos)
+    if c['limpar_texto']:
+        texto = c['limpar_texto'](texto)
+
+    if c['FILTRAR_CORPO'] and bloqueado(c, texto):
+        return {'descartado': 'filtrados.palavras'}
+
+    imagem = None
+    for seletor, atributo, contem, escopo in c['regras_imagem']:
+        for img in seletor.select(area if escopo == 'conteudo' else soup):
+            valor = (img.get(atributo) or '').strip()
+            if valor and not valor.startswith('data:') and (not contem or contem in valor):
+                imagem = urljoin(item['link'], valor)
+                break
+        if imagem:
+            break
+
+    if not imagem and c['IMAGENS_TEMATICAS']:
+        imagem = classificador.imagem(titulo, texto, c['IMAGENS_TEMATICAS'], c['tabela_temas'])
+
+    if not imagem and c['EXIGIR_IMAGEM']:
+        return {'descartado': 'sem_imagem'}
+
+    if c['MODO_CONTEUDO'] == 'paragrafos':
+        conteudo = '\n\n'.join(f'<p>{textoxml.escapar(t)}</p>' for t in texto.split('\n\n') if t.strip())
+    else:
+        conteudo = texto
+
+    if imagem and c['IMAGEM_NO_CONTEUDO']:
+        conteudo = f'<p><img src="{textoxml.escapar(imagem)}" alt="{textoxml.escapar(titulo)}" /></p>\n\n{conteudo}'
+    if c['RODAPE_HTML']:
+        conteudo += "\n\n" + c['RODAPE_HTML'].format(link=textoxml.escapar(item['link']))
+
+    return {'titulo': titulo, 'conteudo': conteudo, 'imagem': imagem,
+            'dia': dia.isoformat() if dia else None}
+
+
+def detalhar(c, item, aceitas=None):
+    """
+    Baixa a página da notícia e devolve o registro comum, ou None se filtrada.
+    aceitas: dias válidos quando a data só vem da página (padrão: DATAS da definição).
+    """
+    if c['PAUSA']:
+        time.sleep(c['PAUSA'])
+    try:
+        resposta = _baixar(c, item['link'], c['TIMEOUT_DETALHE'])
+        if resposta.status_code != 200:
+            metricas.contar('itens.erro_http')
+            return None
+    except Exception as e:
+        print(f"   ❌ {item['link'][:70]}: {str(e)[:60]}")
+        metricas.contar('itens.erro_http')
+        return None
+
+    # Página igual à já extraída (mesmo corpo, item e definição): pular parsing e limpeza
+    entradas = (item['link'], item['titulo'], item['dia'])
+    extraido = cache_extracao.obter(c['NOME'], c['versao_extrator'], resposta.content, *entradas)
+    if extraido is None:
+        with metricas.cronometro('etapa.extracao'):
+            extraido = extrair(c, item, codificacao.decodificar(resposta))
+        cache_extracao.guardar(c['NOME'], c['versao_extrator'], resposta.content, extraido, *entradas)
+
+    if 'descartado' in extraido:
+        metricas.contar(f"itens.{extraido['descartado']}")
+        item['descartado'] = True
+        return None
+
+    dia = date.fromisoformat(extraido['dia']) if extraido['dia'] else None
+    aceitas = aceitas if aceitas is not None else _datas_aceitas(c)
+    if item['dia'] is None and aceitas is not None and dia not in aceitas and c['re_data_detalhe']:
+        metricas.contar('itens.filtrados.data')
+        item['descartado'] = True
+        return None
+
+    guid = None
+    if c['GUID_PREFIXO']:
+        guid = f"{c['GUID_PREFIXO']}-{hashlib.md5(item['link'].encode()).hexdigest()[:12]}"
+
+    return novo_registro(
+        c['NOME'], extraido['titulo'], item['link'], item.get('publicado') or _publicado(c, dia, item['texto_data']),
+        conteudo=extraido['conteudo'], imagem=extraido['imagem'], resumo=extraido['titulo'][:200], guid=guid
+    )
+
+
+def do_historico(c, item, descartados):
+    """
+    Registro de um item conhecido sem baixar a página: vem do histórico, ou é
+    descartado de novo se os filtros já o recusaram. None quando é preciso baixar.
+    """
+    if item['link'] in descartados:
+        metricas.contar('itens.conhecidos.descartados')
+        return False
+    registro = arquivo.buscar(c['NOME'], item['link'])
+    if registro is None:
+        return None
+    aceitas = _datas_aceitas(c)
+    if aceitas is not None and registro['publicado'].astimezone(FUSO_BRASILIA).date() not in aceitas:
+        metricas.contar('itens.filtrados.data')
+        return False
+    metricas.contar('itens.conhecidos.historico')
+    return registro
+
+
+def detalhar_todos(c, itens, descartados=frozenset()):
+    """
+    Busca os detalhes em paralelo (CONCORRENCIA), preservando a ordem da listagem.
+    Itens conhecidos (marca d'água) saem do histórico sem nova requisição.
+    """
+    resultados = [do_historico(c, item, descartados) if item.get('conhecido') else None for item in itens]
+    pendentes = [item for item, r in zip(itens, resultados) if r is None]
+
+    if c['CONCORRENCIA'] <= 1:
+        baixados = [detalhar(c, item) for item in pendentes]
+    else:
+        with ThreadPoolExecutor(max_workers=c['CONCORRENCIA']) as executor:
+            baixados = list(executor.map(lambda item: detalhar(c, item), pendentes))
+
+    baixados = iter(baixados)
+    resultados = [next(baixados) if r is None else r for r in resultados]
+    return [r for r in resultados if r]
+
+
+def renderizar_item(c, r):
+    """<item> do RSS para um registro."""
+    partes = ['<item>']
+    partes.append(f'<title>{textoxml.escapar(r["titulo"])}</title>')
+    partes.append(f'<link>{textoxml.escapar(r["link"])}</link>')
+    if r['guid'] != r['link']:
+        partes.append(f'<guid isPermaLink="false">{textoxml.escapar(r["guid"])}</guid>')
+    else:
+        partes.append(f'<guid>{textoxml.escapar(r["guid"])}</guid>')
+    partes.append(f'<pubDate>{r["publicado"].astimezone(timezone.utc).strftime("%a, %d %b %Y %H:%M:%S +0000")}</pubDate>')
+    if c['DESCRICAO_ITEM'] == 'titulo':
+        partes.append(f'<description>{textoxml.escapar(r["resumo"])}</description>')
+    else:
+        partes.append(f'<description>{textoxml.cdata(r["conteudo"])}</description>')
+    partes.append(f'<content:encoded>{textoxml.cdata(r["conteudo"])}</content:encoded>')
+    if c['CATEGORIAS']:
+        rotulo = classificador.categoria(r['titulo'], r['conteudo'], c['tabela_temas'])
+        if rotulo:
+            partes.append(f'<category>{textoxml.escapar(rotulo)}</category>')
+    if r['imagem']:
+        imagem = textoxml.escapar(r['imagem'])
+        tamanho = f' length="{c["TAMANHO_ENCLOSURE"]}"' if c['TAMANHO_ENCLOSURE'] else ''
+        partes.append(f'<enclosure url="{imagem}" type="image/jpeg"{tamanho} />')
+        if c['MEDIA_RSS']:
+            partes.append(f'<media:content url="{imagem}" type="image/jpeg" medium="image">')
+            partes.append(f'<media:title>{textoxml.escapar(r["titulo"][:100])}</media:title>')
+            if c['MEDIA_DESCRICAO']:
+                partes.append(f'<media:description>{textoxml.escapar(r["resumo"][:200])}</media:description>')
+            partes.append('</media:content>')
+    partes.append('</item>')
+    return '\n'.join(partes)
+
+
+def renderizar_itens(c, registros):
+    """<item> de cada registro; os iguais aos da execução anterior saem prontos do cache de fragmentos."""
+    versao = f"{VERSAO_RSS}-{c['versao_extrator']}"
+    return [fragmentos.renderizar(r['fonte'], r['guid'], versao, r, lambda r=r: renderizar_item(c, r))
+            for r in registros]
+
+
+def renderizar_rss(c, itens):
+    """Documento RSS com os <item> já renderizados (renderizar_itens)."""
+    partes = [
+        '<?xml version="1.0" encoding="UTF-8"?>',
+        '<rss version="2.0" xmlns:content="http://purl.org/rss/1.0/modules/content/" '
+        'xmlns:media="http://search.yahoo.com/mrss/">',
+        '<channel>',
+        f'<title>{textoxml.escapar(c["TITULO"])}</title>',
+        f'<link>{c["URL_BASE"]}</link>',
+        f'<description>{textoxml.escapar(c["DESCRICAO"])}</description>',
+        '<language>pt-br</language>',
+    ]
+    if c['GERADOR']:
+        partes.append(f'<generator>{textoxml.escapar(c["GERADOR"])}</generator>')
+    partes.append(f'<lastBuildDate>{datetime.now(timezone.utc).strftime("%a, %d %b %Y %H:%M:%S +0000")}</lastBuildDate>')
+    # Dicas de consulta pelo ritmo aprendido da fonte (cadencia.py); TTL da definição sem histórico
+    ttl = cadencia.ttl(c['NOME'], c['TTL'])
+    if ttl:
+        partes.append(f'<ttl>{ttl}</ttl>')
+    skip = cadencia.skip_hours(c['NOME'])
+    if skip:
+        partes.append(skip)
+    atom = notificacao.links_atom(c['FEED_FILE'])
+    if atom:
+        partes.append(atom)
+
+    partes.extend(itens)
+    partes.append('</channel>')
+    partes.append('</rss>')
+    return '\n'.join(partes)
+
+
+# ================= EXECUÇÃO =================
+def executar(nome):
+    """Roda a fonte declarativa de ponta a ponta. Retorna True em caso de sucesso."""
+    c = compilar(nome)
+    metricas.reiniciar()
+
+    print(f"🚀 {c['TITULO']} ({nome})")
+    print("=" * 60)
+
+    try:
+        marca = estado.marca_dagua(nome)
+        entradas = None
+        with metricas.cronometro('etapa.listagem'):
+            if c['DESCOBERTA']:
+                entradas = descoberta.descobrir(nome, c['URL_BASE'], c['FILTRO_DESCOBERTA'],
+                                                c['HEADERS'], c['VERIFICAR_TLS'], sem_data=bool(c['re_data_detalhe']))
+            if entradas is None:
+                itens, mais_novo = listar(c, marca)
+            else:
+                itens, mais_novo = itens_descobertos(c, entradas), None
+                print(f"🔎 {len(entradas)} entrada(s) do índice estruturado")
+        novos = sum(1 for item in itens if not item['conhecido'])
+        print(f"📋 {len(itens)} item(ns) na listagem após filtros ({novos} novo(s) desde a última execução)")
+
+        with metricas.cronometro('etapa.detalhe'):
+            registros = detalhar_todos(c, itens, marca['descartados'] if marca else frozenset())
+        print(f"📰 {len(registros)} notícia(s) extraída(s)")
+
+        if c['ESPELHAR_IMAGENS']:
+            with metricas.cronometro('etapa.imagens'):
+                for registro in registros:
+                    espelho.espelhar_registro(nome, registro, c['HEADERS'])
+
+        # Só conta para o devido() dos workflows a coleta que terminou: com registros,
+        # ou sem nada novo na listagem (nenhum detalhe falhou, só filtros). Se falhar,
+        # o próximo cron tenta de novo em vez de esperar o intervalo aprendido.
+        coletou = bool(registros) or all(item.get('descartado') for item in itens)
+
+        # Nada coletado: a última coleta boa continua no feed, marcada como desatualizada
+        if not registros and reserva.publicar(nome, c['FEED_FILE'], c['canal'], 'nenhuma notícia nova na coleta',
+                                              ttl=c['TTL'] or reserva.TTL):
+            if coletou:
+                cadencia.registrar_coleta(nome)
+            metricas.imprimir()
+            return True
+
+        with metricas.cronometro('etapa.renderizacao'):
+            itens_xml = renderizar_itens(c, registros)
+            xml = renderizar_rss(c, itens_xml)
+        with metricas.cronometro('etapa.validacao'):
+            resultado = validador.validar(nome, registros, xml, exigir_imagem=c['EXIGIR_IMAGEM'])
+        validador.exigir_publicavel(resultado)
+        # Hub/webhook só são avisados se o conjunto de itens mudou (notificacao.py)
+        notificacao.gravar_feed(nome, c['FEED_FILE'], xml)
+        print(f"📁 Feed salvo em: {c['FEED_FILE']}")
+        validador.imprimir(resultado)
+
+        metricas.contar('itens.publicados', len(registros))
+        sem_derrubar('gerar JSON Feed', jsonfeed.gravar, nome, registros, c['canal'])
+        sem_derrubar('gravar histórico', arquivo.arquivar, nome, registros)
+        # Só um feed sem erros de validação vira a "última coleta boa"
+        if resultado['ok']:
+            reserva.guardar(nome, registros, itens_xml)
+        sem_derrubar('gerar feed paginado', feed_paginado.publicar, nome, c['canal'], ttl=c['TTL'] or 60)
+        espelho.gravar()
+        fragmentos.gravar()
+
+        descartados = [item['link'] for item in itens if item.get('descartado')]
+        if entradas is not None:
+            descoberta.gravar_marca(nome, entradas)
+            estado.gravar_marca_dagua(nome, entradas[0]['link'], None, descartados)
+        elif mais_novo:
+            estado.gravar_marca_dagua(nome, mais_novo[0], mais_novo[1], descartados)
+
+        if coletou:
+            cadencia.registrar_coleta(nome)
+        metricas.imprimir()
+        return True
+
+    except Exception as e:
+        print(f"❌ Erro: {e}")
+        # O feed em disco (última coleta boa) fica como está; o agendador tenta de novo antes
+        reserva.falhou(nome, e)
+        metricas.imprimir()
+        return False
+
+
+# ================= MAIN =================
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Uso: python motor.py <fonte> | --listar")
+        sys.exit(1)
+
+    if sys.argv[1] == '--listar':
+        for nome_fonte in fontes.listar():
+            print(nome_fonte)
+        sys.exit(0)
+
+    sys.exit(0 if executar(sys.argv[1]) else 1)
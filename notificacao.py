@@ -0,0 +1,327 @@
+#!/usr/bin/env python3
+# notificacao.py - Aviso de feed atualizado (WebSub e webhook) só quando os itens mudam
+#
+# O workflow radar085_cron.yml chamava o cron do WP Automatic a cada 15
+# minutos, mudasse algum feed ou não, e cada chamada fazia o WordPress baixar
+# e interpretar todos os feeds de novo.
+#
+# Aqui cada feed gravado (gravar_feed) tem o seu conjunto de itens reduzido a
+# uma impressão: identidade (o <link> sem #fragmento, ou o guid) + título,
+# link, conteúdo e imagem de cada item, sem ordem. lastBuildDate, <ttl>,
+# descrição do canal, posição e post_id do WXR não entram (o guid da Agência
+# Brasil é link#post_id, e o post_id muda com a posição do item), então
+# regravar o mesmo conteúdo (coleta sem novidade, feed de reserva) não conta
+# como mudança. Conjunto vazio (feed de erro) também não: quando os itens
+# voltam iguais, ninguém é avisado.
+#
+# Se a impressão mudou, o aviso fica pendente em cache/notificacoes/<fonte>.json
+# (somado ao que ainda estiver pendente) e enviar() o entrega depois que o
+# feed está publicado:
+#   - WebSub: POST hub.mode=publish&hub.url=<feed> para WEBSUB_HUB;
+#   - webhook: POST JSON (fonte, feed, adicionados, removidos, alterados)
+#     para NOTIFICAR_WEBHOOK, assinado com HMAC-SHA256 em X-Hub-Signature-256
+#     quando NOTIFICAR_SEGREDO está definido.
+# Nos workflows o envio é um passo depois do push, que espera o GitHub Pages
+# servir a versão nova (até ESPERA_PUBLICACAO segundos); no agendador é
+# logo depois da execução. cache/notificacoes entra no actions/cache de cada
+# workflow: aviso que falhou é entregue na execução seguinte. A impressão
+# anterior fica em estado/<fonte>.json ou, sem estado (cmfor nos workflows),
+# vem do feed ainda em disco.
+#
+# Com WEBSUB_HUB definido (no job inteiro, não só no passo do aviso), os
+# feeds RSS e os de reserva anunciam o hub (<atom:link rel="hub"> e
+# rel="self"), para leitores que assinam por WebSub.
+#
+# Uso:
+#   notificacao.gravar_feed('alece', FEED_FILE, xml)      # em vez de open().write()
+#   python notificacao.py enviar alece                    # depois do push
+#   python notificacao.py hub 8790                        # hub local para testes
+#   WEBSUB_HUB=http://localhost:8790/ python motor.py alece
+
+import hashlib
+import hmac
+import json
+import os
+import sys
+import time
+import xml.etree.ElementTree as ET
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs
+
+import estado
+import transporte
+from modelo import FUSO_BRASILIA, URL_PUBLICACAO
+
+# ================= CONFIGURAÇÕES =================
+PASTA_PENDENTES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cache", "notificacoes")
+
+WEBSUB_HUB = os.environ.get('WEBSUB_HUB', '')
+WEBHOOK = os.environ.get('NOTIFICAR_WEBHOOK', '')
+SEGREDO = os.environ.get('NOTIFICAR_SEGREDO', '')
+
+TIMEOUT = 15
+ESPERA_PUBLICACAO = int(os.environ.get('NOTIFICAR_ESPERA', 300))   # segundos (0: não esperar)
+PAUSA_PUBLICACAO = 15
+MAX_IDENTIDADES = 50      # por lista no corpo do webhook
+
+CONTEUDO = '{http://purl.org/rss/1.0/modules/content/}encoded'
+ATOM = 'http://www.w3.org/2005/Atom'
+
+
+# ================= IMPRESSÃO =================
+def _texto(item, tag):
+    no = item.find(tag)
+    return (no.text or '').strip() if no is not None else ''
+
+
+def itens(xml):
+    """{identidade: resumo} dos <item> do feed (RSS ou WXR), ou None se não é XML válido."""
+    try:
+        raiz = ET.fromstring(xml.encode('utf-8') if isinstance(xml, str) else xml)
+    except ET.ParseError:
+        return None
+    resultado = {}
+    for item in raiz.iter('item'):
+        link = _texto(item, 'link')
+        # O #fragmento não identifica a notícia (guid link#post_id do WXR)
+        identidade = (link or _texto(item, 'guid')).split('#')[0]
+        if not identidade:
+            continue
+        enclosure = item.find('enclosure')
+        campos = [
+            _texto(item, 'title'),
+            link,
+            _texto(item, CONTEUDO) or _texto(item, 'description'),
+            enclosure.get('url', '') if enclosure is not None else '',
+        ]
+        serial = json.dumps(campos, ensure_ascii=False)
+        resultado[identidade] = hashlib.sha256(serial.encode('utf-8')).hexdigest()[:16]
+    return resultado
+
+
+def impressao(conjunto):
+    """Hash do conjunto de itens, independente da ordem no feed."""
+    serial = json.dumps(sorted(conjunto.items()), ensure_ascii=False)
+    return hashlib.sha256(serial.encode('utf-8')).hexdigest()
+
+
+def url_feed(arquivo_feed):
+    return f"{URL_PUBLICACAO}/{os.path.basename(arquivo_feed)}"
+
+
+def pares_atom(arquivo_feed):
+    """[(rel, href)] de hub e self (vazio sem WEBSUB_HUB)."""
+    if not WEBSUB_HUB:
+        return []
+    return [('hub', WEBSUB_HUB), ('self', url_feed(arquivo_feed))]
+
+
+def links_atom(arquivo_feed):
+    """<atom:link> de hub e self para o <channel> (vazio sem WEBSUB_HUB)."""
+    if not WEBSUB_HUB:
+        return ''
+    return (f'<atom:link xmlns:atom="{ATOM}" rel="hub" href="{WEBSUB_HUB}" />\n'
+            f'<atom:link xmlns:atom="{ATOM}" rel="self" href="{url_feed(arquivo_feed)}" type="application/rss+xml" />')
+
+
+# ================= REGISTRO =================
+def _anterior(fonte, arquivo_feed):
+    """Itens da última versão registrada: do estado, ou do feed ainda em disco."""
+    guardado = estado.ler(fonte).get('notificacao')
+    if guardado:
+        return guardado.get('itens', {})
+    try:
+        with open(arquivo_feed, 'r', encoding='utf-8') as f:
+            return itens(f.read()) or {}
+    except OSError:
+        return {}
+
+
+def _caminho_pendente(fonte):
+    return os.path.join(PASTA_PENDENTES, f"{fonte}.json")
+
+
+def _pendente(fonte):
+    try:
+        with open(_caminho_pendente(fonte), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def registrar(fonte, arquivo_feed, xml):
+    """Compara os itens de `xml` com a versão anterior; se mudaram, deixa o aviso pendente."""
+    atuais = itens(xml)
+    if not atuais:
+        return False
+    anteriores = _anterior(fonte, arquivo_feed)
+    if impressao(atuais) == impressao(anteriores):
+        print(f"🔕 {fonte}: mesmos itens da versão anterior, sem aviso")
+        return False
+
+    adicionados = [i for i in atuais if i not in anteriores]
+    removidos = [i for i in anteriores if i not in atuais]
+    alterados = [i for i in atuais if i in anteriores and atuais[i] != anteriores[i]]
+    estado.atualizar(fonte, notificacao={'impressao': impressao(atuais), 'itens': atuais})
+
+    # Aviso anterior ainda não entregue: o novo leva também as mudanças dele
+    pendente = _pendente(fonte)
+    if pendente:
+        adicionados = list(dict.fromkeys(
+            [i for i in pendente['adicionados'] if i in atuais] + adicionados))
+        removidos = list(dict.fromkeys(
+            [i for i in pendente['removidos'] if i not in atuais] + removidos))
+        alterados = list(dict.fromkeys(
+            [i for i in pendente['alterados'] if i in atuais and i not in adicionados] + alterados))
+
+    os.makedirs(PASTA_PENDENTES, exist_ok=True)
+    aviso = {
+        'fonte': fonte,
+        'feed': url_feed(arquivo_feed),
+        'impressao': impressao(atuais),
+        'itens': len(atuais),
+        'adicionados': adicionados[:MAX_IDENTIDADES],
+        'removidos': removidos[:MAX_IDENTIDADES],
+        'alterados': alterados[:MAX_IDENTIDADES],
+        'gerado': datetime.now(FUSO_BRASILIA).isoformat(timespec='seconds'),
+    }
+    with open(_caminho_pendente(fonte), 'w', encoding='utf-8') as f:
+        json.dump(aviso, f, ensure_ascii=False, indent=1)
+    print(f"🔔 {fonte}: {len(adicionados)} novo(s), {len(removidos)} removido(s), "
+          f"{len(alterados)} alterado(s) - aviso pendente")
+    return True
+
+
+def gravar_feed(fonte, arquivo_feed, xml):
+    """Grava o feed e registra se o conjunto de itens mudou. Retorna True se mudou."""
+    try:
+        mudou = registrar(fonte, arquivo_feed, xml)
+    except Exception as e:
+        print(f"⚠️  Notificação não registrada: {e}")
+        mudou = False
+    with open(arquivo_feed, 'w', encoding='utf-8') as f:
+        f.write(xml)
+    return mudou
+
+
+# ================= ENVIO =================
+def _publicado(aviso):
+    """True quando o endereço público já serve os itens do aviso."""
+    try:
+        resposta = transporte.sessao().get(aviso['feed'], timeout=TIMEOUT, headers={'Cache-Control': 'no-cache'})
+        return resposta.ok and impressao(itens(resposta.content) or {}) == aviso['impressao']
+    except Exception:
+        return False
+
+
+def _aguardar_publicacao(aviso, espera):
+    limite = time.monotonic() + espera
+    while not _publicado(aviso):
+        if time.monotonic() >= limite:
+            print(f"⏳ {aviso['feed']} ainda sem a versão nova após {espera}s; avisando mesmo assim")
+            return
+        time.sleep(PAUSA_PUBLICACAO)
+
+
+def _ping_hub(aviso):
+    resposta = transporte.sessao().post(WEBSUB_HUB, data={'hub.mode': 'publish', 'hub.url': aviso['feed']},
+                                        timeout=TIMEOUT)
+    resposta.raise_for_status()
+    print(f"📣 Hub avisado ({resposta.status_code}): {aviso['feed']}")
+
+
+def _webhook(aviso):
+    corpo = json.dumps(aviso, ensure_ascii=False).encode('utf-8')
+    cabecalhos = {'Content-Type': 'application/json'}
+    if SEGREDO:
+        assinatura = hmac.new(SEGREDO.encode('utf-8'), corpo, hashlib.sha256).hexdigest()
+        cabecalhos['X-Hub-Signature-256'] = f"sha256={assinatura}"
+    resposta = transporte.sessao().post(WEBHOOK, data=corpo, headers=cabecalhos, timeout=TIMEOUT)
+    resposta.raise_for_status()
+    print(f"📣 Webhook avisado ({resposta.status_code}): {aviso['fonte']}")
+
+
+def enviar(fonte, espera=ESPERA_PUBLICACAO):
+    """Entrega o aviso pendente da fonte. Se um destino falha, o aviso continua pendente."""
+    aviso = _pendente(fonte)
+    if aviso is None:
+        print(f"🔕 {fonte}: nenhum aviso pendente")
+        return True
+    destinos = [(nome, funcao) for nome, funcao, url in (('hub', _ping_hub, WEBSUB_HUB), ('webhook', _webhook, WEBHOOK))
+                if url]
+    if not destinos:
+        print(f"ℹ️ {fonte}: itens mudaram, mas WEBSUB_HUB/NOTIFICAR_WEBHOOK não estão configurados")
+        os.remove(_caminho_pendente(fonte))
+        return True
+
+    if espera:
+        _aguardar_publicacao(aviso, espera)
+    falhas = []
+    for nome, funcao in destinos:
+        try:
+            funcao(aviso)
+        except Exception as e:
+            print(f"⚠️  Falha ao avisar {nome}: {e}")
+            falhas.append(nome)
+    if not falhas:
+        os.remove(_caminho_pendente(fonte))
+    return not falhas
+
+
+# ================= HUB LOCAL =================
+class _Hub(BaseHTTPRequestHandler):
+    """Hub de teste: aceita publish (WebSub) e webhooks, imprime e guarda o que recebeu."""
+    recebidos = []
+
+    def do_POST(self):
+        corpo = self.rfile.read(int(self.headers.get('Content-Length') or 0))
+        if self.headers.get('Content-Type', '').startswith('application/json'):
+            dados = json.loads(corpo or b'{}')
+            print(f"📥 webhook {self.path}: {dados.get('fonte')} +{len(dados.get('adicionados', []))} "
+                  f"-{len(dados.get('removidos', []))} ~{len(dados.get('alterados', []))}")
+        else:
+            dados = {k: v[0] for k, v in parse_qs(corpo.decode('utf-8')).items()}
+            if dados.get('hub.mode') != 'publish' or not dados.get('hub.url'):
+                self.send_response(400)
+                self.end_headers()
+                return
+            print(f"📥 publish: {dados['hub.url']}")
+        _Hub.recebidos.append({'caminho': self.path, 'dados': dados,
+                               'assinatura': self.headers.get('X-Hub-Signature-256')})
+        self.send_response(204)
+        self.end_headers()
+
+    def do_GET(self):
+        corpo = json.dumps(_Hub.recebidos, ensure_ascii=False, indent=1).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(corpo)))
+        self.end_headers()
+        self.wfile.write(corpo)
+
+    def log_message(self, formato, *args):
+        pass
+
+
+def hub(porta=8790):
+    servidor = ThreadingHTTPServer(('127.0.0.1', porta), _Hub)
+    print(f"🛰️  Hub local em http://127.0.0.1:{porta}/ (GET lista os avisos recebidos)")
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+# ================= MAIN =================
+if __name__ == "__main__":
+    argumentos = sys.argv[1:]
+    if argumentos[:1] == ['hub']:
+        hub(int(argumentos[1]) if len(argumentos) > 1 else 8790)
+    elif argumentos[:1] == ['enviar'] and len(argumentos) > 1:
+        # Sempre código 0: aviso que falhou fica pendente, o feed já foi publicado
+        for nome in argumentos[1:]:
+            enviar(nome)
+    else:
+        print("Uso: python notificacao.py enviar <fonte>... | hub [porta]")
+        sys.exit(1)
@@ -0,0 +1,434 @@
+#!/usr/bin/env python3
+# recuperacao.py - Recuperação histórica de um período, com retomada
+#
+# Os scripts só enxergam hoje/ontem: se o runner fica fora do ar um dia, as
+# notícias daquele dia nunca entram no histórico. Aqui um período inteiro de
+# uma fonte é coletado de novo:
+#
+#   1. listagem - pelo índice estruturado da fonte (WordPress REST paginado
+#      por data, sitemap completo ou RSS; ver descoberta.py) ou andando pelas
+#      páginas da listagem HTML até passar do início do período;
+#   2. detalhe  - as páginas das notícias são baixadas em paralelo, em lotes,
+#      com o mesmo extrator das execuções normais; o ritmo por host de
+#      transporte.py limita a vazão, não o número de threads;
+#   3. saída    - cada lote vai para o histórico numa única transação e, no
+#      fim, as páginas de arquivo (feed_paginado.py) dos dias recuperados são
+#      geradas de uma vez.
+#
+# O progresso fica em estado/<fonte>.recuperacao.json (página seguinte da
+# listagem, itens pendentes, tentativas), gravado a cada página e a cada
+# lote: uma execução interrompida continua de onde parou. Itens que já estão
+# no histórico não são baixados de novo.
+#
+# Uso:
+#   python recuperacao.py fortaleza 2026-03-01 2026-03-10
+#   python recuperacao.py alece caucaia 2026-03-05          # um dia, duas fontes em paralelo
+#   python recuperacao.py alece 2026-03-01 2026-03-31 --paralelo=4 --intervalo=2 --reiniciar
+
+import hashlib
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, time, timedelta
+from urllib.parse import urljoin, urlsplit, urlunsplit, urlencode
+
+import soupsieve
+from bs4 import BeautifulSoup
+
+import arquivo
+import codificacao
+import descoberta
+import estado
+import feed_paginado
+import fontes
+import metricas
+import motor
+import transporte
+import upnewsfortaleza
+from modelo import novo_registro, para_datetime, FUSO_BRASILIA, CANAIS, sem_derrubar
+
+# ================= CONFIGURAÇÕES =================
+PARALELO = 4            # downloads simultâneos por fonte
+INTERVALO_HOST = 1.0    # mínimo de segundos entre requisições ao mesmo host
+LOTE = 20               # itens por lote (uma transação no histórico + um checkpoint)
+MAX_PAGINAS = 200       # páginas de listagem por período
+MAX_TENTATIVAS = 3
+POR_PAGINA_WP = 100
+
+CAMPOS_WP = 'link,title,date_gmt,modified_gmt'
+
+
+# ================= FONTES =================
+def _adaptador_motor(nome):
+    """Fonte declarativa (fontes/): listagem e extração do motor."""
+    c = motor.compilar(nome)
+    return {
+        'fonte': nome,
+        'c': c,
+        'canal': c['canal'],
+        'descoberta': c['DESCOBERTA'],
+        'filtro': c['FILTRO_DESCOBERTA'],
+        'intervalo': max(c['PAUSA'], INTERVALO_HOST),
+        'detalhar': lambda item, aceitas: motor.detalhar(c, item, aceitas),
+    }
+
+
+def _detalhar_fortaleza(c, item, aceitas):
+    extraido = upnewsfortaleza.extrair_conteudo_completo(item['link'], c['HEADERS'])
+    if not extraido:
+        return None
+    publicado = item.get('publicado')
+    if publicado is None:
+        if item['dia'] is None:
+            item['descartado'] = True
+            return None
+        hora = motor.RE_HORA.search(item['texto_data'] or '')
+        publicado = datetime.combine(item['dia'], time(int(hora.group(1)), int(hora.group(2))) if hora else time(12, 0),
+                                     FUSO_BRASILIA)
+    if publicado.astimezone(FUSO_BRASILIA).date() not in aceitas:
+        item['descartado'] = True
+        return None
+    guid = f"fortaleza-{publicado.astimezone(FUSO_BRASILIA):%Y%m%d}-{hashlib.md5(item['link'].encode()).hexdigest()[:12]}"
+    return novo_registro('fortaleza', extraido['titulo_refinado'] or item['titulo'], item['link'], publicado,
+                         conteudo=extraido['conteudo'], imagem=extraido['imagem_destacada'], guid=guid)
+
+
+def _adaptador_fortaleza():
+    """upnewsfortaleza.py: mesma listagem (blog-post-item) e mesmo extrator do script."""
+    c = {
+        'URL_BASE': 'https://www.fortaleza.ce.gov.br',
+        'URL_LISTA': 'https://www.fortaleza.ce.gov.br/noticias',
+        'HEADERS': {
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+            'Accept-Language': 'pt-BR,pt;q=0.9'
+        },
+        'VERIFICAR_TLS': True,
+        'TIMEOUT_LISTA': 15,
+        'PARSER': 'html.parser',
+        'MIN_TITULO': 1,
+        'TITULOS_IGNORADOS': [],
+        're_bloqueio': None,
+        'sel_item': soupsieve.compile('div.blog-post-item'),
+        'sel_titulo': soupsieve.compile('div.intro h2'),
+        'sel_link': soupsieve.compile('a.btn-reveal'),
+        'sel_data': soupsieve.compile('div.blog-time span.font-lato'),
+        'sel_proxima': soupsieve.compile(
+            'div.news-pagination li.pagination-next a, '
+            'div.news-pagination a:-soup-contains("Próximo", "próximo"), a[rel="next"]'
+        ),
+    }
+    return {
+        'fonte': 'fortaleza',
+        'c': c,
+        'canal': CANAIS['fortaleza'],
+        'descoberta': True,
+        'filtro': r'/noticias/[^/?#]+',
+        'intervalo': 2.0,  # o script espera 2 s entre as páginas de notícia
+        'detalhar': lambda item, aceitas: _detalhar_fortaleza(c, item, aceitas),
+    }
+
+
+# Scripts próprios com recuperação; as fontes declarativas entram automaticamente
+ADAPTADORES = {
+    'fortaleza': _adaptador_fortaleza,
+}
+
+
+def adaptador(fonte):
+    if fonte in ADAPTADORES:
+        return ADAPTADORES[fonte]()
+    if fonte in fontes.listar():
+        return _adaptador_motor(fonte)
+    raise ValueError(f"Fonte sem recuperação histórica: {fonte} "
+                     f"(disponíveis: {', '.join(sorted(set(ADAPTADORES) | set(fontes.listar())))})")
+
+
+# ================= CHECKPOINT =================
+def _nome_ponto(fonte):
+    return f"{fonte}.recuperacao"
+
+
+def _item_para_json(item):
+    return dict(item, dia=item['dia'].isoformat() if item.get('dia') else None,
+                publicado=item['publicado'].isoformat() if item.get('publicado') else None)
+
+
+def _item_de_json(dados):
+    return dict(dados, dia=date.fromisoformat(dados['dia']) if dados.get('dia') else None,
+                publicado=para_datetime(dados.get('publicado')))
+
+
+def _novo_ponto(inicio, fim):
+    return {
+        'inicio': inicio.isoformat(),
+        'fim': fim.isoformat(),
+        'modo': None,             # wp, sitemap, rss ou html
+        'indice': None,           # URL do índice estruturado ou da listagem
+        'proxima': None,          # página seguinte da listagem (número no WP, URL no HTML)
+        'paginas': 0,
+        'listagem_concluida': False,
+        'erros_listagem': 0,
+        'pendentes': [],
+        'tentativas': {},
+        'falhas': [],
+        'arquivados': 0,
+        'descartados': 0,
+    }
+
+
+# ================= LISTAGEM =================
+def _no_periodo(dia, inicio, fim):
+    return dia is None or inicio <= dia <= fim
+
+
+def _itens_do_indice(entradas, filtro):
+    itens = []
+    for entrada in descoberta.filtrar(entradas or [], filtro):
+        publicado = entrada['publicado']
+        itens.append({
+            'titulo': entrada['titulo'] or '',
+            'link': entrada['link'],
+            'dia': publicado.astimezone(FUSO_BRASILIA).date() if publicado else None,
+            'texto_data': '',
+            'publicado': publicado,
+        })
+    return itens
+
+
+def _pagina_wp(a, url_indice, pagina, inicio, fim):
+    """Uma página da API REST do WordPress restrita ao período."""
+    partes = urlsplit(url_indice)
+    consulta = urlencode({
+        'per_page': POR_PAGINA_WP, 'page': pagina, 'orderby': 'date', 'order': 'desc',
+        # Um dia de folga em cada ponta: after/before usam o fuso do site
+        'after': f"{inicio - timedelta(days=1)}T00:00:00", 'before': f"{fim + timedelta(days=2)}T00:00:00",
+        '_fields': CAMPOS_WP,
+    })
+    c = a['c']
+    # Estrito: 429/5xx viram exceção (nova tentativa); só o 400 de página
+    # inexistente, depois da última, volta como [] e encerra a listagem
+    entradas = descoberta.ler_wp(urlunsplit((partes.scheme, partes.netloc, partes.path, consulta, '')),
+                                 c['HEADERS'], c['VERIFICAR_TLS'], estrito=True)
+    if not entradas:
+        return [], None
+    return _itens_do_indice(entradas, a['filtro']), (pagina + 1 if len(entradas) >= POR_PAGINA_WP else None)
+
+
+def _pagina_html(a, url):
+    """Itens de uma página da listagem HTML e a URL da página seguinte."""
+    c = a['c']
+    resposta = transporte.sessao().get(url, headers=c['HEADERS'], timeout=c['TIMEOUT_LISTA'], verify=c['VERIFICAR_TLS'])
+    metricas.contar('http.requisicoes')
+    metricas.contar('http.bytes', len(resposta.content))
+    resposta.raise_for_status()
+    soup = BeautifulSoup(codificacao.decodificar(resposta), c['PARSER'])
+
+    itens = []
+    for no in c['sel_item'].select(soup):
+        lido = motor.ler_item(c, no)
+        if lido:
+            itens.append(lido)
+
+    proxima = c['sel_proxima'].select_one(soup) if c['sel_proxima'] else None
+    proxima = urljoin(url, proxima['href']) if proxima is not None and proxima.get('href') else None
+    return itens, (proxima if proxima != url else None)
+
+
+def _ler_pagina(a, ponto, inicio, fim):
+    """Lê a página `ponto['proxima']` da listagem. Retorna (itens, próxima ou None)."""
+    c = a['c']
+    if ponto['modo'] == 'wp':
+        return _pagina_wp(a, ponto['indice'], ponto['proxima'], inicio, fim)
+    if ponto['modo'] == 'sitemap':
+        desde = datetime.combine(inicio - timedelta(days=1), time(0, 0), FUSO_BRASILIA)
+        entradas = descoberta.ler_sitemap(ponto['indice'], c['HEADERS'], c['VERIFICAR_TLS'],
+                                          desde=desde, max_filhos=None, estrito=True)
+        return _itens_do_indice(entradas, a['filtro']), None
+    if ponto['modo'] == 'rss':
+        entradas = descoberta.ler_rss(ponto['indice'], c['HEADERS'], c['VERIFICAR_TLS'], estrito=True)
+        return _itens_do_indice(entradas, a['filtro']), None
+
+    itens, proxima = _pagina_html(a, ponto['proxima'])
+    # Listagem do mais novo para o mais antigo: página toda anterior ao período encerra a busca
+    datados = [item['dia'] for item in itens if item['dia']]
+    if not itens or (datados and max(datados) < inicio):
+        proxima = None
+    return itens, proxima
+
+
+def listar_periodo(a, ponto, inicio, fim, max_paginas=MAX_PAGINAS):
+    """Percorre a listagem até o início do período, acumulando os itens em ponto['pendentes']."""
+    fonte, c = a['fonte'], a['c']
+
+    if ponto['modo'] is None:
+        modo, url = 'html', c['URL_LISTA']
+        if a['descoberta']:
+            dados = descoberta.indice(fonte, c['URL_BASE'], a['filtro'], c['HEADERS'], c['VERIFICAR_TLS'],
+                                      sem_data=bool(c.get('re_data_detalhe')))
+            if dados['modo'] != 'html':
+                modo, url = dados['modo'], dados['url']
+        ponto.update(modo=modo, indice=url, proxima=1 if modo == 'wp' else url)
+        print(f"🔎 {fonte}: listagem por {modo} ({url})")
+
+    vistos = {arquivo.url_canonica(item['link']) for item in ponto['pendentes']}
+    # MAX_TENTATIVAS vale para erros seguidos na mesma página, não para o período todo
+    ponto['erros_listagem'] = 0
+    while ponto['proxima'] is not None:
+        try:
+            itens, proxima = _ler_pagina(a, ponto, inicio, fim)
+        except Exception as e:
+            ponto['erros_listagem'] += 1
+            estado.gravar(_nome_ponto(fonte), ponto)
+            print(f"   ⚠️  {fonte}: erro na página {ponto['paginas'] + 1} da listagem: {str(e)[:60]}")
+            if ponto['erros_listagem'] >= MAX_TENTATIVAS:
+                return False
+            continue
+
+        novos = 0
+        for item in itens:
+            chave = arquivo.url_canonica(item['link'])
+            if chave in vistos or not _no_periodo(item['dia'], inicio, fim):
+                continue
+            if item['titulo'] and c['re_bloqueio'] and motor.bloqueado(c, item['titulo']):
+                metricas.contar('recuperacao.filtrados')
+                continue
+            vistos.add(chave)
+            ponto['pendentes'].append(_item_para_json(item))
+            novos += 1
+
+        ponto['paginas'] += 1
+        ponto['erros_listagem'] = 0
+        ponto['proxima'] = proxima if ponto['paginas'] < max_paginas else None
+        metricas.contar('recuperacao.paginas')
+        estado.gravar(_nome_ponto(fonte), ponto)
+        print(f"📄 {fonte}: página {ponto['paginas']} da listagem, {novos} item(ns) no período")
+
+    ponto['listagem_concluida'] = True
+    estado.gravar(_nome_ponto(fonte), ponto)
+    return True
+
+
+# ================= DETALHES =================
+def detalhar_pendentes(a, ponto, inicio, fim, paralelo=PARALELO):
+    """Baixa os itens pendentes em lotes paralelos e arquiva cada lote de uma vez."""
+    fonte = a['fonte']
+    aceitas = {inicio + timedelta(days=n) for n in range((fim - inicio).days + 1)}
+
+    def um(item):
+        try:
+            registro = a['detalhar'](item, aceitas)
+        except Exception as e:
+            print(f"   ❌ {item['link'][:70]}: {str(e)[:60]}")
+            return None
+        # Sem data na listagem nem na página, o extrator usaria "agora": fora do período
+        if registro and registro['publicado'].astimezone(FUSO_BRASILIA).date() not in aceitas:
+            item['descartado'] = True
+            return None
+        return registro
+
+    with ThreadPoolExecutor(max_workers=paralelo) as executor:
+        while ponto['pendentes']:
+            lote = [_item_de_json(dados) for dados in ponto['pendentes'][:LOTE]]
+
+            a_baixar = []
+            for item in lote:
+                if arquivo.buscar(fonte, item['link']) is not None:
+                    metricas.contar('recuperacao.ja_arquivados')
+                else:
+                    a_baixar.append(item)
+
+            registros = []
+            refazer = []
+            for item, registro in zip(a_baixar, executor.map(um, a_baixar)):
+                if registro:
+                    registros.append(registro)
+                elif item.get('descartado'):
+                    ponto['descartados'] += 1
+                else:
+                    tentativas = ponto['tentativas'].get(item['link'], 0) + 1
+                    ponto['tentativas'][item['link']] = tentativas
+                    if tentativas < MAX_TENTATIVAS:
+                        refazer.append(_item_para_json(item))
+                    else:
+                        ponto['falhas'].append(item['link'])
+                        metricas.contar('recuperacao.falhas')
+
+            # Lote inteiro numa transação; o checkpoint só avança depois de gravado
+            if registros:
+                ponto['arquivados'] += arquivo.arquivar(fonte, registros)
+                metricas.contar('recuperacao.arquivados', len(registros))
+            ponto['pendentes'] = ponto['pendentes'][len(lote):] + refazer
+            estado.gravar(_nome_ponto(fonte), ponto)
+            print(f"📰 {fonte}: +{len(registros)} notícia(s) arquivada(s), "
+                  f"{len(ponto['pendentes'])} pendente(s)")
+
+
+# ================= API =================
+def recuperar(fonte, inicio, fim, paralelo=PARALELO, intervalo=None, reiniciar=False, max_paginas=MAX_PAGINAS):
+    """
+    Recupera as notícias da fonte publicadas entre inicio e fim (datas
+    inclusivas, horário de Brasília). Retoma o checkpoint do mesmo período,
+    se houver. Retorna True quando o período foi concluído.
+    """
+    a = adaptador(fonte)
+    transporte.limitar(a['c']['URL_BASE'], intervalo or a['intervalo'])
+
+    ponto = {} if reiniciar else estado.ler(_nome_ponto(fonte))
+    if ponto.get('inicio') == inicio.isoformat() and ponto.get('fim') == fim.isoformat():
+        print(f"♻️  {fonte}: retomando ({ponto['paginas']} página(s) lidas, {len(ponto['pendentes'])} item(ns) pendente(s))")
+    else:
+        if ponto:
+            print(f"⚠️  {fonte}: checkpoint de outro período ({ponto.get('inicio')} a {ponto.get('fim')}) descartado")
+        ponto = _novo_ponto(inicio, fim)
+
+    if not ponto['listagem_concluida'] and not listar_periodo(a, ponto, inicio, fim, max_paginas):
+        print(f"❌ {fonte}: listagem falhou, rode de novo para continuar")
+        return False
+
+    detalhar_pendentes(a, ponto, inicio, fim, paralelo)
+    sem_derrubar('gerar feed paginado', feed_paginado.publicar, fonte, a['canal'])
+
+    print(f"✅ {fonte}: {ponto['arquivados']} notícia(s) nova(s)/alterada(s) no histórico, "
+          f"{ponto['descartados']} descartada(s) pelos filtros, {len(ponto['falhas'])} falha(s)")
+    for link in ponto['falhas'][:10]:
+        print(f"   ❌ {link}")
+    estado.remover(_nome_ponto(fonte))
+    return True
+
+
+# ================= MAIN =================
+if __name__ == "__main__":
+    opcoes = dict(arg[2:].split('=', 1) if '=' in arg else (arg[2:], True)
+                  for arg in sys.argv[1:] if arg.startswith('--'))
+    posicionais = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    datas = [arg for arg in posicionais if arg[:1].isdigit()]
+    selecionadas = [arg for arg in posicionais if not arg[:1].isdigit()]
+
+    if not selecionadas or not 1 <= len(datas) <= 2:
+        print("Uso: python recuperacao.py <fonte> [fonte ...] <AAAA-MM-DD> [AAAA-MM-DD] "
+              "[--paralelo=N] [--intervalo=S] [--paginas=N] [--reiniciar]")
+        sys.exit(1)
+
+    inicio_cli = date.fromisoformat(datas[0])
+    fim_cli = date.fromisoformat(datas[-1])
+    if fim_cli < inicio_cli:
+        inicio_cli, fim_cli = fim_cli, inicio_cli
+
+    def rodar(fonte_cli):
+        try:
+            return recuperar(fonte_cli, inicio_cli, fim_cli,
+                             paralelo=int(opcoes.get('paralelo', PARALELO)),
+                             intervalo=float(opcoes['intervalo']) if 'intervalo' in opcoes else None,
+                             reiniciar='reiniciar' in opcoes,
+                             max_paginas=int(opcoes.get('paginas', MAX_PAGINAS)))
+        except Exception as e:
+            print(f"❌ {fonte_cli}: {e}")
+            return False
+
+    print(f"🚀 Recuperação de {inicio_cli:%d/%m/%Y} a {fim_cli:%d/%m/%Y}: {', '.join(selecionadas)}")
+    print("=" * 60)
+    metricas.reiniciar()
+    # Uma thread por fonte: hosts diferentes não disputam o mesmo limite de ritmo
+    with ThreadPoolExecutor(max_workers=len(selecionadas)) as executor_fontes:
+        resultados = list(executor_fontes.map(rodar, selecionadas))
+    metricas.imprimir("Métricas da recuperação")
+    sys.exit(0 if all(resultados) else 1)
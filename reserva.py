@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+# reserva.py - Último conjunto bom de itens de cada fonte, reemitido quando a coleta falha
+#
+# Com o portal fora do ar, o upnewsfortaleza regravava o feed com um canal
+# "ERRO" e <ttl>5</ttl>, ou com um feed vazio quando a listagem não trazia
+# nada; o motor também publicava um feed sem itens. O WP Automatic e os
+# leitores viam os itens sumirem e passavam a consultar mais vezes.
+#
+# Aqui cada publicação bem-sucedida e válida guarda os <item> já
+# renderizados pelo próprio gerador da fonte (guardar), em
+# estado/<fonte>.reserva.json, e os links em estado/<fonte>.json. Quando a
+# coleta falha ou não traz nada, o feed é montado de novo com esses mesmos
+# <item>, byte a byte: nenhum item novo, nenhum item some ou muda de forma.
+# O canal leva a marca de desatualizado na descrição e o <ttl> normal.
+#
+# Sem itens guardados (estado de antes desta versão), os registros dos
+# links guardados vêm do histórico (arquivo.py) e são renderizados pelo
+# formato genérico de feed_paginado.py.
+#
+# Cada falha seguida também fica no estado (falhou); o agendador usa
+# espera() para tentar de novo antes do intervalo normal, com recuo
+# exponencial, enquanto o feed de reserva continua publicado.
+#
+# Uso:
+#   reserva.guardar('fortaleza', registros, itens_xml)            # após publicar
+#   reserva.falhou('fortaleza', 'portal fora do ar')              # coleta falhou
+#   reserva.publicar('fortaleza', FEED_FILE, canal, 'portal fora do ar')
+#   python reserva.py                                             # situação por fonte
+
+import os
+import sys
+from datetime import datetime, timezone
+
+import arquivo
+import estado
+import feed_paginado
+import notificacao
+import textoxml
+from modelo import FUSO_BRASILIA, CANAIS
+
+# ================= CONFIGURAÇÕES =================
+# Sem links guardados (fonte nova, estado perdido): os mais recentes do histórico
+LIMITE_SEM_ESTADO = 20
+
+# Nova tentativa depois de uma falha: 5, 10, 20... minutos, até o intervalo normal
+RETENTATIVA_MINUTOS = 5
+TTL = 60
+
+
+# ================= ESTADO =================
+def _nome_itens(fonte):
+    return f"{fonte}.reserva"
+
+
+def guardar(fonte, registros, itens=None):
+    """
+    Registra o conjunto publicado com sucesso (e zera as falhas seguidas).
+    itens: os <item> como foram gravados no feed, na mesma ordem.
+    """
+    if not registros:
+        return
+    if itens:
+        estado.gravar(_nome_itens(fonte), {
+            'itens': list(itens),
+            'ultima': max(r['publicado'] for r in registros).isoformat(),
+        })
+    dados = estado.ler(fonte)
+    dados['reserva'] = {
+        'links': [r['link'] for r in registros],
+        'gerado': datetime.now(FUSO_BRASILIA).isoformat(timespec='minutes'),
+    }
+    dados.pop('falhas', None)
+    estado.gravar(fonte, dados)
+
+
+def falhou(fonte, motivo):
+    """Conta mais uma falha seguida da fonte. Retorna quantas são."""
+    falhas = estado.ler(fonte).get('falhas') or {}
+    falhas = {
+        'seguidas': falhas.get('seguidas', 0) + 1,
+        'desde': falhas.get('desde') or datetime.now(FUSO_BRASILIA).isoformat(timespec='minutes'),
+        'motivo': str(motivo)[:200],
+    }
+    estado.atualizar(fonte, falhas=falhas)
+    return falhas['seguidas']
+
+
+def espera(fonte, minutos):
+    """Minutos até a próxima execução: recuo exponencial enquanto a fonte falha."""
+    seguidas = (estado.ler(fonte).get('falhas') or {}).get('seguidas', 0)
+    if not seguidas:
+        return minutos
+    return min(minutos, RETENTATIVA_MINUTOS * 2 ** (seguidas - 1))
+
+
+# ================= REEMISSÃO =================
+def registros(fonte):
+    """Itens da última publicação bem-sucedida, do histórico (mesma ordem)."""
+    guardado = estado.ler(fonte).get('reserva') or {}
+    if not guardado.get('links'):
+        return arquivo.recentes(fonte, LIMITE_SEM_ESTADO)
+    encontrados = (arquivo.buscar(fonte, link) for link in guardado['links'])
+    return [r for r in encontrados if r]
+
+
+def aviso(fonte, motivo):
+    """Descrição do canal com a marca de desatualizado."""
+    gerado = (estado.ler(fonte).get('reserva') or {}).get('gerado')
+    quando = datetime.fromisoformat(gerado).strftime('%d/%m %H:%M') if gerado else 'execução anterior'
+    return f"[desatualizado] Itens da última coleta bem-sucedida ({quando}); {motivo}"
+
+
+def _documento_itens(canal, guardados, ttl, atom=''):
+    """Feed com os <item> guardados, sem renderizar nada de novo."""
+    ultima = datetime.fromisoformat(guardados['ultima'])
+    partes = [
+        '<?xml version="1.0" encoding="UTF-8"?>',
+        '<rss version="2.0" xmlns:content="http://purl.org/rss/1.0/modules/content/" '
+        'xmlns:media="http://search.yahoo.com/mrss/">',
+        '<channel>',
+        f'<title>{textoxml.escapar(canal["titulo"])}</title>',
+        f'<link>{textoxml.escapar(canal["link"])}</link>',
+        f'<description>{textoxml.escapar(canal["descricao"])}</description>',
+        '<language>pt-br</language>',
+        # Data do item mais novo, não a de agora: reemissões seguidas ficam idênticas
+        f'<lastBuildDate>{ultima.astimezone(timezone.utc).strftime("%a, %d %b %Y %H:%M:%S +0000")}</lastBuildDate>',
+    ]
+    if ttl:
+        partes.append(f'<ttl>{ttl}</ttl>')
+    if atom:
+        partes.append(atom)
+    partes.extend(guardados['itens'])
+    partes.append('</channel>')
+    partes.append('</rss>')
+    return '\n'.join(partes)
+
+
+def documento(fonte, canal, motivo, ttl=TTL, arquivo_feed=None):
+    """Feed RSS de reserva (str), ou None se não há itens guardados."""
+    canal = dict(canal or CANAIS[fonte], descricao=aviso(fonte, motivo))
+    guardados = estado.ler(_nome_itens(fonte))
+    # Hub e self do WebSub, como no feed normal (notificacao.py)
+    if guardados.get('itens'):
+        return _documento_itens(canal, guardados, ttl, notificacao.links_atom(arquivo_feed) if arquivo_feed else '')
+    itens = registros(fonte)
+    if not itens:
+        return None
+    # Sem links de navegação (é o feed principal da fonte, não uma página do
+    # histórico); lastBuildDate é a data do item mais novo, não a de agora
+    links = notificacao.pares_atom(arquivo_feed) if arquivo_feed else []
+    return feed_paginado.renderizar_documento(canal, itens, links, False, ttl=ttl)
+
+
+def publicar(fonte, arquivo_feed, canal=None, motivo='coleta sem itens', ttl=TTL):
+    """Grava o feed de reserva em arquivo_feed. False se não há o que reemitir."""
+    try:
+        xml = documento(fonte, canal, motivo, ttl, arquivo_feed)
+    except Exception as e:
+        print(f"⚠️  Reserva indisponível: {e}")
+        return False
+    if xml is None:
+        print(f"ℹ️ Sem itens de reserva para {fonte}")
+        return False
+    notificacao.gravar_feed(fonte, arquivo_feed, xml)
+    print(f"🛟 Feed de reserva publicado em {arquivo_feed}: {xml.count('<item>')} item(ns) da última coleta boa")
+    return True
+
+
+# ================= MAIN =================
+if __name__ == "__main__":
+    if sys.argv[1:]:
+        nomes = sys.argv[1:]
+    elif os.path.isdir(estado.PASTA_ESTADO):
+        nomes = sorted(n[:-len('.json')] for n in os.listdir(estado.PASTA_ESTADO) if n.endswith('.json'))
+    else:
+        nomes = []
+    for nome in nomes:
+        dados = estado.ler(nome)
+        if nome.endswith('.reserva') or nome.endswith('.recuperacao'):
+            continue
+        guardado, falhas = dados.get('reserva') or {}, dados.get('falhas') or {}
+        if not guardado and not falhas:
+            continue
+        linha = f"🛟 {nome}: {len(guardado.get('links', []))} item(ns) de reserva (de {guardado.get('gerado', '?')})"
+        if falhas:
+            linha += f", {falhas['seguidas']} falha(s) seguida(s) desde {falhas['desde']}: {falhas['motivo']}"
+        print(linha)
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+# sanitizador.py - Limpeza de HTML por listas de permissão, em uma única passada
+#
+# Os scripts limpavam o conteúdo em várias passadas sobre a mesma árvore:
+# decompose por tag, find_all(True) comparando str(classes) com cada padrão,
+# outra passada reescrevendo atributos de img/a, find_all(class_=regex)...
+# Aqui as regras são compiladas uma vez (conjuntos congelados) e aplicadas
+# num único percurso da árvore:
+#
+#   - tags removidas com todo o conteúdo (script, style, ...);
+#   - elementos com classe bloqueada removidos, por palavras inteiras da
+#     classe: 'ad' pega "ad" e "google-ad", mas não "header" nem "loading";
+#     'social-share' pega "social-share-buttons";
+#   - atributos filtrados por tag (lista de permissão) ou removidos (padrão);
+#   - URLs de img/a absolutizadas (com suporte a lazy load) e normalizadas.
+#
+# Uso:
+#   REGRAS = sanitizador.regras(tags_removidas=[...], classes_bloqueadas=[...])
+#   sanitizador.sanitizar(no_bs4, REGRAS, url_da_pagina)
+
+import re
+from urllib.parse import urljoin
+
+from bs4 import Tag
+
+# ================= CONFIGURAÇÕES =================
+ATRIBUTOS_LAZY = ('src', 'data-src', 'data-lazy-src', 'data-original', 'data-actual-src')
+ESQUEMAS_PRESERVADOS = ('mailto:', 'tel:', 'javascript:', '#', 'data:')
+
+RE_QUEBRAS = re.compile(r'[\r\n]')
+
+
+# ================= FUNÇÕES =================
+def regras(tags_removidas=(), classes_bloqueadas=(), atributos=None, atributos_removidos=(),
+           atributos_url=None, atributos_fixos=None, normalizar_url=None):
+    """
+    Compila as regras de limpeza.
+
+    atributos: {tag: [permitidos]}; tags fora do dict mantêm tudo, exceto
+               atributos_removidos ('*' no dict vale para todas as outras tags).
+    atributos_url: {tag: atributo} cujos valores são absolutizados
+                   (em img, o primeiro de ATRIBUTOS_LAZY que tiver URL real).
+    atributos_fixos: {tag: {atributo: valor}} aplicados depois da filtragem.
+    normalizar_url: função aplicada a toda URL absolutizada.
+    """
+    atributos = atributos or {}
+    return {
+        'tags_removidas': frozenset(tags_removidas),
+        'classes_bloqueadas': _expressao_classes(classes_bloqueadas),
+        'atributos': {tag: frozenset(lista) for tag, lista in atributos.items() if tag != '*'},
+        'atributos_padrao': frozenset(atributos['*']) if '*' in atributos else None,
+        'atributos_removidos': frozenset(atributos_removidos),
+        'atributos_url': dict(atributos_url if atributos_url is not None else {'img': 'src', 'a': 'href'}),
+        'atributos_fixos': dict(atributos_fixos or {}),
+        'normalizar_url': normalizar_url,
+    }
+
+
+def _expressao_classes(classes):
+    """Uma única expressão para todas as classes bloqueadas, casando palavras inteiras (separadas por - ou _)."""
+    nomes = sorted({c.lower() for c in classes}, key=len, reverse=True)
+    if not nomes:
+        return None
+    return re.compile(r'(?:^|[-_])(?:' + '|'.join(map(re.escape, nomes)) + r')(?:$|[-_])', re.I)
+
+
+def classe_bloqueada(classes, expressao):
+    """True se alguma das classes do elemento casa com a expressão de bloqueio."""
+    if expressao is None or not classes:
+        return False
+    if isinstance(classes, str):
+        classes = classes.split()
+    return any(expressao.search(classe) for classe in classes)
+
+
+def absolutizar(url, base, normalizar=None):
+    """URL absoluta e sem quebras de linha (esquemas especiais ficam como estão)."""
+    url = RE_QUEBRAS.sub('', url.strip())
+    if url.startswith(ESQUEMAS_PRESERVADOS):
+        return url
+    if url.startswith('//'):
+        url = 'https:' + url
+    elif not url.startswith(('http://', 'https://')):
+        url = urljoin(base, url)
+    return normalizar(url) if normalizar else url
+
+
+def _url_da_imagem(tag):
+    for atributo in ATRIBUTOS_LAZY:
+        valor = tag.get(atributo)
+        if valor and not valor.startswith('data:'):
+            return valor
+    return tag.get('src')
+
+
+def _atributos(tag, r, base):
+    """Absolutiza a URL e filtra os atributos de uma tag."""
+    nome = tag.name
+    atributo_url = r['atributos_url'].get(nome)
+    if atributo_url:
+        # Antes da filtragem: o lazy load guarda a URL real em data-*
+        valor = _url_da_imagem(tag) if nome == 'img' else tag.get(atributo_url)
+        if valor:
+            tag[atributo_url] = absolutizar(valor, base, r['normalizar_url'])
+
+    permitidos = r['atributos'].get(nome, r['atributos_padrao'])
+    if permitidos is not None:
+        tag.attrs = {k: v for k, v in tag.attrs.items() if k in permitidos}
+    elif r['atributos_removidos'] and not r['atributos_removidos'].isdisjoint(tag.attrs):
+        tag.attrs = {k: v for k, v in tag.attrs.items() if k not in r['atributos_removidos']}
+
+    if nome in r['atributos_fixos']:
+        tag.attrs.update(r['atributos_fixos'][nome])
+
+
+def sanitizar(raiz, r, base=''):
+    """
+    Aplica as regras `r` (ver regras()) a `raiz` e a todos os descendentes,
+    num único percurso. Modifica a árvore no lugar e devolve `raiz`.
+    A própria raiz só tem os atributos filtrados (nunca é removida).
+    """
+    tags_removidas = r['tags_removidas']
+    bloqueadas = r['classes_bloqueadas']
+
+    if raiz.name != '[document]':
+        _atributos(raiz, r, base)
+
+    pilha = [raiz]
+    while pilha:
+        no = pilha.pop()
+        for filho in list(no.children):
+            if not isinstance(filho, Tag):
+                continue
+            if filho.name in tags_removidas or classe_bloqueada(filho.get('class'), bloqueadas):
+                filho.decompose()
+                continue
+            _atributos(filho, r, base)
+            if filho.contents:
+                pilha.append(filho)
+    return raiz
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+# textoxml.py - Texto seguro para XML: controles, escapes e CDATA
+#
+# Cada script tinha a sua versão: cinco .replace encadeados seguidos de um
+# gerador caractere a caractere (char.isprintable()) por parágrafo, um regex
+# corrigindo '&' soltos, CDATA montado sem tratar ']]>' no conteúdo...
+#
+# Aqui as tabelas são calculadas uma vez, na importação:
+#   - TABELA_XML:   caracteres proibidos em XML 1.0 (C0 exceto \t \n \r,
+#                   DEL e C1, surrogates soltos, U+FFFE/U+FFFF) -> removidos;
+#   - TABELA_TEXTO: a anterior + invisíveis que só atrapalham em título e
+#                   resumo (zero-width, marcas de direção, BOM) e NBSP -> espaço.
+#
+# str.translate com tabela-dicionário sai do caminho rápido do CPython assim
+# que o texto tem acento (ou seja, sempre, em português) e fica mais lento que
+# o laço antigo. Por isso cada tabela vem acompanhada de uma classe de
+# caracteres compilada dos mesmos códigos: a varredura é feita pelo regex (em
+# C) e o translate só roda nos raros textos que têm algo a remover. Os escapes
+# ficam em .replace encadeados, que também rodam em C.
+#
+# limpar() aceita documentos inteiros: uma varredura por feed gerado.
+#
+# Uso:
+#   textoxml.escapar(titulo)          -> texto para elemento/atributo
+#   textoxml.cdata(html_do_conteudo)  -> '<![CDATA[...]]>' com ']]>' dividido
+#   textoxml.limpar(xml_final)        -> documento sem caracteres proibidos
+
+import re
+
+# ================= TABELAS =================
+_PROIBIDOS = (
+    [c for c in range(0x20) if c not in (0x09, 0x0A, 0x0D)]
+    + list(range(0x7F, 0xA0))
+    + list(range(0xD800, 0xE000))
+    + [0xFFFE, 0xFFFF]
+)
+
+_INVISIVEIS = (
+    list(range(0x200B, 0x2010))     # zero-width, LRM/RLM
+    + list(range(0x202A, 0x202F))   # embeddings/overrides de direção
+    + list(range(0x2060, 0x2065))   # word joiner e invisíveis matemáticos
+    + [0xFEFF, 0x00AD]              # BOM no meio do texto, hífen opcional
+)
+
+TABELA_XML = dict.fromkeys(_PROIBIDOS)
+TABELA_TEXTO = {**TABELA_XML, **dict.fromkeys(_INVISIVEIS), 0x00A0: ' '}
+
+
+def _classe(codigos):
+    """Classe de regex ([...]) com os códigos agrupados em faixas."""
+    faixas = []
+    for c in sorted(codigos):
+        if faixas and c == faixas[-1][1] + 1:
+            faixas[-1][1] = c
+        else:
+            faixas.append([c, c])
+    return re.compile('[' + ''.join(
+        re.escape(chr(a)) if a == b else f'{re.escape(chr(a))}-{re.escape(chr(b))}'
+        for a, b in faixas
+    ) + ']')
+
+
+RE_XML = _classe(TABELA_XML)
+RE_TEXTO = _classe(TABELA_TEXTO)
+
+
+# ================= FUNÇÕES =================
+def limpar(texto):
+    """Remove caracteres proibidos em XML 1.0 (serve para o documento inteiro)."""
+    if not texto:
+        return ''
+    if RE_XML.search(texto):
+        texto = texto.translate(TABELA_XML)
+    return texto
+
+
+def escapar(texto, aspas=True):
+    """Escapa & < > (e aspas) e remove controles e invisíveis, para texto em elemento ou atributo."""
+    if not texto:
+        return ''
+    if RE_TEXTO.search(texto):
+        texto = texto.translate(TABELA_TEXTO)
+    texto = texto.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
+    if aspas:
+        texto = texto.replace('"', '&quot;').replace("'", '&apos;')
+    return texto
+
+
+def cdata(texto):
+    """Seção CDATA com o texto limpo; ']]>' no conteúdo é dividido entre duas seções."""
+    return '<![CDATA[' + limpar(texto).replace(']]>', ']]]]><![CDATA[>') + ']]>'
@@ -0,0 +1,326 @@
+#!/usr/bin/env python3
+# transporte.py - Sessão HTTP compartilhada por todas as fontes
+#
+# Uma única requests.Session por processo: no modo daemon (agendador.py) as
+# conexões keep-alive e as sessões TLS continuam abertas entre execuções, em
+# vez de cada script abrir conexões novas a cada chamada de requests.get.
+#
+# Toda requisição passa por um limite opcional de ritmo por host: com
+# limitar('host', 1.5), duas requisições ao mesmo host ficam separadas por
+# pelo menos 1,5 s, não importa quantas threads estejam baixando (usado pela
+# recuperação histórica, que baixa em paralelo).
+#
+# Toda resposta (ou erro) também entra no histórico de latência do host
+# (latencia.py), e o timeout pedido pelo script é ajustado pelo que o host
+# costuma levar: um host que responde em 400 ms não faz ninguém esperar 30 s.
+#
+# Além do pool keep-alive:
+#   - configurar(host, verificar=False, conexoes=8): verificação TLS e tamanho
+#     do pool decididos por host, num lugar só (em vez de verify=False em cada
+#     chamada ou de um contexto SSL sem verificação para o processo inteiro);
+#   - cache de DNS (DNS_TTL) para conexões novas do pool da sessão (as
+#     classes de conexão do adaptador; o resto do processo não é afetado);
+#   - dois contextos TLS compartilhados (com e sem verificação) que retomam
+#     a sessão TLS do host numa conexão nova, sem handshake completo;
+#   - gzip/deflate sempre negociados.
+# As métricas transporte.* e tls.* mostram requisições x conexões abertas,
+# consultas de DNS evitadas, handshakes x sessões retomadas e bytes na rede
+# x bytes de conteúdo.
+
+import socket
+import ssl
+import threading
+import time
+from urllib.parse import urlsplit
+
+import requests
+import urllib3
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import ConnectTimeoutError
+from urllib3.util.ssl_ import create_urllib3_context
+
+import latencia
+import metricas
+
+# ================= CONFIGURAÇÕES =================
+CONEXOES_POR_HOST = 4
+HOSTS_EM_POOL = 16
+DNS_TTL = 300
+ACEITAR_CODIFICACAO = 'gzip, deflate'
+
+_sessao = None
+
+# host -> intervalo mínimo entre requisições (s); host -> próximo instante livre
+_intervalos = {}
+_liberado = {}
+_trava = threading.Lock()
+
+# host -> {'verificar': bool, 'conexoes': int}
+_hosts = {}
+
+# (host, porta) -> (expira_em, [endereços])
+_dns = {}
+
+# (verificar, host) -> última sessão TLS vista
+_sessoes_tls = {}
+
+
+def _nome_host(host):
+    return ((urlsplit(host).hostname or host) if '/' in host else host).lower()
+
+
+# ================= LIMITE POR HOST =================
+def limitar(host, intervalo):
+    """Intervalo mínimo (segundos) entre requisições ao host. 0 ou None remove o limite."""
+    host = _nome_host(host)
+    with _trava:
+        if intervalo:
+            _intervalos[host] = float(intervalo)
+        else:
+            _intervalos.pop(host, None)
+
+
+def aguardar_vez(url):
+    """Bloqueia até a vez desta requisição no ritmo do host. Retorna a espera (s)."""
+    host = (urlsplit(url).hostname or '').lower()
+    with _trava:
+        intervalo = _intervalos.get(host)
+        if not intervalo:
+            return 0.0
+        agora = time.monotonic()
+        vez = max(agora, _liberado.get(host, 0.0))
+        _liberado[host] = vez + intervalo
+    espera = vez - agora
+    if espera > 0:
+        metricas.adicionar_tempo('transporte.espera_host', espera)
+        time.sleep(espera)
+    return espera
+
+
+# ================= CONFIGURAÇÃO POR HOST =================
+def configurar(host, verificar=None, conexoes=None):
+    """
+    Opções de um host (aceita URL): verificar=False desliga a verificação TLS
+    só para ele; conexoes=N dá ao host um pool próprio com N conexões.
+    """
+    host = _nome_host(host)
+    with _trava:
+        opcoes = _hosts.setdefault(host, {'verificar': True, 'conexoes': CONEXOES_POR_HOST})
+        if verificar is not None:
+            opcoes['verificar'] = bool(verificar)
+        novo_pool = bool(conexoes) and conexoes > opcoes['conexoes']
+        if novo_pool:
+            opcoes['conexoes'] = conexoes
+    if verificar is False:
+        urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+    if novo_pool and _sessao is not None:
+        _montar_host(_sessao, host, conexoes)
+
+
+def _verificar(host):
+    opcoes = _hosts.get(host)
+    return opcoes['verificar'] if opcoes else True
+
+
+# ================= DNS =================
+def _resolver(host, porta):
+    agora = time.monotonic()
+    entrada = _dns.get((host, porta))
+    if entrada and entrada[0] > agora:
+        metricas.contar('transporte.dns_cache')
+        return entrada[1]
+    metricas.contar('transporte.dns_consultas')
+    enderecos = []
+    for _, _, _, _, endereco in socket.getaddrinfo(host, porta, 0, socket.SOCK_STREAM):
+        if endereco[0] not in enderecos:
+            enderecos.append(endereco[0])
+    _dns[(host, porta)] = (agora + DNS_TTL, enderecos)
+    return enderecos
+
+
+def _conectar(conexao, criar):
+    """
+    _new_conn do urllib3 com o DNS em cache: conecta a cada endereço guardado
+    do host (SNI e certificado continuam seguindo o nome). Sem endereço em
+    cache, é o _new_conn original, que resolve o nome ele mesmo.
+    """
+    nome, porta = conexao._dns_host, conexao.port
+    metricas.contar('transporte.conexoes')
+    try:
+        enderecos = _resolver(nome, porta)
+    except OSError:
+        enderecos = []
+    if not enderecos:
+        return criar(conexao)
+    erro = None
+    try:
+        for ip in enderecos:
+            conexao._dns_host = ip
+            try:
+                return criar(conexao)
+            except ConnectTimeoutError as e:   # inclui NewConnectionError
+                erro = e
+    finally:
+        conexao._dns_host = nome
+    _dns.pop((nome, porta), None)
+    raise erro
+
+
+class _ConexaoHTTP(HTTPConnection):
+    def _new_conn(self):
+        return _conectar(self, HTTPConnection._new_conn)
+
+
+class _ConexaoHTTPS(HTTPSConnection):
+    def _new_conn(self):
+        return _conectar(self, HTTPSConnection._new_conn)
+
+
+class _PoolHTTP(HTTPConnectionPool):
+    ConnectionCls = _ConexaoHTTP
+
+
+class _PoolHTTPS(HTTPSConnectionPool):
+    ConnectionCls = _ConexaoHTTPS
+
+
+_POOLS_DNS = {'http': _PoolHTTP, 'https': _PoolHTTPS}
+
+
+# ================= TLS =================
+def _contexto_tls(verificar):
+    """Contexto compartilhado que retoma a última sessão TLS de cada host."""
+    if verificar:
+        contexto = create_urllib3_context(cert_reqs=ssl.CERT_REQUIRED)
+        contexto.load_default_certs()
+    else:
+        contexto = create_urllib3_context(cert_reqs=ssl.CERT_NONE)
+    embrulhar = contexto.wrap_socket
+
+    def wrap_socket(sock, *args, server_hostname=None, **kwargs):
+        chave = (verificar, server_hostname)
+        anterior = _sessoes_tls.get(chave)
+        if anterior is not None:
+            kwargs['session'] = anterior
+        try:
+            seguro = embrulhar(sock, *args, server_hostname=server_hostname, **kwargs)
+        except ssl.SSLError:
+            # Sessão recusada: a próxima conexão faz o handshake completo
+            _sessoes_tls.pop(chave, None)
+            raise
+        metricas.contar('tls.handshakes')
+        if seguro.session_reused:
+            metricas.contar('tls.sessoes_retomadas')
+        return seguro
+
+    contexto.wrap_socket = wrap_socket
+    return contexto
+
+
+_CONTEXTOS = {True: _contexto_tls(True), False: _contexto_tls(False)}
+
+
+def _guardar_sessao_tls(resposta, verificar):
+    # Com TLS 1.3 o ticket só chega depois do handshake: com os cabeçalhos da
+    # resposta já lidos, a sessão pode ser guardada para a próxima conexão
+    conexao = getattr(resposta.raw, '_connection', None)
+    sessao_tls = getattr(getattr(conexao, 'sock', None), 'session', None)
+    if sessao_tls is not None:
+        _sessoes_tls[(verificar, (urlsplit(resposta.url).hostname or '').lower())] = sessao_tls
+
+
+# ================= ADAPTADOR =================
+def _adaptador_limitado(**opcoes):
+    adaptador = HTTPAdapter(**opcoes)
+    enviar = adaptador.send
+    atributos_pool = adaptador.build_connection_pool_key_attributes
+    iniciar_pool = adaptador.init_poolmanager
+
+    def init_poolmanager(*args, **kwargs):
+        # Cache de DNS só nas conexões deste adaptador, não no urllib3 do processo
+        iniciar_pool(*args, **kwargs)
+        adaptador.poolmanager.pool_classes_by_scheme = _POOLS_DNS
+
+    def build_connection_pool_key_attributes(requisicao, verify, cert=None):
+        parametros, opcoes_pool = atributos_pool(requisicao, verify, cert)
+        # Só com verify booleano (sem CA própria) o contexto compartilhado serve
+        if parametros['scheme'] == 'https' and isinstance(verify, bool):
+            opcoes_pool['ssl_context'] = _CONTEXTOS[verify]
+        return parametros, opcoes_pool
+
+    def send(requisicao, **kwargs):
+        host = (urlsplit(requisicao.url).hostname or '').lower()
+        if not _verificar(host):
+            kwargs['verify'] = False
+        if 'Accept-Encoding' not in requisicao.headers:
+            requisicao.headers['Accept-Encoding'] = ACEITAR_CODIFICACAO
+        aguardar_vez(requisicao.url)
+        kwargs['timeout'] = latencia.timeout(requisicao.url, kwargs.get('timeout'))
+        metricas.contar('transporte.requisicoes')
+        inicio = time.monotonic()
+        try:
+            resposta = enviar(requisicao, **kwargs)
+        except requests.RequestException:
+            latencia.registrar(requisicao.url, time.monotonic() - inicio, ok=False)
+            raise
+        latencia.registrar(requisicao.url, resposta.elapsed.total_seconds(), ok=resposta.status_code < 500)
+        verificar = kwargs.get('verify', True)
+        if requisicao.url.startswith('https:') and isinstance(verificar, bool):
+            _guardar_sessao_tls(resposta, verificar)
+        return resposta
+
+    adaptador.build_connection_pool_key_attributes = build_connection_pool_key_attributes
+    adaptador.send = send
+    adaptador.init_poolmanager = init_poolmanager
+    adaptador.poolmanager.pool_classes_by_scheme = _POOLS_DNS
+    return adaptador
+
+
+def _montar_host(sessao_http, host, conexoes):
+    adaptador = _adaptador_limitado(pool_connections=1, pool_maxsize=conexoes)
+    sessao_http.mount(f'https://{host}/', adaptador)
+    sessao_http.mount(f'http://{host}/', adaptador)
+
+
+def _contar_bytes(sessao_http):
+    enviar = sessao_http.send
+
+    def send(requisicao, **kwargs):
+        resposta = enviar(requisicao, **kwargs)
+        # Sem stream o corpo já foi lido: bytes na rede (comprimidos) x conteúdo
+        if not kwargs.get('stream') and hasattr(resposta.raw, 'tell'):
+            metricas.contar('transporte.bytes_rede', resposta.raw.tell())
+            metricas.contar('transporte.bytes_conteudo', len(resposta.content or b''))
+        return resposta
+
+    sessao_http.send = send
+
+
+# ================= FUNÇÕES =================
+def sessao():
+    """Retorna a sessão compartilhada (criada na primeira chamada)."""
+    global _sessao
+    with _trava:
+        if _sessao is None:
+            nova = requests.Session()
+            nova.headers['Accept-Encoding'] = ACEITAR_CODIFICACAO
+            adaptador = _adaptador_limitado(pool_connections=HOSTS_EM_POOL, pool_maxsize=CONEXOES_POR_HOST)
+            nova.mount('https://', adaptador)
+            nova.mount('http://', adaptador)
+            for host, opcoes in _hosts.items():
+                if opcoes['conexoes'] > CONEXOES_POR_HOST:
+                    _montar_host(nova, host, opcoes['conexoes'])
+            _contar_bytes(nova)
+            _sessao = nova
+    return _sessao
+
+
+def fechar():
+    """Fecha todas as conexões do pool (usado ao encerrar o daemon)."""
+    global _sessao
+    if _sessao is not None:
+        _sessao.close()
+        _sessao = None
+    latencia.salvar()
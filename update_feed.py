@@ -4,7 +4,6 @@ FEED RSS 2.0 - VERSÃO COM IMAGENS GARANTIDAS
 Garante imagem destacada para todas as notícias
 """
 
-import requests
 import xml.etree.ElementTree as ET
 from datetime import datetime, timezone
 import os
@@ -14,6 +13,16 @@ import html
 import hashlib
 import time
 
+import arquivo
+import classificador
+import feed_paginado
+import jsonfeed
+import notificacao
+import textoxml
+import transporte
+import validador
+from modelo import novo_registro, sem_derrubar
+
 def criar_feed_com_imagens_garantidas():
     """Cria feed RSS com imagens destacadas garantidas"""
     
@@ -41,7 +50,7 @@ def criar_feed_com_imagens_garantidas():
     try:
         # Buscar notícias
         print("📡 Buscando notícias...")
-        response = requests.get(API_URL, params={
+        response = transporte.sessao().get(API_URL, params={
             "per_page": 10,
             "orderby": "date",
             "order": "desc",
@@ -72,7 +81,11 @@ def criar_feed_com_imagens_garantidas():
         last_build = datetime.now(timezone.utc).strftime("%a, %d %b %Y %H:%M:%S +0000")
         xml_lines.append(f'    <lastBuildDate>{last_build}</lastBuildDate>')
         xml_lines.append('    <ttl>30</ttl>')
-        xml_lines.append('    <atom:link href="https://thecrossnow.github.io/feed-leg-ftz/feed.xml" rel="self" type="application/rss+xml" />')
+        # Com WEBSUB_HUB, hub e self (notificacao.py); sem ele, só o self de sempre
+        xml_lines.append(notificacao.links_atom(FEED_FILE) or
+                         '    <atom:link href="https://thecrossnow.github.io/feed-leg-ftz/feed.xml" rel="self" type="application/rss+xml" />')
+        
+        registros = []
         
         # Processar cada notícia
         for i, item in enumerate(noticias, 1):
@@ -146,28 +159,10 @@ def criar_feed_com_imagens_garantidas():
             # 3. SE AINDA NÃO TIVER, USAR IMAGEM TEMÁTICA
             # ====================================================
             if not imagem_url:
-                titulo_lower = titulo_raw.lower()
-                conteudo_lower = conteudo_raw.lower()
-                
-                # Determinar tema da notícia
-                if any(p in titulo_lower or p in conteudo_lower for p in ['transporte', 'uber', '99', 'motocicleta', 'ônibus']):
-                    imagem_url = IMAGENS_TEMATICAS['transporte']
-                elif any(p in titulo_lower or p in conteudo_lower for p in ['educação', 'escola', 'professor', 'aluno']):
-                    imagem_url = IMAGENS_TEMATICAS['educacao']
-                elif any(p in titulo_lower or p in conteudo_lower for p in ['saúde', 'hospital', 'médico', 'vacina']):
-                    imagem_url = IMAGENS_TEMATICAS['saude']
-                elif any(p in titulo_lower or p in conteudo_lower for p in ['sessão', 'plenário', 'vereador', 'votação']):
-                    imagem_url = IMAGENS_TEMATICAS['sessao']
-                elif any(p in titulo_lower or p in conteudo_lower for p in ['projeto', 'lei', 'regulamenta', 'aprova']):
-                    imagem_url = IMAGENS_TEMATICAS['projeto']
-                elif any(p in titulo_lower or p in conteudo_lower for p in ['cultura', 'evento', 'música', 'teatro']):
-                    imagem_url = IMAGENS_TEMATICAS['cultura']
-                elif any(p in titulo_lower or p in conteudo_lower for p in ['esporte', 'arena', 'atleta', 'jogo']):
-                    imagem_url = IMAGENS_TEMATICAS['esporte']
-                else:
-                    imagem_url = IMAGENS_TEMATICAS['default']
+                tema, confianca = classificador.classificar(titulo_raw, conteudo_raw)
+                imagem_url = IMAGENS_TEMATICAS.get(tema) or IMAGENS_TEMATICAS['default']
                 
-                print(f"      🎨 Usando imagem temática")
+                print(f"      🎨 Usando imagem temática: {tema or 'default'} ({confianca:.0%})")
             
             # ====================================================
             # 4. PREPARAR CONTEÚDO
@@ -177,7 +172,7 @@ def criar_feed_com_imagens_garantidas():
             texto = html.unescape(texto)
             texto = ' '.join(texto.split())
             descricao = (texto[:250] + "...") if len(texto) > 250 else texto
-            descricao = html.escape(descricao)
+            descricao = textoxml.escapar(descricao)
             
             # Preparar conteúdo para CDATA
             conteudo_limpo = conteudo_raw
@@ -185,11 +180,6 @@ def criar_feed_com_imagens_garantidas():
             conteudo_limpo = conteudo_limpo.replace(':8080', '')
             conteudo_limpo = conteudo_limpo.replace('"', '"').replace('"', '"')
             
-            if ']]>' in conteudo_limpo:
-                conteudo_limpo = conteudo_limpo.replace(']]>', ']]]]><![CDATA[>')
-            
-            conteudo_limpo = re.sub(r'&(?!(?:[a-zA-Z]+|#\d+);)', '&amp;', conteudo_limpo)
-            
             # ====================================================
             # 5. ADICIONAR AO XML COM MÚLTIPLOS FORMATOS DE IMAGEM
             # ====================================================
@@ -198,7 +188,7 @@ def criar_feed_com_imagens_garantidas():
             guid_unico = f"cmfor-img-{guid_hash}"
             
             xml_lines.append('    <item>')
-            xml_lines.append(f'      <title>{html.escape(titulo_raw)}</title>')
+            xml_lines.append(f'      <title>{textoxml.escapar(titulo_raw)}</title>')
             xml_lines.append(f'      <link>{link}</link>')
             xml_lines.append(f'      <guid>{guid_unico}</guid>')
             
@@ -207,21 +197,27 @@ def criar_feed_com_imagens_garantidas():
             
             # FORMATO 2: media:content (padrão Media RSS)
             xml_lines.append(f'      <media:content url="{imagem_url}" medium="image" type="image/jpeg">')
-            xml_lines.append(f'        <media:title type="plain">{html.escape(titulo_raw[:100])}</media:title>')
+            xml_lines.append(f'        <media:title type="plain">{textoxml.escapar(titulo_raw[:100])}</media:title>')
             xml_lines.append(f'        <media:description type="plain">{descricao[:200]}</media:description>')
             xml_lines.append(f'        <media:thumbnail url="{imagem_url}" />')
             xml_lines.append('      </media:content>')
             
             # FORMATO 3: Inserir imagem no início do conteúdo (para garantia)
-            conteudo_com_imagem_no_inicio = f'<p><img src="{imagem_url}" alt="{html.escape(titulo_raw)}" style="max-width: 100%; height: auto; margin-bottom: 20px;" /></p>\n{conteudo_limpo}'
+            conteudo_com_imagem_no_inicio = f'<p><img src="{imagem_url}" alt="{textoxml.escapar(titulo_raw)}" style="max-width: 100%; height: auto; margin-bottom: 20px;" /></p>\n{conteudo_limpo}'
             
             if pub_date_str:
                 xml_lines.append(f'      <pubDate>{pub_date_str}</pubDate>')
             
             xml_lines.append(f'      <description>{descricao}</description>')
-            xml_lines.append(f'      <content:encoded><![CDATA[{conteudo_com_imagem_no_inicio}]]></content:encoded>')
+            xml_lines.append(f'      <content:encoded>{textoxml.cdata(conteudo_com_imagem_no_inicio)}</content:encoded>')
             xml_lines.append('    </item>')
             
+            registros.append(novo_registro(
+                'cmfor', html.unescape(titulo_raw), link, pub_date,
+                conteudo=conteudo_com_imagem_no_inicio, imagem=imagem_url,
+                resumo=html.unescape(descricao)
+            ))
+            
             print(f"      📸 Imagem: {imagem_url.split('/')[-1][:40]}...")
         
         xml_lines.append('  </channel>')
@@ -233,34 +229,23 @@ def criar_feed_com_imagens_garantidas():
         if ']]>' in xml_final and '<![CDATA[' not in xml_final:
             xml_final = xml_final.replace(']]>', '')
         
-        # Salvar
-        with open(FEED_FILE, "w", encoding="utf-8") as f:
-            f.write(xml_final)
+        # Validação em memória, antes de gravar
+        resultado = validador.validar('cmfor', registros, xml_final, exigir_imagem=True)
+        validador.exigir_publicavel(resultado)
+        
+        # Salvar (hub/webhook só são avisados se o conjunto de itens mudou)
+        notificacao.gravar_feed('cmfor', FEED_FILE, xml_final)
         
         file_size = os.path.getsize(FEED_FILE)
         print(f"\n✅ Feed salvo: {FEED_FILE} ({file_size:,} bytes)")
         
-        # Verificação
-        print("\n🔍 VERIFICAÇÃO DE IMAGENS:")
-        with open(FEED_FILE, "r", encoding="utf-8") as f:
-            content = f.read()
-            
-            print(f"   📸 Enclosures: {content.count('<enclosure')}/10")
-            print(f"   🖼️  Media content: {content.count('<media:content')}/10")
-            print(f"   🖼️  Imagens no conteúdo: {len(re.findall(r'<img[^>]+src=', content))}")
-            
-            # Verificar se TODAS as notícias têm enclosure
-            lines = content.split('\n')
-            items = [i for i, line in enumerate(lines) if '<item>' in line]
-            
-            for idx, item_line in enumerate(items, 1):
-                # Verificar se este item tem enclosure
-                item_content = '\n'.join(lines[item_line:item_line+30])
-                has_enclosure = '<enclosure' in item_content
-                has_media = '<media:content' in item_content
-                
-                status = "✅" if has_enclosure and has_media else "❌"
-                print(f"   {status} Notícia {idx}: {'Tem imagem' if has_enclosure else 'SEM IMAGEM'}")
+        sem_derrubar('gerar JSON Feed', jsonfeed.gravar, 'cmfor', registros)
+        sem_derrubar('gravar histórico', arquivo.arquivar, 'cmfor', registros)
+        sem_derrubar('gerar feed paginado', feed_paginado.publicar, 'cmfor')
+        
+        # Verificação (enclosure em todos os itens, XML bem formado, datas)
+        print()
+        validador.imprimir(resultado)
         
         print("\n" + "=" * 70)
         print("🎉 FEED COM IMAGENS GARANTIDAS!")
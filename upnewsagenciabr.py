@@ -10,6 +10,27 @@ from urllib.parse import urljoin, quote
 import xml.etree.ElementTree as ET
 from xml.dom import minidom
 
+try:
+    from lxml import etree as iterxml
+except ImportError:
+    iterxml = ET
+
+import arquivo
+import cache_extracao
+import cadencia
+import codificacao
+import espelho
+import feed_paginado
+import fragmentos
+import jsonfeed
+import leitura_parcial
+import notificacao
+import sanitizador
+import textoxml
+import transporte
+import validador
+from modelo import novo_registro, sem_derrubar
+
 # ================= CONFIG =================
 
 RSS_URL = "https://agenciabrasil.ebc.com.br/rss/ultimasnoticias/feed.xml"
@@ -21,10 +42,39 @@ HEADERS = {
     "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
 }
 
+# Incrementar ao mudar extrair_da_pagina: invalida o cache de extração
+VERSAO_EXTRATOR = 2
+
+# Incrementar ao mudar _item_wxr: invalida o cache de fragmentos. O post_id
+# (posição no feed) e o pubDate (hora da geração) mudam a cada execução sem a
+# notícia mudar: o fragmento guarda estas marcas e elas são trocadas na montagem
+VERSAO_WXR = 1
+MARCA_POST_ID = '__POST_ID__'
+MARCA_PUBDATE = '__PUBDATE__'
+
+# Download da matéria para quando o primeiro <article> fecha (ver leitura_parcial.py)
+FIM_CONTEUDO = ['article']
+
+# Tags e classes descartadas do corpo da matéria (ver sanitizador.py); os
+# atributos ficam, porque o conteúdo é remontado elemento a elemento depois
+REGRAS_CONTEUDO = sanitizador.regras(
+    tags_removidas=["script", "style", "iframe", "aside", "nav",
+                    "header", "footer", "form", "button", "input",
+                    "select", "textarea"],
+    classes_bloqueadas=["ad", "ads", "banner", "publicidade", "propaganda", "widget",
+                        "related", "share", "social", "comentario", "comentarios",
+                        "comment", "comments", "meta", "footer", "header", "navigation"],
+    atributos_url={},
+)
+
 # Configurações WordPress
 WP_CATEGORY = "Notícias"
 WP_AUTHOR = "Agência Brasil"
 
+# Itens seguidos fora da janela de datas antes de parar a leitura do RSS
+# (o feed vem do mais novo para o mais antigo; a folga cobre pequenas inversões)
+MAX_FORA_DA_JANELA = 3
+
 # ================= DATAS =================
 
 HOJE = date.today()
@@ -63,20 +113,8 @@ def limpar_texto_para_elemento(texto):
     # Preservar parágrafos
     texto = re.sub(r'\n{3,}', '\n\n', texto)
 
-    # Escapar XML
-    texto = texto.replace('&', '&amp;')
-    texto = texto.replace('<', '&lt;')
-    texto = texto.replace('>', '&gt;')
-    texto = texto.replace('"', '&quot;')
-    texto = texto.replace("'", '&apos;')
-
-    # Remover caracteres de controle
-    texto = ''.join(
-        char for char in texto
-        if char.isprintable() or char in '\n\r\t'
-    )
-
-    return texto.strip()
+    # Escapar XML e remover caracteres de controle
+    return textoxml.escapar(texto).strip()
 
 def parse_rss_date(pubdate):
     """
@@ -92,17 +130,72 @@ def parse_rss_date(pubdate):
         # Usar data atual como fallback
         return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
+def ler_itens_rss(fluxo, datas):
+    """
+    Lê o RSS em streaming (iterparse) e devolve só título, link e pubDate dos
+    itens dentro de `datas`. Cada <item> é descartado assim que lido, e a
+    leitura para quando o feed passa da janela de datas.
+    """
+    fora_da_janela = 0
+    for _, elemento in iterxml.iterparse(fluxo, events=("end",)):
+        if elemento.tag.rsplit('}', 1)[-1] != "item":
+            continue
+
+        campos = {filho.tag.rsplit('}', 1)[-1]: (filho.text or "").strip() for filho in elemento}
+
+        # Liberar o item (e, no lxml, os irmãos já processados)
+        elemento.clear()
+        if hasattr(elemento, "getprevious"):
+            while elemento.getprevious() is not None:
+                del elemento.getparent()[0]
+
+        if not campos.get("link"):
+            continue
+
+        data_noticia_str = parse_rss_date(campos.get("pubDate", ""))
+        try:
+            data_noticia = datetime.strptime(data_noticia_str[:10], "%Y-%m-%d").date()
+        except ValueError:
+            data_noticia = HOJE
+
+        if data_noticia not in datas:
+            fora_da_janela += 1
+            if fora_da_janela >= MAX_FORA_DA_JANELA:
+                break
+            continue
+        fora_da_janela = 0
+
+        yield {
+            "titulo": campos.get("title") or "Sem título",
+            "link": campos["link"],
+            "post_date": data_noticia_str,
+            "data": data_noticia,
+        }
+
 def extrair_conteudo_completo(url, session):
     """Extrai conteúdo formatado para WordPress"""
     try:
         print(f"   🌐 Acessando: {url}")
-        r = session.get(url, timeout=30)
+        r = leitura_parcial.obter(url, FIM_CONTEUDO, headers=HEADERS, timeout=30, sessao=session)
         r.raise_for_status()
     except requests.RequestException as e:
         print(f"   ❌ Erro ao acessar página: {e}")
-        return None, None, None
+        return None, None
     
-    soup = BeautifulSoup(r.content, "html.parser")
+    # Página idêntica à da última extração: reaproveitar o resultado
+    em_cache = cache_extracao.obter('agenciabrasil', VERSAO_EXTRATOR, r.content, url)
+    if em_cache is not None:
+        print("   ♻️  Página sem mudanças, extração do cache")
+        return em_cache['conteudo'], em_cache['imagem']
+    
+    conteudo_html, featured_image = extrair_da_pagina(url, codificacao.decodificar(r))
+    cache_extracao.guardar('agenciabrasil', VERSAO_EXTRATOR, r.content,
+                           {'conteudo': conteudo_html, 'imagem': featured_image}, url)
+    return conteudo_html, featured_image
+
+def extrair_da_pagina(url, corpo):
+    """Parsing e limpeza da página já baixada: (conteudo_html, featured_image)"""
+    soup = BeautifulSoup(corpo, "html.parser")
     
     # 1. EXTRAIR IMAGEM DESTAQUE
     featured_image = None
@@ -168,22 +261,10 @@ def extrair_conteudo_completo(url, session):
     
     if not content_div:
         print("   ❌ Não foi possível encontrar conteúdo")
-        return None, None, None
+        return None, None
     
-    # Remover elementos indesejados
-    elementos_remover = ["script", "style", "iframe", "aside", "nav", 
-                        "header", "footer", "form", "button", "input",
-                        "select", "textarea"]
-    
-    for tag_name in elementos_remover:
-        for element in content_div.find_all(tag_name):
-            element.decompose()
-    
-    # Remover classes de anúncios e elementos irrelevantes
-    for element in content_div.find_all(class_=re.compile(
-        r"ad|banner|publicidade|propaganda|ads|widget|related|share|social|comentario|comment|meta|footer|header|navigation", 
-        re.I)):
-        element.decompose()
+    # Remover elementos indesejados e blocos de anúncio/compartilhamento (uma passada)
+    sanitizador.sanitizar(content_div, REGRAS_CONTEUDO, url)
     
     # Processar o conteúdo para formato WordPress
     for element in content_div.find_all(recursive=False):
@@ -258,10 +339,8 @@ def extrair_conteudo_completo(url, session):
     print(f"   ✅ Conteúdo extraído: {len(conteudo_html)} caracteres")
     return conteudo_html, featured_image
 
-def gerar_feed_wordpress(noticias):
-    """Gera feed XML no formato WordPress WXR simplificado"""
-    
-    # Criar estrutura XML
+def _raiz_wxr():
+    """<rss> com os namespaces do WXR e um <channel> vazio"""
     rss = ET.Element("rss", {
         "version": "2.0",
         "xmlns:excerpt": "http://wordpress.org/export/1.2/excerpt/",
@@ -271,7 +350,120 @@ def gerar_feed_wordpress(noticias):
         "xmlns:wp": "http://wordpress.org/export/1.2/"
     })
     
-    channel = ET.SubElement(rss, "channel")
+    return rss, ET.SubElement(rss, "channel")
+
+
+def _formatar(rss):
+    """Linhas do XML formatado pelo minidom (sem a declaração XML)"""
+    xml_str = ET.tostring(rss, encoding='unicode', method='xml')
+    
+    # Substituir possíveis entidades problemáticas
+    xml_str = xml_str.replace('&amp;amp;', '&amp;')
+    xml_str = xml_str.replace('&amp;lt;', '&lt;')
+    xml_str = xml_str.replace('&amp;gt;', '&gt;')
+    xml_str = xml_str.replace('&amp;quot;', '&quot;')
+    xml_str = xml_str.replace('&amp;apos;', '&apos;')
+    
+    # Formatar com minidom para melhor legibilidade
+    dom = minidom.parseString(xml_str)
+    lines = dom.toprettyxml(indent="  ").split('\n')
+    
+    # Remover a declaração XML duplicada
+    if lines[0].startswith('<?xml'):
+        lines = lines[1:]
+    return lines
+
+
+def _item_wxr(noticia):
+    """<item> do WXR, com marcas no lugar do post_id e da data de geração"""
+    item = ET.Element("item")
+    
+    # Título (usar limpeza para XML seguro)
+    titulo_limpo = limpar_texto_para_elemento(noticia["title"])
+    ET.SubElement(item, "title").text = titulo_limpo
+    
+    # Link
+    ET.SubElement(item, "link").text = noticia["link"]
+    
+    # Datas
+    pub_date = ET.SubElement(item, "pubDate")
+    pub_date.text = MARCA_PUBDATE
+    
+    # Creator (sem CDATA desnecessário)
+    ET.SubElement(item, "dc:creator").text = WP_AUTHOR
+    
+    # GUID único
+    guid = ET.SubElement(item, "guid", isPermaLink="false")
+    guid.text = f"{noticia['link']}#{MARCA_POST_ID}"
+    
+    # Descrição (excerpt) - SEM CDATA
+    description = ET.SubElement(item, "description")
+    description.text = noticia["excerpt"]
+    
+    # Conteúdo completo - SEM CDATA, já está limpo
+    content = ET.SubElement(item, "content:encoded")
+    content.text = noticia["content"]
+    
+    # Excerpt - SEM CDATA
+    excerpt = ET.SubElement(item, "excerpt:encoded")
+    excerpt.text = noticia["excerpt"]
+    
+    # Metadados WordPress
+    ET.SubElement(item, "wp:post_id").text = MARCA_POST_ID
+    
+    # Usar a data da notícia
+    post_date_str = noticia.get("post_date", datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+    ET.SubElement(item, "wp:post_date").text = post_date_str
+    ET.SubElement(item, "wp:post_date_gmt").text = post_date_str
+    ET.SubElement(item, "wp:post_modified").text = post_date_str
+    ET.SubElement(item, "wp:post_modified_gmt").text = post_date_str
+    
+    # Status e configurações
+    ET.SubElement(item, "wp:comment_status").text = "closed"
+    ET.SubElement(item, "wp:ping_status").text = "closed"
+    ET.SubElement(item, "wp:status").text = "publish"
+    ET.SubElement(item, "wp:post_type").text = "post"
+    ET.SubElement(item, "wp:post_password").text = ""
+    ET.SubElement(item, "wp:is_sticky").text = "0"
+    ET.SubElement(item, "wp:menu_order").text = "0"
+    ET.SubElement(item, "wp:post_parent").text = "0"
+    
+    # Categoria - SEM CDATA
+    category_elem = ET.SubElement(item, "category", 
+                                domain="category", 
+                                nicename=WP_CATEGORY.lower().replace(" ", "-"))
+    category_elem.text = WP_CATEGORY
+    
+    # Tags padrão - SEM CDATA
+    tags = ["Brasil", "Notícias", "Agência Brasil", "EBC"]
+    for tag in tags:
+        tag_elem = ET.SubElement(item, "category", 
+                               domain="post_tag", 
+                               nicename=tag.lower().replace(" ", "-"))
+        tag_elem.text = tag
+    
+    # Imagem destacada como metadado
+    if noticia.get("featured_image"):
+        postmeta = ET.SubElement(item, "wp:postmeta")
+        ET.SubElement(postmeta, "wp:meta_key").text = "_thumbnail_ext_url"
+        ET.SubElement(postmeta, "wp:meta_value").text = noticia["featured_image"]
+    
+    return item
+
+
+def _fragmento_item(noticia):
+    """<item> já formatado, na mesma indentação que teria dentro do documento"""
+    rss, channel = _raiz_wxr()
+    channel.append(_item_wxr(noticia))
+    linhas = _formatar(rss)
+    return '\n'.join(linhas[linhas.index('    <item>'):len(linhas) - linhas[::-1].index('    </item>')])
+
+
+def gerar_feed_wordpress(noticias):
+    """Gera feed XML no formato WordPress WXR simplificado"""
+    
+    # Criar estrutura XML (canal sem os itens)
+    rss, channel = _raiz_wxr()
     
     # Informações do canal
     ET.SubElement(channel, "title").text = "Agência Brasil - Últimas Notícias"
@@ -279,6 +471,13 @@ def gerar_feed_wordpress(noticias):
     ET.SubElement(channel, "description").text = "Notícias oficiais da Agência Brasil importadas automaticamente"
     ET.SubElement(channel, "pubDate").text = datetime.now(timezone.utc).strftime('%a, %d %b %Y %H:%M:%S +0000')
     ET.SubElement(channel, "language").text = "pt-BR"
+    # Frequência aprendida com o histórico (cadencia.py): <ttl> da hora atual e horas sem publicação
+    ET.SubElement(channel, "ttl").text = str(cadencia.ttl('agenciabrasil', 60))
+    horas_silenciosas = cadencia.horas_silenciosas('agenciabrasil')
+    if horas_silenciosas:
+        skip_hours = ET.SubElement(channel, "skipHours")
+        for hora in horas_silenciosas:
+            ET.SubElement(skip_hours, "hour").text = str(hora)
     ET.SubElement(channel, "wp:wxr_version").text = "1.2"
     ET.SubElement(channel, "wp:base_site_url").text = "https://agenciabrasil.ebc.com.br"
     ET.SubElement(channel, "wp:base_blog_url").text = "https://agenciabrasil.ebc.com.br"
@@ -297,152 +496,62 @@ def gerar_feed_wordpress(noticias):
     ET.SubElement(category, "wp:category_parent").text = ""
     ET.SubElement(category, "wp:cat_name").text = WP_CATEGORY
     
-    # Adicionar cada notícia como POST
-    post_id = 1000
+    linhas = _formatar(rss)
+    fechamento = len(linhas) - linhas[::-1].index('  </channel>') - 1
     
-    for i, noticia in enumerate(noticias, 1):
-        item = ET.SubElement(channel, "item")
-        
-        # Título (usar limpeza para XML seguro)
-        titulo_limpo = limpar_texto_para_elemento(noticia["title"])
-        ET.SubElement(item, "title").text = titulo_limpo
-        
-        # Link
-        ET.SubElement(item, "link").text = noticia["link"]
-        
-        # Datas
-        pub_date = ET.SubElement(item, "pubDate")
-        pub_date.text = datetime.now().strftime('%a, %d %b %Y %H:%M:%S +0000')
-        
-        # Creator (sem CDATA desnecessário)
-        ET.SubElement(item, "dc:creator").text = WP_AUTHOR
-        
-        # GUID único
-        guid = ET.SubElement(item, "guid", isPermaLink="false")
-        guid.text = f"{noticia['link']}#{post_id}"
-        
-        # Descrição (excerpt) - SEM CDATA
-        description = ET.SubElement(item, "description")
-        description.text = noticia["excerpt"]
-        
-        # Conteúdo completo - SEM CDATA, já está limpo
-        content = ET.SubElement(item, "content:encoded")
-        content.text = noticia["content"]
-        
-        # Excerpt - SEM CDATA
-        excerpt = ET.SubElement(item, "excerpt:encoded")
-        excerpt.text = noticia["excerpt"]
-        
-        # Metadados WordPress
-        ET.SubElement(item, "wp:post_id").text = str(post_id)
-        
-        # Usar a data da notícia
-        post_date_str = noticia.get("post_date", datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
-        ET.SubElement(item, "wp:post_date").text = post_date_str
-        ET.SubElement(item, "wp:post_date_gmt").text = post_date_str
-        ET.SubElement(item, "wp:post_modified").text = post_date_str
-        ET.SubElement(item, "wp:post_modified_gmt").text = post_date_str
-        
-        # Status e configurações
-        ET.SubElement(item, "wp:comment_status").text = "closed"
-        ET.SubElement(item, "wp:ping_status").text = "closed"
-        ET.SubElement(item, "wp:status").text = "publish"
-        ET.SubElement(item, "wp:post_type").text = "post"
-        ET.SubElement(item, "wp:post_password").text = ""
-        ET.SubElement(item, "wp:is_sticky").text = "0"
-        ET.SubElement(item, "wp:menu_order").text = "0"
-        ET.SubElement(item, "wp:post_parent").text = "0"
-        
-        # Categoria - SEM CDATA
-        category_elem = ET.SubElement(item, "category", 
-                                    domain="category", 
-                                    nicename=WP_CATEGORY.lower().replace(" ", "-"))
-        category_elem.text = WP_CATEGORY
-        
-        # Tags padrão - SEM CDATA
-        tags = ["Brasil", "Notícias", "Agência Brasil", "EBC"]
-        for tag in tags:
-            tag_elem = ET.SubElement(item, "category", 
-                                   domain="post_tag", 
-                                   nicename=tag.lower().replace(" ", "-"))
-            tag_elem.text = tag
-        
-        # Imagem destacada como metadado
-        if noticia.get("featured_image"):
-            postmeta = ET.SubElement(item, "wp:postmeta")
-            ET.SubElement(postmeta, "wp:meta_key").text = "_thumbnail_ext_url"
-            ET.SubElement(postmeta, "wp:meta_value").text = noticia["featured_image"]
-        
-        post_id += 1
-    
-    # Converter para string XML formatada
-    xml_str = ET.tostring(rss, encoding='unicode', method='xml')
-    
-    # Substituir possíveis entidades problemáticas
-    xml_str = xml_str.replace('&amp;amp;', '&amp;')
-    xml_str = xml_str.replace('&amp;lt;', '&lt;')
-    xml_str = xml_str.replace('&amp;gt;', '&gt;')
-    xml_str = xml_str.replace('&amp;quot;', '&quot;')
-    xml_str = xml_str.replace('&amp;apos;', '&apos;')
-    
-    # Formatar com minidom para melhor legibilidade
-    dom = minidom.parseString(xml_str)
-    formatted_xml = dom.toprettyxml(indent="  ")
-    
-    # Remover a declaração XML duplicada
-    lines = formatted_xml.split('\n')
-    if lines[0].startswith('<?xml'):
-        lines = lines[1:]
+    # Adicionar cada notícia como POST; a mesma notícia da execução anterior
+    # sai pronta do cache de fragmentos, só com o post_id e a data trocados
+    agora = datetime.now().strftime('%a, %d %b %Y %H:%M:%S +0000')
+    itens = []
+    for post_id, noticia in enumerate(noticias, 1000):
+        dados = [noticia, WP_AUTHOR, WP_CATEGORY]
+        fragmento = fragmentos.renderizar('agenciabrasil', noticia['link'], VERSAO_WXR, dados,
+                                          lambda noticia=noticia: _fragmento_item(noticia))
+        itens.append(fragmento.replace(MARCA_POST_ID, str(post_id)).replace(MARCA_PUBDATE, agora))
+    lines = linhas[:fechamento] + itens + linhas[fechamento:]
     
     # Adicionar declaração XML com encoding UTF-8
     xml_declaration = '<?xml version="1.0" encoding="UTF-8"?>\n'
     
-    return xml_declaration + '\n'.join(lines)
+    return textoxml.limpar(xml_declaration + '\n'.join(lines))
 
 # ================= CRAWLER =================
 
 def extrair_agencia_brasil():
+    # Recalcular a cada execução: no modo daemon o módulo fica carregado por dias
+    global HOJE, ONTEM
+    HOJE = date.today()
+    ONTEM = HOJE - timedelta(days=1)
+
     print(f"📰 Buscando Agência Brasil | Datas aceitas: {HOJE} e {ONTEM}")
     print("=" * 60)
 
-    session = requests.Session()
-    session.headers.update(HEADERS)
+    session = transporte.sessao()
 
     try:
         print("🌐 Conectando ao feed RSS...")
-        r = session.get(RSS_URL, timeout=30)
-        r.raise_for_status()
+        # Streaming: a conexão é fechada assim que o feed sai da janela de datas
+        with session.get(RSS_URL, headers=HEADERS, timeout=30, stream=True) as r:
+            r.raise_for_status()
+            r.raw.decode_content = True
+            items = list(ler_itens_rss(r.raw, (HOJE, ONTEM)))
         print("✅ Feed RSS carregado com sucesso")
     except requests.RequestException as e:
         print(f"❌ Erro ao acessar RSS: {e}")
         return
-
-    soup = BeautifulSoup(r.content, "xml")
-    items = soup.find_all("item")
+    except (ET.ParseError, iterxml.ParseError) as e:
+        print(f"❌ RSS malformado: {e}")
+        return
     
-    print(f"📋 Encontradas {len(items)} notícias no feed RSS")
+    print(f"📋 Encontradas {len(items)} notícias de {HOJE} e {ONTEM} no feed RSS")
     
     noticias = []
     noticias_processadas = 0
     
     for i, item in enumerate(items, 1):
-        titulo = item.title.get_text(strip=True) if item.title else "Sem título"
-        link = item.link.get_text(strip=True) if item.link else None
-        pubdate = item.pubDate.get_text(strip=True) if item.pubDate else ""
-        
-        if not link:
-            continue
-        
-        # Verificar data da notícia
-        data_noticia_str = parse_rss_date(pubdate)
-        try:
-            data_noticia = datetime.strptime(data_noticia_str[:10], "%Y-%m-%d").date()
-        except:
-            data_noticia = HOJE
-        
-        # Filtrar por data
-        if data_noticia not in (HOJE, ONTEM):
-            continue
+        titulo = item["titulo"]
+        link = item["link"]
+        data_noticia_str = item["post_date"]
         
         print(f"\n[{i}] 📰 Processando: {titulo[:70]}...")
         print(f"   📅 Data: {data_noticia_str}")
@@ -455,6 +564,12 @@ def extrair_agencia_brasil():
             print(f"   ⚠ Conteúdo insuficiente ou não encontrado")
             continue
         
+        # Imagem destacada (e o <img> do conteúdo) apontando para o espelho
+        imagem_espelhada = espelho.espelhar('agenciabrasil', featured_image, HEADERS)
+        if imagem_espelhada != featured_image:
+            conteudo_wp = conteudo_wp.replace(featured_image, imagem_espelhada)
+            featured_image = imagem_espelhada
+        
         # Criar excerpt (primeiros 150 caracteres limpos)
         excerpt_text = re.sub(r'<[^>]+>', '', conteudo_wp)
         excerpt = excerpt_text[:150] + "..." if len(excerpt_text) > 150 else excerpt_text
@@ -479,8 +594,21 @@ def extrair_agencia_brasil():
         print(f"\n📊 Gerando feed WordPress com {len(noticias)} notícias...")
         xml_content = gerar_feed_wordpress(noticias)
         
-        with open(FEED_FILE, "w", encoding="utf-8") as f:
-            f.write(xml_content)
+        registros = [
+            novo_registro('agenciabrasil', n['title'], n['link'], n['post_date'],
+                          conteudo=n['content'], imagem=n['featured_image'],
+                          resumo=html.unescape(n['excerpt']))
+            for n in noticias
+        ]
+        
+        # Validação em memória (o WXR é gerado sem CDATA)
+        resultado = validador.validar('agenciabrasil', registros, xml_content, permitir_cdata=False)
+        if not validador.publicavel(resultado):
+            validador.imprimir(resultado)
+            print(f"🚫 Feed inválido não gravado; {FEED_FILE} anterior mantido")
+            return
+        
+        notificacao.gravar_feed('agenciabrasil', FEED_FILE, xml_content)
         
         print(f"\n" + "=" * 60)
         print(f"✅ FEED WORDPRESS GERADO COM SUCESSO!")
@@ -488,14 +616,13 @@ def extrair_agencia_brasil():
         print(f"📰 Notícias processadas: {len(noticias)}")
         print(f"📊 Tamanho do arquivo: {len(xml_content) // 1024} KB")
         
-        # Verificar se há CDATA no arquivo gerado
-        with open(FEED_FILE, "r", encoding="utf-8") as f:
-            content = f.read()
-            cdata_count = content.count("<![CDATA[")
-            if cdata_count > 0:
-                print(f"⚠️  Aviso: Encontrados {cdata_count} blocos CDATA no arquivo")
-            else:
-                print(f"✅ Nenhum bloco CDATA encontrado - Formato correto")
+        sem_derrubar('gerar JSON Feed', jsonfeed.gravar, 'agenciabrasil', registros)
+        sem_derrubar('gravar histórico', arquivo.arquivar, 'agenciabrasil', registros)
+        sem_derrubar('gerar feed paginado', feed_paginado.publicar, 'agenciabrasil')
+        espelho.gravar()
+        
+        validador.imprimir(resultado)
+        cadencia.registrar_coleta('agenciabrasil')
         
         print("\n🎯 PARA IMPORTAR NO WORDPRESS:")
         print("1. Acesse WordPress Admin → Ferramentas → Importar")
@@ -514,6 +641,9 @@ def extrair_agencia_brasil():
                 f.write(f"  Imagem: {n.get('featured_image', 'Não')}\n\n")
     else:
         print(f"\n⚠ Nenhuma notícia encontrada para as datas filtradas ({HOJE} e {ONTEM})")
+        # RSS lido e sem nada na janela conta como coleta; notícias que falharam, não
+        if not items:
+            cadencia.registrar_coleta('agenciabrasil')
 
 # ================= MAIN =================
 
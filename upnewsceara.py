@@ -1,12 +1,19 @@
-import urllib.request
-import json
 import re
 import html
-import ssl
 from datetime import datetime
-# Bypass SSL verify for simple scripts if certificates are an issue on some envs
-ssl._create_default_https_context = ssl._create_unverified_context
+from email.utils import format_datetime
+
+import arquivo
+import feed_paginado
+import jsonfeed
+import notificacao
+import textoxml
+import transporte
+import validador
+from modelo import novo_registro, para_datetime, sem_derrubar
 API_URL = "https://www.ceara.gov.br/wp-json/wp/v2/posts?per_page=30&_embed"
+# Sem verificação TLS só para o portal do Ceará (antes: contexto SSL sem verificação no processo todo)
+transporte.configurar(API_URL, verificar=False)
 def clean_content(html_content):
     if not html_content:
         return ""
@@ -36,10 +43,9 @@ def clean_content(html_content):
 def generate_rss():
     print("Fetching news from API...")
     try:
-        req = urllib.request.Request(API_URL, headers={'User-Agent': 'Mozilla/5.0'})
-        with urllib.request.urlopen(req) as response:
-            data = response.read()
-            posts = json.loads(data)
+        response = transporte.sessao().get(API_URL, headers={'User-Agent': 'Mozilla/5.0'}, timeout=30)
+        response.raise_for_status()
+        posts = response.json()
             
         rss = """<?xml version="1.0" encoding="UTF-8" ?>
 <rss version="2.0" xmlns:content="http://purl.org/rss/1.0/modules/content/">
@@ -48,6 +54,10 @@ def generate_rss():
   <link>https://www.ceara.gov.br</link>
   <description>Feed RSS gerado via API</description>
 """
+        atom = notificacao.links_atom('feed_ceara_news.xml')
+        if atom:
+            rss += atom + "\n"
+        registros = []
         for post in posts:
             pub_date_str = post['date']
             post_date = pub_date_str.split('T')[0]
@@ -74,7 +84,9 @@ def generate_rss():
             
             if any(keyword in title_lower for keyword in security_keywords) or any(keyword in content_lower for keyword in security_keywords):
                 continue
-            pubDate = pub_date_str
+            # 'date' da API vem sem fuso (horário do site, Brasília); RSS pede RFC 822
+            publicado = para_datetime(pub_date_str)
+            pubDate = format_datetime(publicado)
             title = html.unescape(post['title']['rendered'])
             link = post['link']
             
@@ -91,9 +103,11 @@ def generate_rss():
             # Remove empty lines
             lines = [line.strip() for line in clean_description.split('\n') if len(line.strip()) > 5]
             clean_description = '\n\n'.join(lines)
+            texto_limpo = clean_description
+            titulo_limpo = title
             
-            clean_description = clean_description.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;").replace('"', "&quot;").replace("'", "&apos;")
-            title = title.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;").replace('"', "&quot;").replace("'", "&apos;")
+            clean_description = textoxml.escapar(clean_description)
+            title = textoxml.escapar(title)
             image_url = ""
             if "_embedded" in post and "wp:featuredmedia" in post["_embedded"] and post["_embedded"]["wp:featuredmedia"]:
                 media = post["_embedded"]["wp:featuredmedia"][0]
@@ -107,17 +121,27 @@ def generate_rss():
     <title>{title}</title>
     <guid>{link}</guid>
     <pubDate>{pubDate}</pubDate>
-    <description><![CDATA[{clean_description}]]></description>
-    <content:encoded><![CDATA[{clean_description}]]></content:encoded>
+    <description>{textoxml.cdata(clean_description)}</description>
+    <content:encoded>{textoxml.cdata(clean_description)}</content:encoded>
     <enclosure url="{image_url}" type="image/jpeg" />
   </item>"""
+            registros.append(novo_registro(
+                'ceara', titulo_limpo, link, publicado,
+                conteudo=texto_limpo, imagem=image_url, resumo=texto_limpo[:250]
+            ))
         rss += """
 </channel>
 </rss>"""
-        with open('feed_ceara_news.xml', 'w', encoding='utf-8') as f:
-            f.write(rss)
+        resultado = validador.validar('ceara', registros, rss, exigir_imagem=True)
+        validador.exigir_publicavel(resultado)
+        # Hub/webhook só são avisados se o conjunto de itens mudou (notificacao.py)
+        notificacao.gravar_feed('ceara', 'feed_ceara_news.xml', rss)
             
         print("RSS Feed generated successfully: feed_ceara_news.xml")
+        validador.imprimir(resultado)
+        sem_derrubar('gerar JSON Feed', jsonfeed.gravar, 'ceara', registros)
+        sem_derrubar('gravar histórico', arquivo.arquivar, 'ceara', registros)
+        sem_derrubar('gerar feed paginado', feed_paginado.publicar, 'ceara')
     except Exception as e:
         print(f"Error extracting news: {e}")
 if __name__ == "__main__":
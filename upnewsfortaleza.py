@@ -11,6 +11,42 @@ from urllib.parse import urljoin, urlparse, quote, unquote, urlunparse
 import re
 import os
 import sys
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import arquivo
+import cache_extracao
+import cadencia
+import codificacao
+import descoberta
+import espelho
+import estado
+import feed_paginado
+import fragmentos
+import jsonfeed
+import leitura_parcial
+import notificacao
+import reserva
+import sanitizador
+import textoxml
+import transporte
+import validador
+from modelo import novo_registro, FUSO_BRASILIA, sem_derrubar
+
+# Incrementar ao mudar extrair_conteudo_completo: invalida o cache de extração
+VERSAO_EXTRATOR = 2
+
+# Incrementar ao mudar o <item> de renderizar_noticia: invalida o cache de fragmentos
+VERSAO_RSS = 1
+
+# Download da notícia para quando este contêiner fecha (ver leitura_parcial.py);
+# só o seletor de maior prioridade, para o resultado não mudar
+FIM_CONTEUDO = ['div.itemFullText']
+
+# Pipeline listagem -> detalhes -> XML (ver criar_feed_fortaleza)
+INTERVALO_HOST = 1.0     # mínimo de segundos entre requisições ao portal (substitui as pausas fixas)
+DETALHES_PARALELOS = 2   # páginas de notícia baixadas ao mesmo tempo
+MAX_EM_VOO = 6           # notícias pedidas e ainda não renderizadas; a listagem espera acima disso
 
 def encodificar_url(url):
     if not url:
@@ -35,6 +71,21 @@ def encodificar_url(url):
     except:
         return url
 
+# Limpeza do corpo da notícia (uma passada, ver sanitizador.py)
+REGRAS_CONTEUDO = sanitizador.regras(
+    tags_removidas=['script', 'style', 'iframe', 'nav', 'aside'],
+    classes_bloqueadas=[
+        'social-share', 'share-buttons', 'compartilhar',
+        'related-posts', 'posts-relacionados',
+        'comments', 'comentarios', 'newsletter',
+        'ad', 'ads', 'advertisement'
+    ],
+    atributos={'img': ['src', 'alt', 'title'], 'a': ['href']},
+    atributos_removidos=['style', 'class'],
+    atributos_fixos={'img': {'style': 'max-width:100%; height:auto;'}},
+    normalizar_url=encodificar_url,
+)
+
 def extrair_conteudo_completo(url_noticia, headers, imagem_miniatura=None):
     """
     Acessa a URL individual da notícia e extrai:
@@ -45,10 +96,16 @@ def extrair_conteudo_completo(url_noticia, headers, imagem_miniatura=None):
     try:
         print(f"    🌐 Acessando: {url_noticia[:70]}...")
         
-        response = requests.get(url_noticia, headers=headers, timeout=20)
+        response = leitura_parcial.obter(url_noticia, FIM_CONTEUDO, headers=headers, timeout=20)
         response.raise_for_status()
         
-        soup = BeautifulSoup(response.content, 'html.parser')
+        # Página idêntica à da última extração: reaproveitar o resultado
+        em_cache = cache_extracao.obter('fortaleza', VERSAO_EXTRATOR, response.content, url_noticia, imagem_miniatura)
+        if em_cache is not None:
+            print("    ♻️  Página sem mudanças, extração do cache")
+            return em_cache
+        
+        soup = BeautifulSoup(codificacao.decodificar(response), 'html.parser')
         
         # 1. TENTAR ENCONTRAR O CONTEÚDO PRINCIPAL
         conteudo_completo = ""
@@ -70,94 +127,17 @@ def extrair_conteudo_completo(url_noticia, headers, imagem_miniatura=None):
         ]
         
         conteudo_encontrado = False
-        container_conteudo_original = None
+        src_primeira_img = None
         
         for seletor in seletores_conteudo:
             container = soup.select_one(seletor)
             if container:
-                container_conteudo_original = container
-                # Fazer uma cópia para não modificar o original
-                conteudo = BeautifulSoup(str(container), 'html.parser')
+                # Imagem original (com lazy load) antes da limpeza, para a imagem destacada
+                primeira_img = container.find('img')
+                src_primeira_img = (primeira_img.get('src') or primeira_img.get('data-src')) if primeira_img else None
                 
-                # Remover elementos indesejados
-                elementos_remover = ['script', 'style', 'iframe', 'nav', 'aside']
-                for tag in conteudo.find_all(elementos_remover):
-                    tag.decompose()
-                
-                # Remover elementos de compartilhamento/anúncios por classe
-                classes_para_remover = [
-                    'social-share', 'share-buttons', 'compartilhar',
-                    'related-posts', 'posts-relacionados',
-                    'comments', 'comentarios', 'newsletter',
-                    'ad', 'ads', 'advertisement'
-                ]
-                
-                for elemento in conteudo.find_all(True):
-                    if elemento.get('class'):
-                        classes = elemento.get('class')
-                        if any(cls in str(classes) for cls in classes_para_remover):
-                            elemento.decompose()
-                            continue
-                
-                # Limpar atributos (manter estrutura) e converter links relativos para absolutos codificados
-                for tag in conteudo.find_all(True):
-                    if tag.name == 'img':
-                        # Suportar lazy load (buscar o link real em atributos de dados antes)
-                        possible_src_attrs = ['src', 'data-src', 'data-lazy-src', 'data-original', 'data-actual-src']
-                        src = None
-                        for attr in possible_src_attrs:
-                            val = tag.get(attr)
-                            if val and not val.startswith('data:'):
-                                src = val
-                                break
-                        if not src:
-                            src = tag.get('src')
-                            
-                        if src:
-                            src = src.strip().replace('\n', '').replace('\r', '')
-                            # Converter para absoluta se necessário
-                            if not src.startswith(('http://', 'https://', 'data:')):
-                                if src.startswith('//'):
-                                    src = 'https:' + src
-                                elif src.startswith('/'):
-                                    base_url = '/'.join(url_noticia.split('/')[:3])
-                                    src = base_url + src
-                                else:
-                                    src = urljoin(url_noticia, src)
-                            tag['src'] = encodificar_url(src)
-                            
-                        # Limpar outros atributos para não quebrar no WordPress
-                        attrs = dict(tag.attrs)
-                        for attr in list(attrs.keys()):
-                            if attr not in ['src', 'alt', 'title']:
-                                del tag[attr]
-                        tag['style'] = 'max-width:100%; height:auto;'
-                        
-                    elif tag.name == 'a':
-                        # Converter link relativo para absoluto
-                        href = tag.get('href')
-                        if href:
-                            href = href.strip().replace('\n', '').replace('\r', '')
-                            if not href.startswith(('http://', 'https://', 'mailto:', 'tel:', 'javascript:', '#')):
-                                if href.startswith('//'):
-                                    href = 'https:' + href
-                                elif href.startswith('/'):
-                                    base_url = '/'.join(url_noticia.split('/')[:3])
-                                    href = base_url + href
-                                else:
-                                    href = urljoin(url_noticia, href)
-                            tag['href'] = encodificar_url(href)
-                            
-                        attrs = dict(tag.attrs)
-                        for attr in list(attrs.keys()):
-                            if attr != 'href':
-                                del tag[attr]
-                    else:
-                        # Para outras tags: remover atributos de estilo e classe
-                        if 'style' in tag.attrs:
-                            del tag['style']
-                        if 'class' in tag.attrs:
-                            del tag['class']
+                # Tags, classes e atributos em uma única passada, links absolutos codificados
+                conteudo = sanitizador.sanitizar(container, REGRAS_CONTEUDO, url_noticia)
                 
                 conteudo_completo = str(conteudo)
                 conteudo_encontrado = True
@@ -198,13 +178,10 @@ def extrair_conteudo_completo(url_noticia, headers, imagem_miniatura=None):
                 print("    🖼️  Imagem via Twitter Card")
         
         # Prioridade 3: Primeira imagem no container do conteúdo principal
-        if not imagem_destacada and container_conteudo_original:
-            first_img = container_conteudo_original.find('img')
-            if first_img:
-                src = first_img.get('src') or first_img.get('data-src')
-                if src and not src.startswith('data:'):
-                    imagem_destacada = src
-                    print("    🖼️  Imagem via primeira <img> no container de conteúdo")
+        if not imagem_destacada and src_primeira_img:
+            if not src_primeira_img.startswith('data:'):
+                imagem_destacada = src_primeira_img
+                print("    🖼️  Imagem via primeira <img> no container de conteúdo")
         
         # Prioridade 4: Primeira imagem em seletores comuns no conteúdo
         if not imagem_destacada:
@@ -292,11 +269,13 @@ def extrair_conteudo_completo(url_noticia, headers, imagem_miniatura=None):
         if imagem_destacada:
             print(f"    🖼️  Imagem destacada: {imagem_destacada[:80]}...")
         
-        return {
+        resultado = {
             'conteudo': conteudo_final,
             'imagem_destacada': imagem_destacada,
             'titulo_refinado': titulo_refinado
         }
+        cache_extracao.guardar('fortaleza', VERSAO_EXTRATOR, response.content, resultado, url_noticia, imagem_miniatura)
+        return resultado
         
     except requests.exceptions.RequestException as e:
         print(f"    ❌ Erro de rede: {e}")
@@ -305,6 +284,21 @@ def extrair_conteudo_completo(url_noticia, headers, imagem_miniatura=None):
         print(f"    ❌ Erro ao extrair conteúdo: {str(e)[:50]}")
         return None
 
+def noticia_do_historico(registro):
+    """Notícia já conhecida (marca d'água), remontada a partir do histórico sem nova requisição"""
+    publicado = registro['publicado'].astimezone(FUSO_BRASILIA)
+    return {
+        'titulo': registro['titulo'],
+        'link': registro['link'],
+        'descricao': registro['resumo'],
+        'data_texto': publicado.strftime('%d/%m/%Y %H:%M'),
+        'imagem': registro['imagem'],
+        'hora': publicado.strftime('%H:%M'),
+        'data_objeto': publicado.date(),
+        'conteudo_completo': registro['conteudo'],
+        'tem_conteudo_completo': True
+    }
+
 def criar_feed_fortaleza():
     """
     Versão otimizada para GitHub Actions - considera fuso horário
@@ -317,6 +311,7 @@ def criar_feed_fortaleza():
     URL_BASE = "https://www.fortaleza.ce.gov.br"
     URL_LISTA = f"{URL_BASE}/noticias"
     FEED_FILE = "feed_fortaleza_hoje.xml"
+    CANAL = {'titulo': 'Notícias Fortaleza - Recentes', 'link': URL_BASE}
     
     # IMPORTANTE: GitHub roda em UTC, Brasil é UTC-3
     # Se for entre 00:00-03:00 UTC, ainda é "ontem" no Brasil
@@ -373,36 +368,77 @@ def criar_feed_fortaleza():
     
     try:
         # ================= 1. TESTAR CONEXÃO =================
+        transporte.limitar(URL_BASE, INTERVALO_HOST)
         print("🔍 Testando conexão com o site...")
-        test_response = requests.get(URL_BASE, headers=HEADERS, timeout=10)
+        test_response = transporte.sessao().get(URL_BASE, headers=HEADERS, timeout=10)
         if test_response.status_code == 200:
             print("✅ Conexão OK")
         else:
             print(f"⚠️  Status: {test_response.status_code}")
         
-        # ================= 2. COLETAR NOTÍCIAS =================
-        print("\n📰 Coletando notícias...")
-        
-        noticias_hoje = []
-        pagina = 1
-        url = URL_LISTA
-        
-        while url and pagina <= 3:  # Limitar a 3 páginas para GitHub
-            print(f"📄 Página {pagina}")
+        # ================= 2. PIPELINE: LISTAGEM -> DETALHES -> XML =================
+        # As etapas são encadeadas: cada notícia sai da listagem (gerador, página a
+        # página) direto para a extração em paralelo, e cada extração concluída é
+        # renderizada na hora. A listagem só avança com no máximo MAX_EM_VOO
+        # notícias pendentes, e o ritmo do host (transporte.limitar) substitui as
+        # pausas fixas entre páginas e entre notícias.
+        print("\n📰 Coletando notícias (listagem e conteúdo em paralelo)...")
+        
+        # Marca d'água: item mais novo visto na execução anterior
+        marca = estado.marca_dagua('fortaleza')
+        situacao = {'paginas': 0, 'mais_novo': None, 'alcancou_marca': False, 'recentes': 0, 'erro': None}
+        
+        # Índice estruturado (WP REST/sitemap/RSS), se o portal oferecer: datas exatas e sem raspar HTML
+        entradas = descoberta.descobrir('fortaleza', URL_BASE, r'/noticias/[^/?#]+', HEADERS)
+        
+        def noticias_do_indice():
+            print(f"🔎 {len(entradas)} entrada(s) do índice estruturado")
+            for entrada in entradas:
+                if not entrada['publicado']:
+                    continue
+                publicado = entrada['publicado'].astimezone(FUSO_BRASILIA)
+                if publicado.date() not in DATAS_ALVO:
+                    continue
+                yield {
+                    'titulo': entrada['titulo'] or descoberta.titulo_do_link(entrada['link']),
+                    'link': entrada['link'],
+                    'descricao': '',
+                    'data_texto': publicado.strftime('%d/%m/%Y %H:%M'),
+                    'imagem_miniatura': None,
+                    'hora': publicado.strftime('%H:%M'),
+                    'data_objeto': publicado.date(),
+                    'conteudo_completo': None,
+                    'imagem_destacada': None,
+                    'conhecida': not entrada['novo']
+                }
+        
+        def noticias_da_listagem():
+            """Gera as notícias de hoje/ontem assim que cada página é lida"""
+            url = URL_LISTA
+            pagina = 1
             
-            try:
-                response = requests.get(url, headers=HEADERS, timeout=15)
-                response.encoding = 'utf-8'
-                soup = BeautifulSoup(response.content, 'html.parser')
+            while url and pagina <= 3:  # Limitar a 3 páginas para GitHub
+                print(f"📄 Página {pagina}")
+                situacao['paginas'] = pagina
+                
+                try:
+                    response = transporte.sessao().get(url, headers=HEADERS, timeout=15)
+                    response.raise_for_status()
+                    soup = BeautifulSoup(codificacao.decodificar(response), 'html.parser')
+                except Exception as e:
+                    print(f"   ❌ Erro na página {pagina}: {e}")
+                    situacao['erro'] = str(e)[:120]
+                    return
                 
                 containers = soup.find_all('div', class_='blog-post-item')
                 print(f"   📦 Notícias na página: {len(containers)}")
                 
                 if len(containers) == 0:
                     print("   ⚠️  Nenhuma notícia encontrada na página")
-                    break
+                    return
                 
                 encontrou_alvo = False
+                recentes_na_pagina = 0
                 
                 for container in containers:
                     try:
@@ -427,16 +463,23 @@ def criar_feed_fortaleza():
                             print(f"      ⚠️  Não consegui converter data")
                             continue
                         
+                        # Link
+                        link_tag = container.find('a', class_='btn-reveal')
+                        link_url = urljoin(URL_BASE, link_tag['href']) if link_tag and link_tag.get('href') else None
+                        
+                        # Da marca d'água em diante, tudo já foi visto na execução anterior
+                        if situacao['mais_novo'] is None and link_url:
+                            situacao['mais_novo'] = (link_url, data_noticia)
+                        if not situacao['alcancou_marca'] and estado.alcancou_marca(marca, link_url, data_noticia):
+                            situacao['alcancou_marca'] = True
+                            print("      🔖 Marca d'água alcançada: itens seguintes já conhecidos")
+                        
                         # Verificar se é de hoje ou ontem
                         if data_noticia in DATAS_ALVO:
                             encontrou_alvo = True
                             
-                            # Link
-                            link_tag = container.find('a', class_='btn-reveal')
-                            if not link_tag or not link_tag.get('href'):
+                            if not link_url:
                                 continue
-                                
-                            link_url = urljoin(URL_BASE, link_tag['href'])
                             
                             # Título
                             titulo = ""
@@ -492,7 +535,10 @@ def criar_feed_fortaleza():
                                         imagem_miniatura = src
                                     imagem_miniatura = encodificar_url(imagem_miniatura)
                             
-                            noticias_hoje.append({
+                            print(f"    ✅ [{hora}] {titulo[:50]}...")
+                            recentes_na_pagina += 1
+                            
+                            yield {
                                 'titulo': titulo,
                                 'link': link_url,
                                 'descricao': descricao,  # Resumo da página principal
@@ -501,10 +547,9 @@ def criar_feed_fortaleza():
                                 'hora': hora,
                                 'data_objeto': data_noticia,
                                 'conteudo_completo': None,  # Será preenchido depois
-                                'imagem_destacada': None   # Será preenchido depois
-                            })
-                            
-                            print(f"    ✅ [{hora}] {titulo[:50]}...")
+                                'imagem_destacada': None,  # Será preenchido depois
+                                'conhecida': situacao['alcancou_marca']
+                            }
                         
                         else:
                             diferenca = (HOJE - data_noticia).days
@@ -515,12 +560,17 @@ def criar_feed_fortaleza():
                         print(f"    ⚠️  Erro: {str(e)[:30]}")
                         continue
                 
-                print(f"   📊 Notícias recentes nesta página: {sum(1 for n in noticias_hoje if n.get('pagina') == pagina)}")
+                print(f"   📊 Notícias recentes nesta página: {recentes_na_pagina}")
                 
                 # Se não encontrou notícias recentes E já viu algumas páginas, parar
                 if not encontrou_alvo and pagina >= 2:
                     print("   ⏹️  Nenhuma notícia recente, parando busca")
-                    break
+                    return
+                
+                # Já chegou no que era conhecido: as próximas páginas só têm itens antigos
+                if situacao['alcancou_marca']:
+                    print("   🔖 Marca d'água alcançada, parando busca")
+                    return
                 
                 # Próxima página
                 proxima = None
@@ -538,33 +588,38 @@ def criar_feed_fortaleza():
                         proxima = urljoin(URL_BASE, link_proximo['href'])
                         print(f"   🔗 Próxima página encontrada")
                 
-                if not proxima:
-                    break
-                
                 pagina += 1
                 url = proxima
-                time.sleep(1)  # Respeitar o servidor
-                
-            except Exception as e:
-                print(f"   ❌ Erro na página {pagina}: {e}")
-                break
-        
-        print("-" * 60)
-        print(f"📈 Busca concluída: {pagina} página(s)")
-        print(f"🎯 Notícias recentes (hoje/ontem) encontradas: {len(noticias_hoje)}")
-        
-        # ================= 3. EXTRAIR CONTEÚDO COMPLETO =================
-        print(f"\n📥 Extraindo conteúdo completo das notícias...")
-        print("-" * 60)
         
-        noticias_com_conteudo = []
-        
-        for i, noticia in enumerate(noticias_hoje, 1):
-            print(f"\n📰 Notícia {i}/{len(noticias_hoje)}: {noticia['titulo'][:60]}...")
+        def noticias_recentes():
+            """Listagem (ou índice) e, depois da marca d'água, as notícias de hoje/ontem do histórico"""
+            vistos = set()
+            for noticia in (noticias_do_indice() if entradas is not None else noticias_da_listagem()):
+                vistos.add(arquivo.url_canonica(noticia['link']))
+                situacao['recentes'] += 1
+                yield noticia
+            
+            print("-" * 60)
+            print(f"📈 Busca concluída: {situacao['paginas']} página(s)")
+            print(f"🎯 Notícias recentes (hoje/ontem) encontradas: {situacao['recentes']}")
             
-            # Aguardar entre requisições para não sobrecarregar o servidor
-            if i > 1:
-                time.sleep(2)  # 2 segundos entre requisições
+            # Notícias de hoje/ontem das páginas que não foram baixadas vêm do histórico
+            # (só as com conteúdo: sem miniatura, data e resumo da listagem, não há como
+            # detalhar de novo uma linha vazia, como as gravadas pela recuperacao.py)
+            if situacao['alcancou_marca']:
+                for registro in arquivo.consultar('fortaleza', ONTEM, HOJE):
+                    if registro['conteudo'] and arquivo.url_canonica(registro['link']) not in vistos:
+                        yield {'titulo': registro['titulo'], 'link': registro['link'],
+                               'conhecida': True, 'registro': registro}
+        
+        def detalhar_noticia(noticia):
+            """Conteúdo completo da notícia (roda nas threads de detalhe)"""
+            # Conhecida da execução anterior: reaproveitar o histórico
+            if noticia.get('conhecida'):
+                registro = noticia.get('registro') or arquivo.buscar('fortaleza', noticia['link'])
+                if registro and registro['conteudo']:
+                    print(f"    🔖 Já conhecida, conteúdo do histórico: {noticia['titulo'][:50]}...")
+                    return noticia_do_historico(registro)
             
             # Acessar a página individual da notícia passando a miniatura
             conteudo_extraido = extrair_conteudo_completo(noticia['link'], HEADERS, noticia['imagem_miniatura'])
@@ -575,33 +630,134 @@ def criar_feed_fortaleza():
                 
                 # Usar imagem destacada se disponível, senão usar miniatura
                 imagem_final = conteudo_extraido['imagem_destacada'] if conteudo_extraido['imagem_destacada'] else noticia['imagem_miniatura']
+                conteudo = conteudo_extraido['conteudo']
                 
-                noticias_com_conteudo.append({
+                # Cópia no espelho (baixada pelo proxy i0.wp.com, publicada no GitHub Pages)
+                imagem_espelhada = espelho.espelhar('fortaleza', imagem_final, HEADERS)
+                if imagem_espelhada != imagem_final:
+                    conteudo = conteudo.replace(imagem_final, imagem_espelhada)
+                    imagem_final = imagem_espelhada
+                
+                print(f"    ✅ Conteúdo completo extraído: {titulo_final[:50]}...")
+                return {
                     'titulo': titulo_final,
                     'link': noticia['link'],
                     'descricao': noticia['descricao'],  # Manter descrição original como fallback
                     'data_texto': noticia['data_texto'],
                     'imagem': imagem_final,
                     'hora': noticia['hora'],
-                    'conteudo_completo': conteudo_extraido['conteudo'],
+                    'data_objeto': noticia['data_objeto'],
+                    'conteudo_completo': conteudo,
                     'tem_conteudo_completo': True
-                })
-                
-                print(f"    ✅ Conteúdo completo extraído!")
+                }
+            
+            print(f"    ⚠️  Usando resumo (não consegui extrair conteúdo completo): {noticia['titulo'][:50]}...")
+            
+            # Se não conseguiu extrair conteúdo, usar o resumo
+            return {
+                'titulo': noticia['titulo'],
+                'link': noticia['link'],
+                'descricao': noticia['descricao'],
+                'data_texto': noticia['data_texto'],
+                'imagem': espelho.espelhar('fortaleza', noticia['imagem_miniatura'], HEADERS),
+                'hora': noticia['hora'],
+                'data_objeto': noticia['data_objeto'],
+                'conteudo_completo': None,
+                'tem_conteudo_completo': False
+            }
+        
+        def renderizar_noticia(noticia):
+            """<item> do RSS e registro do histórico de uma notícia já detalhada"""
+            guid = hashlib.md5(noticia['link'].encode()).hexdigest()[:12]
+            
+            # Data para RSS
+            try:
+                hora_partes = noticia['hora'].split(':')
+                hora = int(hora_partes[0]) if hora_partes else 12
+                minuto = int(hora_partes[1]) if len(hora_partes) > 1 else 0
+                data_rss = datetime(HOJE.year, HOJE.month, HOJE.day, hora, minuto, 0, tzinfo=timezone.utc)
+                pub_date = data_rss.strftime("%a, %d %b %Y %H:%M:%S +0000")
+            except:
+                pub_date = utc_agora.strftime("%a, %d %b %Y %H:%M:%S +0000")
+            
+            guid_item = f"fortaleza-{HOJE.strftime('%Y%m%d')}-{guid}"
+            
+            # CONTEÚDO COMPLETO OU RESUMO
+            if noticia.get('conteudo_completo'):
+                # Usar conteúdo completo extraído
+                conteudo = noticia['conteudo_completo']
             else:
-                print(f"    ⚠️  Usando resumo (não consegui extrair conteúdo completo)")
+                # Usar resumo (fallback)
+                conteudo = f'<h3>{html.escape(noticia["titulo"])}</h3>'
+                conteudo += f'<p><strong>Publicado:</strong> {noticia["data_texto"]}</p>'
                 
-                # Se não conseguiu extrair conteúdo, usar o resumo
-                noticias_com_conteudo.append({
-                    'titulo': noticia['titulo'],
-                    'link': noticia['link'],
-                    'descricao': noticia['descricao'],
-                    'data_texto': noticia['data_texto'],
-                    'imagem': noticia['imagem_miniatura'],
-                    'hora': noticia['hora'],
-                    'conteudo_completo': None,
-                    'tem_conteudo_completo': False
-                })
+                if noticia.get('imagem'):
+                    conteudo += f'<p><img src="{noticia["imagem"]}" alt="{html.escape(noticia["titulo"][:100])}" style="max-width:100%"></p>'
+                
+                if noticia.get('descricao'):
+                    conteudo += f'<p>{html.escape(noticia["descricao"])}</p>'
+                
+                conteudo += f'<p><a href="{noticia["link"]}" target="_blank">🔗 Ver notícia completa no site</a></p>'
+            
+            def montar_item():
+                partes = []
+                partes.append('<item>')
+                partes.append(f'<title>{html.escape(noticia["titulo"])}</title>')
+                partes.append(f'<link>{noticia["link"]}</link>')
+                partes.append(f'<guid isPermaLink="false">{guid_item}</guid>')
+                partes.append(f'<pubDate>{pub_date}</pubDate>')
+                partes.append(f'<description>{html.escape(noticia["titulo"])} - {noticia["data_texto"]}</description>')
+                partes.append(f'<content:encoded>{textoxml.cdata(conteudo)}</content:encoded>')
+                
+                # Imagem (para WordPress)
+                if noticia.get('imagem'):
+                    partes.append(f'<enclosure url="{noticia["imagem"]}" type="image/jpeg" />')
+                    partes.append(f'<media:content url="{noticia["imagem"]}" type="image/jpeg" medium="image">')
+                    partes.append(f'<media:title>{html.escape(noticia["titulo"][:100])}</media:title>')
+                    partes.append('</media:content>')
+                
+                partes.append('</item>')
+                return '\n'.join(partes)
+            
+            # Mesma notícia, mesmos campos da execução anterior: <item> pronto do cache
+            dados = [noticia['titulo'], noticia['link'], noticia['data_texto'], noticia.get('imagem'), pub_date, conteudo]
+            item_xml = fragmentos.renderizar('fortaleza', guid_item, VERSAO_RSS, dados, montar_item)
+            
+            # Registro para o histórico, com a data real da notícia
+            try:
+                publicado = datetime.combine(noticia['data_objeto'], datetime.strptime(noticia['hora'], '%H:%M').time(), FUSO_BRASILIA)
+            except ValueError:
+                publicado = noticia['data_objeto']
+            registro = novo_registro(
+                'fortaleza', noticia['titulo'], noticia['link'], publicado,
+                conteudo=conteudo, imagem=noticia.get('imagem'), resumo=noticia['descricao'],
+                guid=guid_item
+            )
+            return item_xml, registro
+        
+        # ================= 3. EXECUTAR O PIPELINE =================
+        inicio = time.monotonic()
+        em_voo = deque()   # detalhes pedidos, na ordem da listagem
+        prontas = []       # (notícia, <item>, registro), na ordem da listagem
+        
+        def escoar(maximo):
+            """Renderiza o que já terminou; bloqueia enquanto houver mais de `maximo` em voo"""
+            while em_voo and (len(em_voo) > maximo or em_voo[0].done()):
+                noticia = em_voo.popleft().result()
+                prontas.append((noticia, *renderizar_noticia(noticia)))
+                if len(prontas) == 1:
+                    print(f"    ⏱️  Primeira notícia pronta em {time.monotonic() - inicio:.1f}s")
+        
+        with ThreadPoolExecutor(max_workers=DETALHES_PARALELOS) as executor:
+            for i, noticia in enumerate(noticias_recentes(), 1):
+                print(f"\n📰 Notícia {i}: {noticia['titulo'][:60]}...")
+                em_voo.append(executor.submit(detalhar_noticia, noticia))
+                escoar(MAX_EM_VOO - 1)
+            escoar(0)
+        
+        print(f"\n⏱️  Listagem, conteúdo e XML em {time.monotonic() - inicio:.1f}s")
+        
+        noticias_com_conteudo = [noticia for noticia, _, _ in prontas]
         
         # Contar quantas notícias têm conteúdo completo
         com_conteudo = sum(1 for n in noticias_com_conteudo if n.get('tem_conteudo_completo'))
@@ -619,6 +775,18 @@ def criar_feed_fortaleza():
             print(f"   3. Hora UTC: {utc_agora.strftime('%H:%M')}")
             print("   4. Site pode estar offline")
             
+            # Portal fora do ar ou sem nada novo: os itens da última coleta boa
+            # continuam no feed, marcados como desatualizados
+            # (portal fora do ar não conta como coleta: o próximo cron tenta de novo)
+            if situacao['erro']:
+                reserva.falhou('fortaleza', situacao['erro'])
+                motivo = f"portal indisponível ({situacao['erro']})"
+            else:
+                cadencia.registrar_coleta('fortaleza')
+                motivo = "nenhuma notícia de hoje/ontem no portal"
+            if reserva.publicar('fortaleza', FEED_FILE, CANAL, motivo):
+                return True
+            
             # Mesmo sem notícias, criar um feed válido para o GitHub
             xml_vazio = f'''<?xml version="1.0" encoding="UTF-8"?>
 <rss version="2.0">
@@ -627,7 +795,7 @@ def criar_feed_fortaleza():
 <link>{URL_BASE}</link>
 <description>Sem notícias recentes. Última verificação: {utc_agora.strftime("%H:%M")} UTC</description>
 <lastBuildDate>{utc_agora.strftime("%a, %d %b %Y %H:%M:%S +0000")}</lastBuildDate>
-<ttl>30</ttl>
+<ttl>60</ttl>
 </channel>
 </rss>'''
             
@@ -635,21 +803,17 @@ def criar_feed_fortaleza():
                 f.write(xml_vazio)
             
             print(f"\n📁 Feed vazio gerado (para manter workflow): {FEED_FILE}")
-            
-            # Criar também arquivo com data no nome (para histórico)
-            arquivo_data = f"feed_fortaleza_{HOJE.strftime('%Y%m%d')}.xml"
-            with open(arquivo_data, 'w', encoding='utf-8') as f:
-                f.write(xml_vazio)
-            
-            print(f"📁 Backup histórico: {arquivo_data}")
+            sem_derrubar('gerar JSON Feed', jsonfeed.gravar, 'fortaleza', [])
             
             return True  # Sucesso mesmo sem notícias
         
         # ================= 5. GERAR FEED COM NOTÍCIAS =================
         print(f"\n📝 Gerando feed com {len(noticias_com_conteudo)} notícias...")
         
-        # Ordenar por hora
-        noticias_com_conteudo.sort(key=lambda x: x['hora'], reverse=True)
+        # Ordenar por hora (os <item> já estão prontos; só a ordem muda)
+        prontas.sort(key=lambda x: x[0]['hora'], reverse=True)
+        noticias_com_conteudo = [noticia for noticia, _, _ in prontas]
+        registros = [registro for _, _, registro in prontas]
         
         xml_parts = []
         
@@ -661,68 +825,38 @@ def criar_feed_fortaleza():
         xml_parts.append(f'<description>{len(noticias_com_conteudo)} notícias recentes ({com_conteudo} com conteúdo completo)</description>')
         xml_parts.append('<language>pt-br</language>')
         xml_parts.append(f'<lastBuildDate>{utc_agora.strftime("%a, %d %b %Y %H:%M:%S +0000")}</lastBuildDate>')
-        xml_parts.append('<ttl>60</ttl>')
-        
-        for noticia in noticias_com_conteudo:
-            guid = hashlib.md5(noticia['link'].encode()).hexdigest()[:12]
-            
-            # Data para RSS
-            try:
-                hora_partes = noticia['hora'].split(':')
-                hora = int(hora_partes[0]) if hora_partes else 12
-                minuto = int(hora_partes[1]) if len(hora_partes) > 1 else 0
-                data_rss = datetime(HOJE.year, HOJE.month, HOJE.day, hora, minuto, 0, tzinfo=timezone.utc)
-                pub_date = data_rss.strftime("%a, %d %b %Y %H:%M:%S +0000")
-            except:
-                pub_date = utc_agora.strftime("%a, %d %b %Y %H:%M:%S +0000")
-            
-            xml_parts.append('<item>')
-            xml_parts.append(f'<title>{html.escape(noticia["titulo"])}</title>')
-            xml_parts.append(f'<link>{noticia["link"]}</link>')
-            xml_parts.append(f'<guid isPermaLink="false">fortaleza-{HOJE.strftime("%Y%m%d")}-{guid}</guid>')
-            xml_parts.append(f'<pubDate>{pub_date}</pubDate>')
-            xml_parts.append(f'<description>{html.escape(noticia["titulo"])} - {noticia["data_texto"]}</description>')
-            
-            # CONTEÚDO COMPLETO OU RESUMO
-            if noticia.get('conteudo_completo'):
-                # Usar conteúdo completo extraído
-                conteudo = noticia['conteudo_completo']
-                xml_parts.append(f'<content:encoded><![CDATA[ {conteudo} ]]></content:encoded>')
-            else:
-                # Usar resumo (fallback)
-                conteudo = f'<h3>{html.escape(noticia["titulo"])}</h3>'
-                conteudo += f'<p><strong>Publicado:</strong> {noticia["data_texto"]}</p>'
-                
-                if noticia.get('imagem'):
-                    conteudo += f'<p><img src="{noticia["imagem"]}" alt="{html.escape(noticia["titulo"][:100])}" style="max-width:100%"></p>'
-                
-                if noticia.get('descricao'):
-                    conteudo += f'<p>{html.escape(noticia["descricao"])}</p>'
-                
-                conteudo += f'<p><a href="{noticia["link"]}" target="_blank">🔗 Ver notícia completa no site</a></p>'
-                
-                xml_parts.append(f'<content:encoded><![CDATA[ {conteudo} ]]></content:encoded>')
-            
-            # Imagem (para WordPress)
-            if noticia.get('imagem'):
-                xml_parts.append(f'<enclosure url="{noticia["imagem"]}" type="image/jpeg" />')
-                xml_parts.append(f'<media:content url="{noticia["imagem"]}" type="image/jpeg" medium="image">')
-                xml_parts.append(f'<media:title>{html.escape(noticia["titulo"][:100])}</media:title>')
-                xml_parts.append('</media:content>')
-            
-            xml_parts.append('</item>')
-        
+        xml_parts.append(f"<ttl>{cadencia.ttl('fortaleza', 60)}</ttl>")
+        skip = cadencia.skip_hours('fortaleza')
+        if skip:
+            xml_parts.append(skip)
+        atom = notificacao.links_atom(FEED_FILE)
+        if atom:
+            xml_parts.append(atom)
+        xml_parts.extend(item for _, item, _ in prontas)
         xml_parts.append('</channel>')
         xml_parts.append('</rss>')
         
-        # Salvar arquivo principal
-        with open(FEED_FILE, 'w', encoding='utf-8') as f:
-            f.write('\n'.join(xml_parts))
+        xml_final = '\n'.join(xml_parts)
+        resultado = validador.validar('fortaleza', registros, xml_final)
+        validador.exigir_publicavel(resultado)
         
-        # Salvar backup com data
-        arquivo_data = f"feed_fortaleza_{HOJE.strftime('%Y%m%d')}.xml"
-        with open(arquivo_data, 'w', encoding='utf-8') as f:
-            f.write('\n'.join(xml_parts))
+        # Salvar arquivo principal
+        notificacao.gravar_feed('fortaleza', FEED_FILE, xml_final)
+        validador.imprimir(resultado)
+        
+        # Histórico compacto (substitui o antigo feed_fortaleza_AAAAMMDD.xml)
+        sem_derrubar('gerar JSON Feed', jsonfeed.gravar, 'fortaleza', registros)
+        sem_derrubar('gravar histórico', arquivo.arquivar, 'fortaleza', registros)
+        # Só um feed sem erros de validação vira a "última coleta boa"
+        if resultado['ok']:
+            reserva.guardar('fortaleza', registros, [item for _, item, _ in prontas])
+        sem_derrubar('gerar feed paginado', feed_paginado.publicar, 'fortaleza')
+        espelho.gravar()
+        fragmentos.gravar()
+        if entradas is not None:
+            descoberta.gravar_marca('fortaleza', entradas)
+        elif situacao['mais_novo']:
+            estado.gravar_marca_dagua('fortaleza', *situacao['mais_novo'])
         
         # ================= 6. RELATÓRIO =================
         print("-" * 60)
@@ -730,7 +864,7 @@ def criar_feed_fortaleza():
         print(f"📅 Data: {HOJE.strftime('%d/%m/%Y')}")
         print(f"📊 Notícias: {len(noticias_com_conteudo)} ({com_conteudo} com conteúdo completo)")
         print(f"📁 Arquivo principal: {FEED_FILE}")
-        print(f"📁 Backup histórico: {arquivo_data}")
+        print(f"🗄️  Histórico: historico/fortaleza.sqlite3")
         
         if noticias_com_conteudo:
             print(f"\n📋 NOTÍCIAS ENCONTRADAS:")
@@ -739,6 +873,7 @@ def criar_feed_fortaleza():
                 imagem_icon = "🖼️" if n.get('imagem') else "📷"
                 print(f"  {i:2d}. [{n['hora']}] {conteudo_icon}{imagem_icon} {n['titulo'][:50]}...")
         
+        cadencia.registrar_coleta('fortaleza')
         return True
         
     except Exception as e:
@@ -746,6 +881,15 @@ def criar_feed_fortaleza():
         import traceback
         traceback.print_exc()
         
+        # Reemitir a última coleta boa; o feed de erro fica só para quando não há nenhuma
+        try:
+            reserva.falhou('fortaleza', e)
+        except Exception:
+            pass
+        motivo = "portal indisponível" if isinstance(e, requests.RequestException) else "falha ao gerar o feed"
+        if reserva.publicar('fortaleza', FEED_FILE, CANAL, motivo):
+            return False
+        
         # Criar feed de erro (para o workflow não falhar)
         erro_xml = f'''<?xml version="1.0" encoding="UTF-8"?>
 <rss version="2.0">
@@ -754,7 +898,7 @@ def criar_feed_fortaleza():
 <link>{URL_BASE}</link>
 <description>Erro ao gerar feed. Última tentativa: {datetime.now(timezone.utc).strftime("%H:%M")} UTC</description>
 <lastBuildDate>{datetime.now(timezone.utc).strftime("%a, %d %b %Y %H:%M:%S +0000")}</lastBuildDate>
-<ttl>5</ttl>
+<ttl>60</ttl>
 </channel>
 </rss>'''
         
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+# validador.py - Validação estrutural dos feeds, em memória
+#
+# Substitui as verificações que reabriam o arquivo recém-gravado e
+# procuravam texto nele (janela de 30 linhas depois de cada <item>, contagem
+# de "<![CDATA["). Aqui a checagem é feita antes de gravar, e XML malformado
+# ou com CDATA quebrado não é gravado (exigir_publicavel):
+#
+#   - registros (modelo.novo_registro): campos obrigatórios, imagem quando a
+#     fonte exige, data com fuso e dentro de limites razoáveis;
+#   - XML serializado: bem formado, cada <item> com título, link/guid e
+#     enclosure (quando exigido), pubDate legível, nenhum CDATA quebrado.
+#
+# O resultado é um dict (serializável em JSON) com a lista de problemas;
+# o último resultado de cada fonte fica em RESULTADOS para o modo daemon.
+#
+# Uso: python validador.py feed.xml [outro.xml ...]   # valida arquivos já gravados
+
+import json
+import re
+import sys
+import xml.etree.ElementTree as ET
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+
+import metricas
+
+# ================= CONFIGURAÇÕES =================
+CAMPOS_OBRIGATORIOS = ['titulo', 'link', 'guid', 'publicado']
+
+# Datas de publicação aceitas: até 2 horas no futuro (relógios do portal) e,
+# sem aviso, até 30 dias no passado
+TOLERANCIA_FUTURO = timedelta(hours=2)
+IDADE_MAXIMA = timedelta(days=30)
+
+RE_CDATA = re.compile(r'<!\[CDATA\[(.*?)\]\]>', re.S)
+
+# Erros que impedem a gravação: o feed anterior continua publicado
+BLOQUEANTES = {'xml_malformado', 'cdata_quebrado'}
+
+# Último resultado por fonte (consultado pelo agendador)
+RESULTADOS = {}
+
+
+# ================= FUNÇÕES AUXILIARES =================
+def _problema(problemas, nivel, codigo, item=None, detalhe=''):
+    problemas.append({'nivel': nivel, 'codigo': codigo, 'item': item, 'detalhe': detalhe[:200]})
+
+
+def _local(tag):
+    return tag.rsplit('}', 1)[-1] if isinstance(tag, str) else ''
+
+
+# ================= VALIDAÇÕES =================
+def validar_registros(registros, exigir_imagem=False, agora=None):
+    """Problemas no modelo comum de itens, antes da serialização."""
+    agora = agora or datetime.now(timezone.utc)
+    problemas = []
+    guids = set()
+
+    for indice, registro in enumerate(registros, 1):
+        ref = registro.get('link') or indice
+        for campo in CAMPOS_OBRIGATORIOS:
+            if not registro.get(campo):
+                _problema(problemas, 'erro', f'sem_{campo}', ref)
+
+        if exigir_imagem and not registro.get('imagem'):
+            _problema(problemas, 'erro', 'sem_imagem', ref)
+
+        guid = registro.get('guid')
+        if guid:
+            if guid in guids:
+                _problema(problemas, 'erro', 'guid_duplicado', ref, guid)
+            guids.add(guid)
+
+        publicado = registro.get('publicado')
+        if isinstance(publicado, datetime):
+            if publicado.tzinfo is None:
+                _problema(problemas, 'erro', 'data_sem_fuso', ref, publicado.isoformat())
+            elif publicado - agora > TOLERANCIA_FUTURO:
+                _problema(problemas, 'erro', 'data_futura', ref, publicado.isoformat())
+            elif agora - publicado > IDADE_MAXIMA:
+                _problema(problemas, 'aviso', 'data_antiga', ref, publicado.isoformat())
+        elif publicado:
+            _problema(problemas, 'erro', 'data_invalida', ref, repr(publicado))
+
+        if '<![CDATA[' in (registro.get('conteudo') or ''):
+            _problema(problemas, 'aviso', 'cdata_no_conteudo', ref)
+
+    return problemas
+
+
+def validar_xml(xml, exigir_enclosure=False, permitir_cdata=True):
+    """Problemas no XML já serializado (string ou bytes). Retorna (problemas, total de itens)."""
+    problemas = []
+    texto = xml.decode('utf-8', 'replace') if isinstance(xml, bytes) else xml
+
+    # CDATA aninhado é sinal de escape ']]>' esquecido: o restante vira texto solto
+    for indice, bloco in enumerate(RE_CDATA.findall(texto), 1):
+        if '<![CDATA[' in bloco:
+            _problema(problemas, 'erro', 'cdata_quebrado', indice, bloco[:80])
+    if not permitir_cdata and '<![CDATA[' in texto:
+        _problema(problemas, 'aviso', 'cdata_presente', None, f"{texto.count('<![CDATA[')} bloco(s)")
+
+    try:
+        raiz = ET.fromstring(xml.encode('utf-8') if isinstance(xml, str) else xml)
+    except ET.ParseError as e:
+        _problema(problemas, 'erro', 'xml_malformado', None, str(e))
+        return problemas, 0
+
+    itens = [no for no in raiz.iter() if _local(no.tag) == 'item']
+    for indice, item in enumerate(itens, 1):
+        filhos = {}
+        for sub in item:
+            filhos.setdefault(_local(sub.tag), sub)
+
+        titulo = filhos.get('title')
+        if titulo is None or not (titulo.text or '').strip():
+            _problema(problemas, 'erro', 'item_sem_titulo', indice)
+        if not any((filhos[t].text or '').strip() for t in ('link', 'guid') if t in filhos):
+            _problema(problemas, 'erro', 'item_sem_link', indice)
+
+        if exigir_enclosure:
+            enclosure = filhos.get('enclosure')
+            if enclosure is None or not enclosure.get('url'):
+                _problema(problemas, 'erro', 'item_sem_enclosure', indice)
+
+        data = filhos.get('pubDate')
+        if data is not None:
+            try:
+                parsedate_to_datetime((data.text or '').strip())
+            except (TypeError, ValueError, IndexError):
+                _problema(problemas, 'erro', 'pubdate_invalido', indice, data.text or '')
+
+    return problemas, len(itens)
+
+
+def validar(fonte, registros=None, xml=None, exigir_imagem=False, permitir_cdata=True):
+    """
+    Valida os registros e/ou o XML de uma fonte. Retorna:
+    {'fonte', 'ok', 'itens', 'com_imagem', 'erros', 'avisos', 'problemas': [...]}
+    'ok' é False quando há ao menos um problema de nível 'erro'.
+    """
+    problemas = []
+    if registros is not None:
+        problemas += validar_registros(registros, exigir_imagem)
+
+    total_xml = None
+    if xml is not None:
+        problemas_xml, total_xml = validar_xml(xml, exigir_imagem, permitir_cdata)
+        problemas += problemas_xml
+
+    erros = sum(1 for p in problemas if p['nivel'] == 'erro')
+    resultado = {
+        'fonte': fonte,
+        'ok': erros == 0,
+        'itens': len(registros) if registros is not None else total_xml,
+        'itens_xml': total_xml,
+        'com_imagem': sum(1 for r in registros if r.get('imagem')) if registros is not None else None,
+        'erros': erros,
+        'avisos': len(problemas) - erros,
+        'problemas': problemas,
+        'validado': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+    }
+    RESULTADOS[fonte] = resultado
+    metricas.contar('validacao.erros', erros)
+    metricas.contar('validacao.avisos', resultado['avisos'])
+    return resultado
+
+
+def publicavel(resultado):
+    """False quando o XML não pode ir ao ar (malformado ou com CDATA quebrado)."""
+    return not any(p['codigo'] in BLOQUEANTES for p in resultado['problemas'])
+
+
+def exigir_publicavel(resultado):
+    """Levanta ValueError (com o resumo da validação) se o XML não pode ser gravado."""
+    if not publicavel(resultado):
+        imprimir(resultado)
+        codigos = sorted({p['codigo'] for p in resultado['problemas'] if p['codigo'] in BLOQUEANTES})
+        raise ValueError(f"feed de {resultado['fonte']} não gravado: {', '.join(codigos)}")
+
+
+def imprimir(resultado, limite=10):
+    """Resumo legível do resultado de validar()."""
+    marca = "✅" if resultado['ok'] else "❌"
+    imagens = f", {resultado['com_imagem']} com imagem" if resultado['com_imagem'] is not None else ""
+    print(f"🔍 Validação ({resultado['fonte']}): {marca} {resultado['itens']} item(ns){imagens}, "
+          f"{resultado['erros']} erro(s), {resultado['avisos']} aviso(s)")
+    for problema in resultado['problemas'][:limite]:
+        icone = "❌" if problema['nivel'] == 'erro' else "⚠️ "
+        alvo = f" [{problema['item']}]" if problema['item'] is not None else ""
+        detalhe = f": {problema['detalhe']}" if problema['detalhe'] else ""
+        print(f"   {icone} {problema['codigo']}{alvo}{detalhe}")
+    if len(resultado['problemas']) > limite:
+        print(f"   ... e mais {len(resultado['problemas']) - limite} problema(s)")
+
+
+# ================= MAIN =================
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Uso: python validador.py feed.xml [outro.xml ...]")
+        sys.exit(1)
+
+    todos_ok = True
+    for caminho in sys.argv[1:]:
+        with open(caminho, 'rb') as f:
+            resultado_arquivo = validar(caminho, xml=f.read())
+        print(json.dumps(resultado_arquivo, ensure_ascii=False))
+        todos_ok = todos_ok and resultado_arquivo['ok']
+    sys.exit(0 if todos_ok else 1)